@@ -1,9 +1,26 @@
+import os
+import time
+from concurrent.futures.process import BrokenProcessPool
+
 import streamlit as st
-import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from pathlib import Path
 
+from cache_sim import Replay, default_policies
+from analytics import RAPID_FIRE_SEC, BURST_KEYS, burst_summary, burst_windows, compute_sections, filter_log, merge_results, nik_source_counts
+from duckdb_backend import DuckDBLog, source_fingerprint
+from export import PRECOMPUTED_DIR, read_results
+from log_store import LogStore
+from live import LATE_TOLERANCE_SEC, LiveMonitor
+from ingest import MASK_COLS, SNAPSHOT_DIR, file_fingerprint, load_memory_report, load_shared, shared_log_path
+from nik_index import NikIndex
+from parallel import PARALLEL_SECTIONS, SUPPORTED as POOL_SUPPORTED, SectionPool
+from paging import PAGE_SIZES, export_file, filter_columns, get_page, n_pages, sort_positions
+from profiling import Profiler
+from result_cache import LRUCache, filter_key
+from rollup import Rollup
+
 st.set_page_config(
     page_title="NIK Verification Dashboard",
     layout="wide"
@@ -11,828 +28,1275 @@ st.set_page_config(
 
 st.title("NIK Verification Monitoring Dashboard")
 
+# Jumlah filter state (source × tanggal) yang hasil analitiknya disimpan di memory
+RESULT_CACHE_SIZE = 32
+
+# Batas memory result cache (MB, memory_usage deep semua tabel di bundle); bundle terlama dievict dulu
+RESULT_CACHE_MB = int(os.environ.get("EKYC_RESULT_CACHE_MB", "1024"))
+
+# Jumlah maksimal NIK hasil prefix search yang ditampilkan di drill-down
+NIK_MATCH_LIMIT = 20
+
+# JSON-lines log untuk timing per section (opsional, lihat panel Performance)
+PERF_LOG = "perf_log.jsonl"
+
+# Backend query: "pandas" (log di memory, default) atau "duckdb" (query langsung ke Parquet, out-of-core)
+BACKEND = os.environ.get("EKYC_BACKEND", "pandas")
+USE_DUCKDB = BACKEND == "duckdb"
+
+# Log store berpartisi (log_store.py); kalau di-set, dibaca sebagai ganti FILE_NAME
+LOG_STORE = os.environ.get("EKYC_LOG_STORE")
+USE_STORE = bool(LOG_STORE) and not USE_DUCKDB
+
+# File / folder / glob Parquet yang dibaca backend DuckDB (default: log store, atau snapshot hasil ingest)
+DUCKDB_SOURCE = os.environ.get("EKYC_DUCKDB_SOURCE", LOG_STORE or SNAPSHOT_DIR)
+
+# Baris per halaman Raw Data di backend DuckDB (LIMIT/OFFSET di query)
+RAW_PAGE_SIZE = 50
+
+# Worker process pool untuk section yang independen (0 = sequential); hanya mode snapshot (file Arrow shared),
+# POSIX, dan maksimal sebanyak core (di 1 core pool hanya menambah overhead)
+WORKERS = min(int(os.environ.get("EKYC_WORKERS", "0")), os.cpu_count() or 1)
+USE_POOL = WORKERS > 1 and POOL_SUPPORTED and not USE_DUCKDB and not USE_STORE
+
+# Pool baru dipakai mulai sekian baris log terfilter (di bawahnya overhead spawn/IPC > hemat waktu)
+POOL_MIN_ROWS = int(os.environ.get("EKYC_POOL_MIN_ROWS", "1000000"))
+
+# Jumlah hasil filter (source × tanggal) yang dipakai bersama antar session
+FILTER_CACHE_SIZE = 4
+
+# Batas error relatif Unique NIK mode approx (HyperLogLog, lihat hll.py)
+HLL_ERROR = float(os.environ.get("EKYC_HLL_ERROR", "0.02"))
+
+# Default threshold burst detector: ≥ sekian request dalam sekian detik per key (bisa diubah di sidebar)
+BURST_MIN_REQUESTS = 5
+BURST_WINDOW_SEC = 60
+
+# Default simulasi cache (replay log): kapasitas LRU/LFU (jumlah NIK) dan TTL (hari)
+CACHE_SIM_CAPACITY = 10_000
+CACHE_SIM_TTL_DAYS = 30
+
+# Live mode: tail file CSV/JSON-lines atau drop directory (live.py) sebagai ganti snapshot Excel
+LIVE_LOG = os.environ.get("EKYC_LIVE")
+
+# Default interval refresh live mode (detik, bisa diubah di sidebar)
+LIVE_REFRESH_SEC = 5
+
+# Timing, jumlah baris & delta memory per section untuk run ini
+perf = Profiler()
+
+
+@st.cache_resource
+def get_result_cache():
+    # Satu cache per proses, dipakai bersama oleh semua session
+    return LRUCache(maxsize=RESULT_CACHE_SIZE, maxbytes=RESULT_CACHE_MB * 1024 ** 2)
+
+
+@st.cache_resource(max_entries=1)
+def get_log(path, fingerprint):
+    # Log di-publish sekali sebagai file Arrow yang di-memory-map: satu salinan untuk semua session & proses
+    return load_shared(path)
+
+
+@st.cache_resource(max_entries=FILTER_CACHE_SIZE)
+def get_filtered(key, sources, start, end, _df):
+    # Session dengan filter sama memakai frame yang sama (semua source = slice/view tanpa copy)
+    return filter_log(_df, sources, start, end)
+
+
+@st.cache_resource
+def get_section_pool(workers):
+    # Satu process pool per server; worker me-map file Arrow log sendiri (tidak di-pickle per task)
+    return SectionPool(workers)
+
+
+@st.cache_resource(max_entries=1)
+def get_nik_index(fingerprint, _df):
+    # Index NIK → baris dibangun sekali per versi file / set partisi (df tidak di-hash, cukup fingerprint)
+    return NikIndex(_df["Nik"])
+
+
+@st.cache_resource(max_entries=4)
+def get_rollup(fingerprint, _df, hll_error=None):
+    # Rollup cube per versi data / set partisi: trend & peak time per filter cukup dari bucket
+    return Rollup(_df, hll_error=hll_error)
+
+
+@st.cache_resource(max_entries=4)
+def get_store_partitions(root, fingerprint, names):
+    # Partisi yang overlap range tanggal, dibaca sekali per (versi store, set partisi)
+    return LogStore(root).read_partitions(list(names))
+
+
+@st.cache_resource(max_entries=1)
+def get_duckdb_log(source, fingerprint):
+    # Satu koneksi DuckDB per versi data, dipakai bersama semua session
+    return DuckDBLog(source)
+
+
+@st.cache_resource
+def get_live_monitor(path):
+    # Satu tail + counter per path, dipakai bersama semua session (poll cukup baca baris baru)
+    return LiveMonitor(path)
+
+
+@st.fragment
+def paged_table(data, key, page_size=PAGE_SIZES[0], sort_by=None, ascending=True):
+    # Filter, sort & paging di server; hanya halaman aktif yang dikirim ke browser.
+    # Fragment: ganti halaman/sort/filter hanya rerun tabel ini.
+    data = data.drop(columns=MASK_COLS, errors="ignore")
+    columns = list(data.columns)
+    sizes = sorted(set(PAGE_SIZES) | {page_size})
+    
+    c_filter, c_sort, c_order, c_size = st.columns([3, 2, 1, 1])
+    filter_cols = c_filter.multiselect("Filter kolom", columns, key=f"{key}_filter")
+    sort_col = c_sort.selectbox(
+        "Urutkan",
+        columns,
+        index=columns.index(sort_by) if sort_by in columns else None,
+        placeholder="(urutan default)",
+        key=f"{key}_sort"
+    )
+    descending = c_order.selectbox("Arah", ["Naik", "Turun"], index=0 if ascending else 1, key=f"{key}_order") == "Turun"
+    size = c_size.selectbox("Baris", sizes, index=sizes.index(page_size), key=f"{key}_size")
+    
+    filters = {col: st.text_input(f"{col} mengandung", key=f"{key}_filter_{col}") for col in filter_cols}
+    view = filter_columns(data, filters)
+    order = sort_positions(view, sort_col, ascending=not descending)
+    
+    pages = n_pages(len(view), size)
+    page_key = f"{key}_page"
+    if st.session_state.get(page_key, 1) > pages:
+        st.session_state[page_key] = pages
+    page = st.number_input("Halaman", min_value=1, max_value=pages, key=page_key)
+    
+    st.dataframe(get_page(view, page - 1, size, order), use_container_width=True)
+    st.caption(f"{len(view):,} baris · halaman {page:,} dari {pages:,}")
+    
+    # File download dibuat bertahap (per chunk) hanya saat tombol diklik; Streamlit menyimpan hasilnya di memori
+    d1, d2 = st.columns(2)
+    d1.download_button(
+        "⬇️ Download CSV",
+        data=lambda: export_file(view, "csv", order),
+        file_name=f"{key}.csv",
+        mime="text/csv",
+        on_click="ignore",
+        key=f"{key}_csv"
+    )
+    d2.download_button(
+        "⬇️ Download Parquet",
+        data=lambda: export_file(view, "parquet", order),
+        file_name=f"{key}.parquet",
+        mime="application/vnd.apache.parquet",
+        on_click="ignore",
+        key=f"{key}_parquet"
+    )
+
+
+# ======================
+# LIVE MODE (counter inkremental, tanpa hitung ulang history)
+# ======================
+if LIVE_LOG:
+    monitor = get_live_monitor(LIVE_LOG)
+    
+    st.sidebar.header("Live")
+    live_refresh = st.sidebar.number_input("Refresh (detik)", min_value=1, value=LIVE_REFRESH_SEC, step=1)
+    st.sidebar.caption(f"📡 Tail: {LIVE_LOG}")
+    
+    def live_panel():
+        new_rows = monitor.poll()
+        counters = monitor.counters
+        live_kpi = counters.kpi()
+        
+        l1, l2, l3, l4 = st.columns(4)
+        l1.metric("Total Request", f"{live_kpi['total_requests']:,}", f"+{new_rows:,}" if new_rows else None)
+        l2.metric("Total NIK", f"{live_kpi['total_nik']:,}")
+        l3.metric("Duplicate Rate", f"{live_kpi['duplicate_rate']:.1%}", f"{live_kpi['duplicate_requests']:,} wasted requests")
+        l4.metric("Fraud Risk (>5x)", f"{live_kpi['risk_rate']:.1%}", f"{live_kpi['high_risk_nik']:,} suspicious NIK")
+        
+        col_live1, col_live2 = st.columns([2, 1])
+        
+        with col_live1:
+            hourly = counters.hourly_table()
+            if len(hourly):
+                fig_live = px.bar(
+                    hourly,
+                    x="Hour",
+                    y="Total_Request",
+                    title="Hourly Traffic (live, anomaly >2σ)",
+                    color="Status",
+                    color_discrete_map={"Normal": "steelblue", "Anomaly": "red"},
+                    text="Total_Request"
+                )
+                st.plotly_chart(fig_live, use_container_width=True)
+            else:
+                st.info("⏳ Menunggu data masuk...")
+        
+        with col_live2:
+            st.dataframe(counters.source_table(), use_container_width=True, hide_index=True)
+            st.metric("Data Quality", f"{live_kpi['data_quality']:.1%}")
+        
+        alerts = counters.alert_table()
+        if len(alerts) > 0:
+            st.error(f"⚡ **{counters.rapid_hits:,}** rapid fire requests (<{RAPID_FIRE_SEC} detik per NIK)")
+            st.dataframe(alerts.head(50), use_container_width=True, hide_index=True)
+        else:
+            st.success("✅ Tidak ada rapid fire pattern")
+        if counters.late_dropped:
+            st.caption(f"⏱️ {counters.late_dropped:,} request datang terlambat >{LATE_TOLERANCE_SEC // 60} menit, tidak dicek rapid fire")
+        
+        last_ts = counters.last_ts.strftime("%Y-%m-%d %H:%M:%S") if counters.last_ts is not None else "-"
+        st.caption(
+            f"🔄 Poll #{monitor.polls:,} · {new_rows:,} baris baru · request terakhir {last_ts} · "
+            f"refresh tiap {live_refresh} detik"
+        )
+    
+    # Fragment: hanya panel live yang rerun tiap interval, bukan seluruh app
+    st.fragment(live_panel, run_every=live_refresh)()
+    st.stop()
+
 # ======================
 # LOAD EXCEL FILE
 # ======================
 FILE_NAME = "LogDUKCAPIL_2025 (1).xlsx"
 
-if not Path(FILE_NAME).exists():
+if not USE_DUCKDB and not USE_STORE and not Path(FILE_NAME).exists():
     st.error(f"❌ File '{FILE_NAME}' tidak ditemukan di folder app.py")
     st.stop()
 
-df = pd.read_excel(FILE_NAME)
+perf.mark("LOAD")
+
+if USE_DUCKDB:
+    # Log tidak dimuat ke memory: setiap section = satu query DuckDB ke file Parquet
+    try:
+        data_fingerprint = source_fingerprint(DUCKDB_SOURCE)
+        log_db = get_duckdb_log(DUCKDB_SOURCE, data_fingerprint)
+    except (ImportError, FileNotFoundError) as e:
+        st.error(f"❌ Backend DuckDB: {e}")
+        st.stop()
+    df = None
+    n_total = None
+elif USE_STORE:
+    # Hanya manifest yang dibaca di sini; partisi dibuka setelah range tanggal diketahui
+    store = LogStore(LOG_STORE)
+    if not store.partitions:
+        st.error(f"❌ Log store '{LOG_STORE}' kosong, ingest dulu: python log_store.py <export> --store {LOG_STORE}")
+        st.stop()
+    data_fingerprint = store.fingerprint()
+    df = None
+    n_total = len(store)
+else:
+    # Workbook di-parse sekali ke snapshot (sudah bersih), lalu dibaca lewat file Arrow yang di-memory-map
+    data_fingerprint = file_fingerprint(FILE_NAME)
+    df = get_log(FILE_NAME, data_fingerprint)
+    df_key = data_fingerprint
+    n_total = len(df)
 
 # ======================
-# BASIC CLEANING
+# MEMORY REPORT (encoding saat ingest)
 # ======================
-df.columns = df.columns.str.strip()
-
-df["CreatedDate"] = pd.to_datetime(df["CreatedDate"], errors="coerce")
-
-status_cols = [
-    "NamaDenganGelar", "Nama", "JenisKelamin",
-    "TempatLahir", "TglLahir",
-    "Provinsi", "Kabupaten", "Kecamatan", "Kelurahan"
-]
-
-for c in status_cols:
-    if c in df.columns:
-        df[c] = df[c].fillna("-")
+if not USE_DUCKDB and not USE_STORE:
+    with st.sidebar.expander("🧠 Memory"):
+        mem_report, invalid_nik = load_memory_report(FILE_NAME)
+        
+        if mem_report.empty:
+            st.caption("Memory report tidak tersedia untuk snapshot ini")
+        else:
+            before_mb = mem_report["Before_Bytes"].sum() / 1e6
+            after_mb = mem_report["After_Bytes"].sum() / 1e6
+            st.metric("Log in memory", f"{after_mb:,.1f} MB", f"{after_mb - before_mb:,.1f} MB vs raw", delta_color="inverse")
+            st.dataframe(mem_report, use_container_width=True, hide_index=True)
+        
+        if invalid_nik > 0:
+            st.warning(f"⚠️ {invalid_nik:,} NIK tidak valid (bukan 16 digit) → kolom Nik tidak di-encode")
 
 # ======================
 # SIDEBAR FILTER
 # ======================
+perf.mark("FILTER", rows=n_total)
+
 st.sidebar.header("Filter")
 
+if USE_DUCKDB:
+    source_options = log_db.source_options()
+    date_min, date_max = log_db.date_bounds()
+elif USE_STORE:
+    source_options = store.source_options()
+    date_min, date_max = store.date_bounds()
+else:
+    source_options = sorted(df["SourceResult"].dropna().unique())
+    created = df["CreatedDate"].dropna()
+    date_min, date_max = (created.min().date(), created.max().date()) if len(created) else (None, None)
+
+if date_min is None:
+    # Semua baris tanpa CreatedDate valid (mis. store hanya punya partisi undated): filter tanggal tidak bisa dibuat
+    st.warning(f"⚠️ Tidak ada baris dengan CreatedDate valid ({n_total:,} baris tanpa tanggal), dashboard tidak bisa difilter")
+    st.stop()
+
 source_filter = st.sidebar.multiselect(
     "SourceResult",
-    options=sorted(df["SourceResult"].dropna().unique()),
-    default=sorted(df["SourceResult"].dropna().unique())
+    options=source_options,
+    default=source_options
 )
 
-date_min = df["CreatedDate"].min().date()
-date_max = df["CreatedDate"].max().date()
-
 date_range = st.sidebar.date_input(
     "Tanggal",
     [date_min, date_max]
 )
 
-df_f = df[
-    (df["SourceResult"].isin(source_filter)) &
-    (df["CreatedDate"].dt.date.between(date_range[0], date_range[1]))
-]
+filter_start = time.perf_counter()
+if USE_DUCKDB:
+    # Filter tidak dimaterialisasi: di-push ke setiap query, di sini hanya hitung barisnya
+    df_f = None
+    n_rows = log_db.count(source_filter, date_range[0], date_range[-1])
+else:
+    if USE_STORE:
+        # Partition pruning: hanya partisi yang overlap range tanggal yang dibuka
+        partitions = store.partitions_for(date_range[0], date_range[-1])
+        df_key = (data_fingerprint, tuple(partitions))
+        df = get_store_partitions(LOG_STORE, *df_key)
+        n_total = len(df)
+        st.sidebar.caption(
+            f"📦 {len(partitions)}/{len(store.partitions)} partisi · "
+            f"{sum(store.partitions[p]['bytes'] for p in partitions) / 1e6:,.1f} MB dibaca"
+        )
+    # Log terurut by CreatedDate: range tanggal = searchsorted slice, SourceResult via kode kategori
+    df_f = get_filtered(df_key, tuple(sorted(source_filter)), date_range[0], date_range[-1], df)
+    n_rows = len(df_f)
+filter_ms = (time.perf_counter() - filter_start) * 1000
+
+st.sidebar.caption(f"⏱️ Filter {filter_ms:.1f} ms · {n_rows:,} rows · backend {BACKEND}")
+
+# Mode approx: Unique NIK dari merge sketch HLL per (hari, source, app), tanpa baca baris log
+approx_nik = not USE_DUCKDB and st.sidebar.toggle(
+    "≈ Unique NIK (HyperLogLog)",
+    help=f"Unique NIK per hari / source / total dari sketch HLL, error relatif maks. ±{HLL_ERROR:.0%}"
+)
+hll_error = HLL_ERROR if approx_nik else None
+
+# Threshold burst detector (sliding window per key), dipakai di tab Fraud Detection
+with st.sidebar.expander("⚡ Burst Detector"):
+    burst_key = st.selectbox("Key", list(BURST_KEYS), key="burst_key")
+    burst_min = st.number_input("Min. request dalam window", min_value=2, value=BURST_MIN_REQUESTS, step=1, key="burst_min")
+    burst_sec = st.number_input("Window (detik)", min_value=1, value=BURST_WINDOW_SEC, step=5, key="burst_sec")
 
 # ======================
-# KPI PER NIK
+# ANALYTICS (cache per filter state + versi snapshot)
 # ======================
+perf.mark("ANALYTICS", rows=n_rows, phase="compute")
+
+result_cache = get_result_cache()
+cache_key = filter_key(
+    f"{data_fingerprint}~hll{HLL_ERROR}" if approx_nik else data_fingerprint, source_filter, date_range[0], date_range[-1],
+    all_sources=source_options, date_min=date_min, date_max=date_max
+)
 
-# Hitung kemunculan per NIK
-nik_counts = df_f.groupby("Nik").size()
 
-# Total NIK (per orang)
-total_nik = nik_counts.shape[0]
+def new_bundle():
+    # Hasil precomputed (cli.py, mis. cron malam) untuk view yang sama sudah lengkap;
+    # log store: trend/peak time (dan profil NIK untuk range penuh) dari agregat inkremental
+    precomputed = read_results(PRECOMPUTED_DIR, cache_key)
+    if precomputed:
+        return precomputed
+    return store.seed_results(source_filter, date_range[0], date_range[-1]) if USE_STORE else {}
 
-# NIK hit 1 kali
-nik_hit_1 = (nik_counts == 1).sum()
 
-# NIK hit lebih dari 1 kali
-nik_hit_gt1 = (nik_counts > 1).sum()
+# Satu bundle per filter state, diisi per section saat section dibuka.
+bundle = result_cache.get_or_compute(cache_key, new_bundle)
+
+cache_stats = result_cache.stats()
+st.sidebar.caption(
+    f"🗄️ Result cache {cache_stats['size']}/{cache_stats['maxsize']} · "
+    f"{cache_stats['bytes'] / 1024 ** 2:,.0f}/{RESULT_CACHE_MB:,} MB · "
+    f"hit {cache_stats['hits']:,} · miss {cache_stats['misses']:,}"
+)
 
-# Persentase (basis per NIK)
-pct_hit_1 = nik_hit_1 / total_nik if total_nik else 0
-pct_hit_gt1 = nik_hit_gt1 / total_nik if total_nik else 0
 
+def local_bundle():
+    # Bundle di result cache dibaca banyak session sekaligus: tidak pernah diubah in place.
+    # Section baru dihitung ke salinan ini lalu dipublish lewat publish_bundle (copy-on-write).
+    shared = result_cache.peek(cache_key, bundle)
+    return {**shared, "sections": list(shared.get("sections", []))}
+
+
+def publish_bundle(local):
+    global bundle
+    shared = result_cache.peek(cache_key, bundle)
+    if set(local) == set(shared) and local["sections"] == shared.get("sections", []):
+        bundle = shared  # tidak ada section baru: tidak perlu ukur ulang bundle
+    else:
+        bundle = merge_results(shared, local)
+        result_cache.put(cache_key, bundle)
+    return bundle
+
+
+def section_results(*names):
+    # Hitung hanya section yang belum ada di bundle filter state ini
+    perf.finish()  # compute dicatat terpisah dari render section sebelumnya
+    local = local_bundle()
+    if USE_DUCKDB:
+        log_db.compute_sections(names, local, source_filter, date_range[0], date_range[-1], profiler=perf)
+    else:
+        if set(names) & set(Rollup.SECTIONS):
+            with perf.section("ROLLUP", rows=n_total):
+                cube = get_rollup(df_key, df, hll_error)
+            cube.compute_sections(names, local, source_filter, date_range[0], date_range[-1], profiler=perf)
+        pending = [n for n in names if n in PARALLEL_SECTIONS and n not in local["sections"]]
+        if USE_POOL and len(pending) > 1 and n_rows >= POOL_MIN_ROWS:
+            try:
+                get_section_pool(WORKERS).compute_sections(
+                    df_f, pending, local, shared_log_path(FILE_NAME), source_filter, date_range[0], date_range[-1], profiler=perf
+                )
+            except BrokenProcessPool:
+                # Worker mati (mis. OOM-killed): pool dibuang, run berikutnya membuat pool baru
+                get_section_pool.clear()
+                st.warning("⚠️ Worker pool berhenti → section dihitung tanpa pool")
+        compute_sections(df_f, names, local, profiler=perf)
+    return publish_bundle(local)
+
+
+def burst_results(by, min_requests, window_sec):
+    # Hasil burst per threshold disimpan di bundle filter state (threshold lain → entry lain)
+    name = f"BURST {'+'.join(by)} {min_requests}/{window_sec}s"
+    local = local_bundle()
+    if name not in local:
+        perf.finish()
+        with perf.section("FRAUD BURST", rows=n_rows):
+            if USE_DUCKDB:
+                df_burst = log_db.burst_windows(source_filter, date_range[0], date_range[-1], by, min_requests, window_sec)
+            else:
+                df_burst = burst_windows(df_f, by, min_requests, window_sec)
+            local[name] = {"df_burst": df_burst, "burst_summary": burst_summary(df_burst, by)}
+    return publish_bundle(local)[name]
+
+
+def cache_replay(capacity, ttl_days):
+    # Replay log terfilter lewat policy cache simulasi; hasil per parameter disimpan di bundle
+    name = f"CACHE REPLAY {capacity}/{ttl_days}d"
+    local = local_bundle()
+    if name not in local:
+        perf.finish()
+        with perf.section("CACHE REPLAY", rows=n_rows):
+            log = log_db.replay_rows(source_filter, date_range[0], date_range[-1]) if USE_DUCKDB else df_f
+            local[name] = Replay(log).report(default_policies(capacity, ttl_days))
+    return publish_bundle(local)[name]
+
+
+results = section_results("KPI")
+
+kpi = results["kpi"]
+total_nik = kpi["total_nik"]
+nik_hit_1 = kpi["nik_hit_1"]
+nik_hit_gt1 = kpi["nik_hit_gt1"]
+pct_hit_1 = kpi["pct_hit_1"]
+pct_hit_gt1 = kpi["pct_hit_gt1"]
+duplicate_requests = kpi["duplicate_requests"]
+duplicate_rate = kpi["duplicate_rate"]
+high_risk_nik = kpi["high_risk_nik"]
+risk_rate = kpi["risk_rate"]
+data_quality = kpi["data_quality"]
+
+if approx_nik:
+    unique_results = section_results("UNIQUE NIK")
+    with st.sidebar.expander("👤 Unique NIK (≈ HLL)", expanded=True):
+        st.metric("Total NIK", f"≈ {unique_results['unique_nik']:,}")
+        st.dataframe(unique_results["source_unique_nik"], use_container_width=True, hide_index=True)
+        st.caption(f"Merge sketch HLL per (hari, source, app) · error maks. ±{HLL_ERROR:.0%}")
 
 # ======================
 # DISPLAY KPI
 # ======================
+perf.mark("KPI", rows=n_rows)
+
 k1, k2, k3, k4 = st.columns(4)
 
 k1.metric("Total NIK", f"{total_nik:,}")
 k2.metric("NIK Hit 1x", f"{nik_hit_1:,}", f"{pct_hit_1:.2%}")
 k3.metric("NIK Hit >1x", f"{nik_hit_gt1:,}", f"{pct_hit_gt1:.2%}")
-k4.metric("Total Request", f"{len(df_f):,}")
+k4.metric("Total Request", f"{kpi['total_requests']:,}")
 
 # ======================
-# TAMBAHAN: ANALYTICAL METRICS
+# SECTIONS (tab; isi hanya dihitung & di-render untuk tab yang terbuka)
 # ======================
-st.markdown("---")
-st.subheader("📊 Analytical Insights")
+tab_overview, tab_quality, tab_traffic, tab_fraud, tab_nik, tab_raw = st.tabs(
+    ["📊 Overview", "📋 Data Quality", "📈 Traffic & Trend", "🚨 Fraud Detection", "🔍 NIK Drill Down", "🗃️ Raw Data"],
+    key="section_tab",
+    on_change="rerun"
+)
 
-total_requests = len(df_f)
-duplicate_requests = total_requests - total_nik
-duplicate_rate = duplicate_requests / total_requests if total_requests > 0 else 0
+with tab_overview:
+    if tab_overview.open:
+        results = section_results("SOURCE PERFORMANCE")
 
-# Fraud risk
-high_risk_nik = (nik_counts > 5).sum()
-risk_rate = high_risk_nik / total_nik if total_nik > 0 else 0
+        # ======================
+        # TAMBAHAN: ANALYTICAL METRICS
+        # ======================
+        st.subheader("📊 Analytical Insights")
 
-# Data quality
-total_fields = len(df_f) * len(status_cols)
-sesuai_count = (df_f[status_cols] == "Sesuai").sum().sum()
-quality_score = sesuai_count / total_fields if total_fields > 0 else 0
+        ka1, ka2, ka3 = st.columns(3)
+        ka1.metric("Duplicate Rate", f"{duplicate_rate:.1%}", f"{duplicate_requests:,} wasted requests")
+        ka2.metric("Fraud Risk (>5x)", f"{risk_rate:.1%}", f"{high_risk_nik:,} suspicious NIK")
+        ka3.metric("Data Quality", f"{data_quality:.1%}", "overall field accuracy")
 
-ka1, ka2, ka3 = st.columns(3)
-ka1.metric("Duplicate Rate", f"{duplicate_rate:.1%}", f"{duplicate_requests:,} wasted requests")
-ka2.metric("Fraud Risk (>5x)", f"{risk_rate:.1%}", f"{high_risk_nik:,} suspicious NIK")
-ka3.metric("Data Quality", f"{quality_score:.1%}", "overall field accuracy")
+        # ======================
+        # SOURCE RESULT - STACKED BAR (NIK + TOTAL REQUEST)
+        # ======================
+        perf.mark("SOURCE PERFORMANCE", rows=n_rows)
 
-# ======================
-# ======================
-# SOURCE RESULT - STACKED BAR (NIK + TOTAL REQUEST)
-# ======================
-st.subheader("Source Result Distribution (NIK vs Request)")
-
-# Hitung hit per NIK per SourceResult
-nik_source = (
-    df_f
-    .groupby(["SourceResult", "Nik"])
-    .size()
-    .reset_index(name="hit_count")
-)
+        st.subheader("Source Result Distribution (NIK vs Request)")
 
-nik_source["hit_type"] = nik_source["hit_count"].apply(
-    lambda x: "Hit 1x" if x == 1 else "Hit >1x"
-)
+        # Agregasi NIK per SourceResult (Hit 1x / Hit >1x) dari hit per source di profile
+        src_nik_stack = results["src_nik_stack"]
+        source_perf = results["source_perf"]
 
-# Agregasi NIK
-src_nik_stack = (
-    nik_source
-    .groupby(["SourceResult", "hit_type"])
-    .size()
-    .reset_index(name="nik_count")
-)
+        # Total request per source
+        src_request = source_perf[["SourceResult", "Total_Requests"]].rename(columns={"Total_Requests": "total_request"})
 
-# Total request per source
-src_request = (
-    df_f
-    .groupby("SourceResult")
-    .size()
-    .reset_index(name="total_request")
-)
+        # Merge supaya bisa kasih label request
+        src_chart = src_nik_stack.merge(
+            src_request,
+            on="SourceResult",
+            how="left"
+        )
 
-# Merge supaya bisa kasih label request
-src_chart = src_nik_stack.merge(
-    src_request,
-    on="SourceResult",
-    how="left"
-)
+        # Plot
+        fig_src = px.bar(
+            src_chart,
+            x="SourceResult",
+            y="nik_count",
+            color="hit_type",
+            text="nik_count",
+            title="NIK Distribution per Source Result (with Total Request)",
+            labels={
+                "nik_count": "Jumlah NIK",
+                "hit_type": "Kategori Hit"
+            }
+        )
 
-# Plot
-fig_src = px.bar(
-    src_chart,
-    x="SourceResult",
-    y="nik_count",
-    color="hit_type",
-    text="nik_count",
-    title="NIK Distribution per Source Result (with Total Request)",
-    labels={
-        "nik_count": "Jumlah NIK",
-        "hit_type": "Kategori Hit"
-    }
-)
+        # Tambahin total request di atas bar
+        fig_src.update_traces(
+            textposition="inside"
+        )
 
-# Tambahin total request di atas bar
-fig_src.update_traces(
-    textposition="inside"
-)
+        fig_src.update_xaxes(categoryorder="total descending")
+
+        # Tambah anotasi total request
+        for i, row in src_request.iterrows():
+            fig_src.add_annotation(
+                x=row["SourceResult"],
+                y=src_nik_stack[src_nik_stack["SourceResult"] == row["SourceResult"]]["nik_count"].sum(),
+                text=f"Req: {row['total_request']:,}",
+                showarrow=False,
+                yshift=10
+            )
+
+        st.plotly_chart(fig_src, use_container_width=True)
+
+        # ======================
+        # TAMBAHAN: SOURCE PERFORMANCE ANALYSIS
+        # ======================
+        st.subheader("🎯 Source Performance Analysis")
+
+        fig_perf = go.Figure()
+
+        fig_perf.add_trace(go.Bar(
+            name="Quality Score",
+            x=source_perf["SourceResult"],
+            y=source_perf["Quality_Score"],
+            yaxis="y",
+            marker_color="lightblue"
+        ))
+
+        fig_perf.add_trace(go.Scatter(
+            name="Cost Efficiency",
+            x=source_perf["SourceResult"],
+            y=source_perf["Cost_Efficiency"],
+            yaxis="y2",
+            marker_color="red",
+            mode="lines+markers",
+            line=dict(width=3)
+        ))
+
+        fig_perf.update_layout(
+            title="Quality vs Efficiency Trade-off by Source",
+            yaxis=dict(title="Quality Score", range=[0, 1]),
+            yaxis2=dict(title="Cost Efficiency", overlaying="y", side="right", range=[0, 1]),
+            hovermode="x unified"
+        )
 
-fig_src.update_xaxes(categoryorder="total descending")
+        st.plotly_chart(fig_perf, use_container_width=True)
 
-# Tambah anotasi total request
-for i, row in src_request.iterrows():
-    fig_src.add_annotation(
-        x=row["SourceResult"],
-        y=src_nik_stack[src_nik_stack["SourceResult"] == row["SourceResult"]]["nik_count"].sum(),
-        text=f"Req: {row['total_request']:,}",
-        showarrow=False,
-        yshift=10
-    )
+        st.dataframe(
+            source_perf.style.format({
+                "Quality_Score": "{:.1%}",
+                "Duplicate_Rate": "{:.1%}",
+                "Cost_Efficiency": "{:.1%}"
+            }).background_gradient(subset=["Quality_Score", "Cost_Efficiency"], cmap="RdYlGn"),
+            use_container_width=True
+        )
 
-st.plotly_chart(fig_src, use_container_width=True)
+with tab_quality:
+    if tab_quality.open:
+        # ======================
+        # STATUS RECAP
+        # ======================
+        results = section_results("STATUS RECAP", "SOURCE PERFORMANCE")
+        perf.mark("STATUS RECAP", rows=n_rows)
 
-# ======================
-# TAMBAHAN: SOURCE PERFORMANCE ANALYSIS
-# ======================
-st.subheader("🎯 Source Performance Analysis")
-
-source_quality = df_f.groupby("SourceResult")[status_cols].apply(
-    lambda x: (x == "Sesuai").sum().sum() / (len(x) * len(status_cols))
-).reset_index(name="Quality_Score")
-
-source_unique = df_f.groupby("SourceResult")["Nik"].nunique().reset_index(name="Unique_NIK")
-source_total = df_f.groupby("SourceResult").size().reset_index(name="Total_Requests")
-
-source_perf = source_total.merge(source_unique, on="SourceResult").merge(source_quality, on="SourceResult")
-source_perf["Cost_Efficiency"] = source_perf["Unique_NIK"] / source_perf["Total_Requests"]
-source_perf["Duplicate_Rate"] = 1 - source_perf["Cost_Efficiency"]
-
-fig_perf = go.Figure()
-
-fig_perf.add_trace(go.Bar(
-    name="Quality Score",
-    x=source_perf["SourceResult"],
-    y=source_perf["Quality_Score"],
-    yaxis="y",
-    marker_color="lightblue"
-))
-
-fig_perf.add_trace(go.Scatter(
-    name="Cost Efficiency",
-    x=source_perf["SourceResult"],
-    y=source_perf["Cost_Efficiency"],
-    yaxis="y2",
-    marker_color="red",
-    mode="lines+markers",
-    line=dict(width=3)
-))
-
-fig_perf.update_layout(
-    title="Quality vs Efficiency Trade-off by Source",
-    yaxis=dict(title="Quality Score", range=[0, 1]),
-    yaxis2=dict(title="Cost Efficiency", overlaying="y", side="right", range=[0, 1]),
-    hovermode="x unified"
-)
+        st.subheader("Kesesuaian per Field")
 
-st.plotly_chart(fig_perf, use_container_width=True)
+        # Hitung per field dari bitmask status (tanpa melt 9×N)
+        rekap_long = results["rekap_long"]
 
-st.dataframe(
-    source_perf.style.format({
-        "Quality_Score": "{:.1%}",
-        "Duplicate_Rate": "{:.1%}",
-        "Cost_Efficiency": "{:.1%}"
-    }).background_gradient(subset=["Quality_Score", "Cost_Efficiency"], cmap="RdYlGn"),
-    use_container_width=True
-)
+        fig_status = px.bar(
+            rekap_long,
+            x="Field",
+            y="Count",
+            color="Status",
+            barmode="stack"
+        )
 
-# ======================
-# STATUS RECAP
-# ======================
-st.subheader("Kesesuaian per Field")
-
-rekap_long = (
-    df_f[status_cols]
-    .melt(var_name="Field", value_name="Status")
-    .groupby(["Field", "Status"])
-    .size()
-    .reset_index(name="Count")
-)
+        st.plotly_chart(fig_status, use_container_width=True)
+
+        # ======================
+        # TAMBAHAN: FIELD ACCURACY RANKING
+        # ======================
+        st.subheader("🎯 Field Accuracy Ranking")
+
+        field_df = results["field_df"]
+
+        fig_field = px.bar(
+            field_df,
+            x="Accuracy",
+            y="Field",
+            orientation="h",
+            title="Field Verification Accuracy (%)",
+            color="Accuracy",
+            color_continuous_scale="RdYlGn",
+            range_color=[0, 100],
+            text="Accuracy"
+        )
+        fig_field.update_traces(texttemplate='%{text:.1f}%', textposition='outside')
 
-fig_status = px.bar(
-    rekap_long,
-    x="Field",
-    y="Count",
-    color="Status",
-    barmode="stack"
-)
+        st.plotly_chart(fig_field, use_container_width=True)
 
-st.plotly_chart(fig_status, use_container_width=True)
+        # ======================
+        # SOURCE QUALITY
+        # ======================
+        perf.mark("SOURCE PERFORMANCE", rows=n_rows)
 
-# ======================
-# TAMBAHAN: FIELD ACCURACY RANKING
-# ======================
-st.subheader("🎯 Field Accuracy Ranking")
-
-field_accuracy = (df_f[status_cols] == "Sesuai").mean() * 100
-field_df = field_accuracy.reset_index()
-field_df.columns = ["Field", "Accuracy"]
-field_df = field_df.sort_values("Accuracy")
-
-fig_field = px.bar(
-    field_df,
-    x="Accuracy",
-    y="Field",
-    orientation="h",
-    title="Field Verification Accuracy (%)",
-    color="Accuracy",
-    color_continuous_scale="RdYlGn",
-    range_color=[0, 100],
-    text="Accuracy"
-)
-fig_field.update_traces(texttemplate='%{text:.1f}%', textposition='outside')
+        st.subheader("% Sesuai per Source")
 
-st.plotly_chart(fig_field, use_container_width=True)
+        source_quality = results["source_quality"]
 
-# ======================
-# REPEAT NIK
-# ======================
-st.subheader("Repeat NIK (Top 20)")
+        st.dataframe(source_quality, use_container_width=True)
 
-repeat_table = (
-    df_f["Nik"]
-    .value_counts()
-    .reset_index()
-)
+with tab_traffic:
+    if tab_traffic.open:
+        # ======================
+        # REPEAT NIK
+        # ======================
+        results = section_results("REPEAT NIK", "TREND", "PEAK TIME")
+        perf.mark("REPEAT NIK", rows=n_rows)
 
-repeat_table.columns = ["Nik", "Total Request"]
-repeat_table = repeat_table[repeat_table["Total Request"] > 1].head(50)
+        st.subheader("Repeat NIK (Top 20)")
 
-st.dataframe(repeat_table, use_container_width=True)
+        repeat_table = results["repeat_table"]
+        repeat_table = repeat_table[repeat_table["Total Request"] > 1].head(50)
 
-# ======================
-# TAMBAHAN: FRAUD RISK VISUALIZATION
-# ======================
-st.subheader("⚠️ Fraud Risk Analysis - Top 10 Suspicious NIK")
-
-top_repeat = nik_counts.nlargest(10).reset_index()
-top_repeat.columns = ["NIK", "Hit_Count"]
-
-fig_fraud = px.bar(
-    top_repeat,
-    x="NIK",
-    y="Hit_Count",
-    title="Top 10 Most Repeated NIK (Potential Fraud)",
-    color="Hit_Count",
-    color_continuous_scale="Reds",
-    text="Hit_Count"
-)
-fig_fraud.update_traces(textposition='outside')
+        st.dataframe(repeat_table, use_container_width=True)
 
-st.plotly_chart(fig_fraud, use_container_width=True)
+        # ======================
+        # TAMBAHAN: FRAUD RISK VISUALIZATION
+        # ======================
+        st.subheader("⚠️ Fraud Risk Analysis - Top 10 Suspicious NIK")
 
-# ======================
-# DAILY TREND
-# ======================
-st.subheader("Daily Request Trend")
+        top_repeat = results["top_repeat"]
 
-daily = (
-    df_f
-    .groupby(df_f["CreatedDate"].dt.date)
-    .size()
-    .reset_index(name="Total")
-)
+        fig_fraud = px.bar(
+            top_repeat,
+            x="NIK",
+            y="Hit_Count",
+            title="Top 10 Most Repeated NIK (Potential Fraud)",
+            color="Hit_Count",
+            color_continuous_scale="Reds",
+            text="Hit_Count"
+        )
+        fig_fraud.update_traces(textposition='outside')
 
-fig_trend = px.line(
-    daily,
-    x="CreatedDate",
-    y="Total",
-    markers=True
-)
+        st.plotly_chart(fig_fraud, use_container_width=True)
 
-st.plotly_chart(fig_trend, use_container_width=True)
+        # ======================
+        # DAILY TREND
+        # ======================
+        perf.mark("TREND", rows=n_rows)
 
-# ======================
-# TAMBAHAN: TREND WITH UNIQUE NIK
-# ======================
-st.subheader("📈 Request vs Unique NIK Trend")
-
-daily_detailed = df_f.groupby(df_f["CreatedDate"].dt.date).agg({
-    "Nik": ["count", "nunique"]
-})
-daily_detailed.columns = ["Total_Requests", "Unique_NIK"]
-daily_detailed = daily_detailed.reset_index()
-daily_detailed.columns = ["Date", "Total_Requests", "Unique_NIK"]
-
-fig_trend_detail = go.Figure()
-
-fig_trend_detail.add_trace(go.Scatter(
-    x=daily_detailed["Date"],
-    y=daily_detailed["Total_Requests"],
-    name="Total Requests",
-    mode="lines+markers",
-    line=dict(color="steelblue", width=2)
-))
-
-fig_trend_detail.add_trace(go.Scatter(
-    x=daily_detailed["Date"],
-    y=daily_detailed["Unique_NIK"],
-    name="Unique NIK",
-    mode="lines+markers",
-    line=dict(color="green", width=2)
-))
-
-fig_trend_detail.update_layout(
-    title="Daily Requests vs Unique NIK (Gap = Duplicates)",
-    hovermode="x unified"
-)
+        st.subheader("Daily Request Trend")
 
-st.plotly_chart(fig_trend_detail, use_container_width=True)
+        daily = results["daily"]
 
-# ======================
-# SOURCE QUALITY
-# ======================
-st.subheader("% Sesuai per Source")
+        fig_trend = px.line(
+            daily,
+            x="Date",
+            y="Total",
+            markers=True,
+            labels={"Date": "CreatedDate"}
+        )
 
-source_quality = (
-    df_f
-    .groupby("SourceResult")[status_cols]
-    .apply(lambda x: (x == "Sesuai").mean())
-    .reset_index()
-)
+        st.plotly_chart(fig_trend, use_container_width=True)
 
-st.dataframe(source_quality, use_container_width=True)
+        # ======================
+        # TAMBAHAN: TREND WITH UNIQUE NIK
+        # ======================
+        st.subheader("📈 Request vs Unique NIK Trend")
 
-# ======================
-# PEAK TIME - HOURLY
-# ======================
-st.subheader("Peak Time – Hourly Request")
+        daily_detailed = daily
 
-df_f["Hour"] = df_f["CreatedDate"].dt.hour
+        fig_trend_detail = go.Figure()
 
-hourly = df_f.groupby("Hour").size().reset_index(name="Total_Request")
+        fig_trend_detail.add_trace(go.Scatter(
+            x=daily_detailed["Date"],
+            y=daily_detailed["Total_Requests"],
+            name="Total Requests",
+            mode="lines+markers",
+            line=dict(color="steelblue", width=2)
+        ))
 
-fig_hour = px.bar(
-    hourly,
-    x="Hour",
-    y="Total_Request",
-    text="Total_Request"
-)
-st.plotly_chart(fig_hour, use_container_width=True)
+        fig_trend_detail.add_trace(go.Scatter(
+            x=daily_detailed["Date"],
+            y=daily_detailed["Unique_NIK"],
+            name="Unique NIK",
+            mode="lines+markers",
+            line=dict(color="green", width=2)
+        ))
 
-peak_hour = hourly.loc[hourly["Total_Request"].idxmax()]
-st.metric(
-    "Jam Tersibuk",
-    f"{int(peak_hour['Hour'])}:00",
-    f"{int(peak_hour['Total_Request']):,} request"
-)
+        fig_trend_detail.update_layout(
+            title="Daily Requests vs Unique NIK (Gap = Duplicates)",
+            hovermode="x unified"
+        )
 
-# ======================
-# TAMBAHAN: HOURLY ANOMALY DETECTION
-# ======================
-mean_hourly = hourly["Total_Request"].mean()
-std_hourly = hourly["Total_Request"].std()
-hourly["Anomaly"] = hourly["Total_Request"] > (mean_hourly + 2*std_hourly)
-hourly["Status"] = hourly["Anomaly"].apply(lambda x: "Anomaly" if x else "Normal")
-
-fig_anomaly = px.bar(
-    hourly,
-    x="Hour",
-    y="Total_Request",
-    title="Hourly Traffic with Anomaly Detection (>2σ)",
-    color="Status",
-    color_discrete_map={"Normal": "steelblue", "Anomaly": "red"},
-    text="Total_Request"
-)
-st.plotly_chart(fig_anomaly, use_container_width=True)
+        st.plotly_chart(fig_trend_detail, use_container_width=True)
 
-# ======================
-# PEAK TIME - DAILY
-# ======================
-st.subheader("Peak Time – Day of Week")
+        # ======================
+        # PEAK TIME - HOURLY
+        # ======================
+        perf.mark("PEAK TIME", rows=n_rows)
 
-df_f["Day"] = df_f["CreatedDate"].dt.day_name()
+        st.subheader("Peak Time – Hourly Request")
 
-day_order = ["Monday","Tuesday","Wednesday","Thursday","Friday","Saturday","Sunday"]
+        # Kolom Hour (int8) sudah dihitung saat ingest
+        hourly = results["hourly"]
 
-daily = (
-    df_f.groupby("Day")
-    .size()
-    .reindex(day_order)
-    .reset_index(name="Total_Request")
-)
+        fig_hour = px.bar(
+            hourly,
+            x="Hour",
+            y="Total_Request",
+            text="Total_Request"
+        )
+        st.plotly_chart(fig_hour, use_container_width=True)
 
-fig_day = px.bar(
-    daily,
-    x="Day",
-    y="Total_Request",
-    text="Total_Request"
-)
-st.plotly_chart(fig_day, use_container_width=True)
+        peak_hour = results["peak_hour"]
+        st.metric(
+            "Jam Tersibuk",
+            f"{int(peak_hour['Hour'])}:00",
+            f"{int(peak_hour['Total_Request']):,} request"
+        )
 
-# ======================
-# FRAUD DETECTION ANALYSIS
-# ======================
-st.markdown("---")
-st.subheader("🚨 Fraud Detection & Anomaly Analysis")
+        # ======================
+        # TAMBAHAN: HOURLY ANOMALY DETECTION
+        # ======================
+        fig_anomaly = px.bar(
+            hourly,
+            x="Hour",
+            y="Total_Request",
+            title="Hourly Traffic with Anomaly Detection (>2σ)",
+            color="Status",
+            color_discrete_map={"Normal": "steelblue", "Anomaly": "red"},
+            text="Total_Request"
+        )
+        st.plotly_chart(fig_anomaly, use_container_width=True)
+
+        # ======================
+        # PEAK TIME - DAILY
+        # ======================
+        st.subheader("Peak Time – Day of Week")
+
+        # Weekday (int8, 0 = Monday) sudah dihitung saat ingest, tanpa day_name() per baris
+        daily = results["weekday"]
+
+        fig_day = px.bar(
+            daily,
+            x="Day",
+            y="Total_Request",
+            text="Total_Request"
+        )
+        st.plotly_chart(fig_day, use_container_width=True)
+
+with tab_fraud:
+    if tab_fraud.open:
+        # ======================
+        # FRAUD DETECTION ANALYSIS
+        # ======================
+        results = section_results(
+            "FRAUD SAME APP", "FRAUD STATUS INCONSISTENCY", "FRAUD RAPID FIRE", "FRAUD CROSS SOURCE",
+            "SOURCE PERFORMANCE", "STATUS RECAP", "PEAK TIME"
+        )
+
+        st.subheader("🚨 Fraud Detection & Anomaly Analysis")
 
-# 1. SAME APP ID ANOMALY
-st.markdown("### 1️⃣ Same SourceApps Pattern (Potential Bot/Script)")
+        # 1. SAME APP ID ANOMALY
+        perf.mark("FRAUD SAME APP", rows=n_rows)
+        st.markdown("### 1️⃣ Same SourceApps Pattern (Potential Bot/Script)")
 
-same_app = df_f.groupby(["SourceApps", "Nik"]).size().reset_index(name="Hit_Count")
-same_app_suspicious = same_app[same_app["Hit_Count"] > 3].sort_values("Hit_Count", ascending=False)
+        same_app_suspicious = results["same_app_suspicious"]
 
-if len(same_app_suspicious) > 0:
-    st.error(f"⚠️ Ditemukan **{len(same_app_suspicious)}** kombinasi SourceApps-NIK dengan hit >3x")
+        if len(same_app_suspicious) > 0:
+            st.error(f"⚠️ Ditemukan **{len(same_app_suspicious)}** kombinasi SourceApps-NIK dengan hit >3x")
     
-    # Group by app
-    app_summary = same_app_suspicious.groupby("SourceApps").agg({
-        "Nik": "count",
-        "Hit_Count": "sum"
-    }).reset_index()
-    app_summary.columns = ["SourceApps", "Unique_NIK", "Total_Hits"]
-    app_summary = app_summary.sort_values("Total_Hits", ascending=False)
+            # Group by app
+            app_summary = results["app_summary"]
     
-    col_app1, col_app2 = st.columns([1, 2])
+            col_app1, col_app2 = st.columns([1, 2])
     
-    with col_app1:
-        st.dataframe(
-            app_summary.head(10),
-            use_container_width=True
-        )
+            with col_app1:
+                st.dataframe(
+                    app_summary.head(10),
+                    use_container_width=True
+                )
     
-    with col_app2:
-        fig_app = px.bar(
-            app_summary.head(10),
-            x="SourceApps",
-            y="Total_Hits",
-            color="Unique_NIK",
-            title="Top Suspicious SourceApps",
-            text="Total_Hits"
-        )
-        st.plotly_chart(fig_app, use_container_width=True)
+            with col_app2:
+                fig_app = px.bar(
+                    app_summary.head(10),
+                    x="SourceApps",
+                    y="Total_Hits",
+                    color="Unique_NIK",
+                    title="Top Suspicious SourceApps",
+                    text="Total_Hits"
+                )
+                st.plotly_chart(fig_app, use_container_width=True)
     
-    st.markdown("**Detail Top Suspicious Patterns:**")
-    st.dataframe(
-        same_app_suspicious.head(20),
-        use_container_width=True
-    )
-else:
-    st.success("✅ Tidak ada pola suspicious pada SourceApps")
-
-# 2. STATUS INCONSISTENCY (Multiple status dalam 1 NIK)
-st.markdown("### 2️⃣ Status Inconsistency (Data Instability)")
-
-# Cari NIK dengan status yang berubah-ubah (tidak konsisten)
-inconsistency_results = []
-
-for nik in df_f["Nik"].unique():
-    df_nik_check = df_f[df_f["Nik"] == nik].sort_values("CreatedDate")
-    
-    if len(df_nik_check) > 1:
-        for col in status_cols:
-            unique_statuses = df_nik_check[col].unique()
-            
-            # Jika ada lebih dari 1 status untuk field yang sama
-            if len(unique_statuses) > 1 and "-" not in unique_statuses:
-                status_sequence = df_nik_check[col].tolist()
-                
-                inconsistency_results.append({
-                    "NIK": nik,
-                    "Field": col,
-                    "Status_Sequence": " → ".join(status_sequence[:5]),  # Max 5 untuk display
-                    "Unique_Statuses": len(unique_statuses),
-                    "Total_Hits": len(df_nik_check),
-                    "First_Date": df_nik_check.iloc[0]["CreatedDate"],
-                    "Last_Date": df_nik_check.iloc[-1]["CreatedDate"],
-                    "Sources_Used": ", ".join(df_nik_check["SourceResult"].unique()),
-                    "SourceApps": df_nik_check.iloc[0]["SourceApps"]
-                })
-
-if len(inconsistency_results) > 0:
-    df_inconsist = pd.DataFrame(inconsistency_results)
-    
-    st.warning(f"⚠️ Ditemukan **{len(df_inconsist)}** kasus status inconsistency")
-    
-    # Summary by field
-    inconsist_summary = df_inconsist.groupby("Field").agg({
-        "NIK": "count",
-        "Total_Hits": "sum"
-    }).reset_index()
-    inconsist_summary.columns = ["Field", "Affected_NIK", "Total_Inconsistent_Hits"]
-    inconsist_summary = inconsist_summary.sort_values("Affected_NIK", ascending=False)
-    
-    col_inconsist1, col_inconsist2 = st.columns([1, 2])
-    
-    with col_inconsist1:
-        st.dataframe(inconsist_summary, use_container_width=True)
+            st.markdown("**Detail Top Suspicious Patterns:**")
+            paged_table(same_app_suspicious, key="same_app")
+        else:
+            st.success("✅ Tidak ada pola suspicious pada SourceApps")
+
+        # 2. STATUS INCONSISTENCY (Multiple status dalam 1 NIK)
+        perf.mark("FRAUD STATUS INCONSISTENCY", rows=n_rows)
+        st.markdown("### 2️⃣ Status Inconsistency (Data Instability)")
+
+        # Cari NIK dengan status yang berubah-ubah (tidak konsisten) - satu pass groupby, bukan loop per NIK
+        df_inconsist = results["df_inconsist"]
+
+        if len(df_inconsist) > 0:
+    
+            st.warning(f"⚠️ Ditemukan **{len(df_inconsist)}** kasus status inconsistency")
+    
+            # Summary by field
+            inconsist_summary = results["inconsist_summary"]
+    
+            col_inconsist1, col_inconsist2 = st.columns([1, 2])
+    
+            with col_inconsist1:
+                st.dataframe(inconsist_summary, use_container_width=True)
         
-        # Metric summary
-        st.metric("Total Affected NIK", len(df_inconsist["NIK"].unique()))
-        st.metric("Most Unstable Field", inconsist_summary.iloc[0]["Field"])
+                # Metric summary
+                st.metric("Total Affected NIK", len(df_inconsist["NIK"].unique()))
+                st.metric("Most Unstable Field", inconsist_summary.iloc[0]["Field"])
     
-    with col_inconsist2:
-        fig_inconsist = px.bar(
-            inconsist_summary,
-            x="Field",
-            y="Affected_NIK",
-            title="Status Inconsistency by Field",
-            color="Affected_NIK",
-            color_continuous_scale="Oranges",
-            text="Affected_NIK"
-        )
-        fig_inconsist.update_traces(textposition='outside')
-        st.plotly_chart(fig_inconsist, use_container_width=True)
+            with col_inconsist2:
+                fig_inconsist = px.bar(
+                    inconsist_summary,
+                    x="Field",
+                    y="Affected_NIK",
+                    title="Status Inconsistency by Field",
+                    color="Affected_NIK",
+                    color_continuous_scale="Oranges",
+                    text="Affected_NIK"
+                )
+                fig_inconsist.update_traces(textposition='outside')
+                st.plotly_chart(fig_inconsist, use_container_width=True)
     
-    st.markdown("**Detail Inconsistency Cases (Top 20):**")
-    st.dataframe(
-        df_inconsist.sort_values("Total_Hits", ascending=False).head(20),
-        use_container_width=True
-    )
+            st.markdown("**Detail Inconsistency Cases:**")
+            paged_table(df_inconsist, key="inconsist", sort_by="Total_Hits", ascending=False)
     
-    # Tambahan: Cek pattern Sesuai → Tidak Sesuai specifically
-    sesuai_to_tidak = []
-    for nik in df_f["Nik"].unique():
-        df_nik_check = df_f[df_f["Nik"] == nik].sort_values("CreatedDate")
-        if len(df_nik_check) > 1:
-            for col in status_cols:
-                statuses = df_nik_check[col].tolist()
-                # Cek ada pattern Sesuai diikuti Tidak Sesuai
-                for i in range(len(statuses)-1):
-                    if statuses[i] == "Sesuai" and statuses[i+1] == "Tidak Sesuai":
-                        sesuai_to_tidak.append({
-                            "NIK": nik,
-                            "Field": col,
-                            "When": df_nik_check.iloc[i+1]["CreatedDate"]
-                        })
-                        break
-    
-    if len(sesuai_to_tidak) > 0:
-        st.error(f"🔴 **CRITICAL**: {len(sesuai_to_tidak)} cases of 'Sesuai' → 'Tidak Sesuai' flip detected!")
-        st.dataframe(pd.DataFrame(sesuai_to_tidak).head(10), use_container_width=True)
+            # Tambahan: Cek pattern Sesuai → Tidak Sesuai specifically (shift per NIK, sekali sort)
+            sesuai_to_tidak = results["sesuai_to_tidak"]
     
-else:
-    st.success("✅ Tidak ada status inconsistency - Data stabil")
-
-# 3. RAPID FIRE PATTERN (Multiple hits dalam waktu singkat)
-st.markdown("### 3️⃣ Rapid Fire Pattern (Bot Detection)")
+            if len(sesuai_to_tidak) > 0:
+                st.error(f"🔴 **CRITICAL**: {len(sesuai_to_tidak)} cases of 'Sesuai' → 'Tidak Sesuai' flip detected!")
+                paged_table(sesuai_to_tidak, key="flip", page_size=10)
+    
+            # Matriks transisi status per field (hanya yang berubah)
+            transitions = results["transitions"]
+    
+            if len(transitions) > 0:
+                st.markdown("**Status Transition Matrix (per Field):**")
+                st.dataframe(transitions, use_container_width=True)
+    
+        else:
+            st.success("✅ Tidak ada status inconsistency - Data stabil")
 
-df_f_sorted = df_f.sort_values(["Nik", "CreatedDate"])
-df_f_sorted["Time_Diff"] = df_f_sorted.groupby("Nik")["CreatedDate"].diff().dt.total_seconds()
+        # 3. RAPID FIRE PATTERN (Multiple hits dalam waktu singkat)
+        perf.mark("FRAUD RAPID FIRE", rows=n_rows)
+        st.markdown("### 3️⃣ Rapid Fire Pattern (Bot Detection)")
 
-# Hit dalam waktu < 5 detik
-rapid_fire = df_f_sorted[df_f_sorted["Time_Diff"] < 5].copy()
+        # Hit dalam waktu < 5 detik (hanya NIK dengan Min_Interval_Sec < 5 di profile yang di-sort)
+        df_rapid = results["df_rapid"]
 
-if len(rapid_fire) > 0:
-    st.error(f"⚠️ Ditemukan **{len(rapid_fire)}** request dengan interval <5 detik (possible bot)")
+        if len(df_rapid) > 0:
+            st.error(f"⚠️ Ditemukan **{len(df_rapid)}** request dengan interval <5 detik (possible bot)")
     
-    rapid_summary = rapid_fire.groupby("Nik").agg({
-        "Id": "count",
-        "Time_Diff": "mean",
-        "SourceApps": lambda x: x.iloc[0]
-    }).reset_index()
-    rapid_summary.columns = ["NIK", "Rapid_Hits", "Avg_Interval_Sec", "SourceApps"]
-    rapid_summary = rapid_summary.sort_values("Rapid_Hits", ascending=False)
+            rapid_summary = results["rapid_summary"]
     
-    col_rapid1, col_rapid2 = st.columns([1, 1])
+            col_rapid1, col_rapid2 = st.columns([1, 1])
     
-    with col_rapid1:
-        st.dataframe(
-            rapid_summary.head(15),
-            use_container_width=True
-        )
+            with col_rapid1:
+                st.dataframe(
+                    rapid_summary.head(15),
+                    use_container_width=True
+                )
     
-    with col_rapid2:
-        fig_rapid = px.scatter(
-            rapid_summary.head(20),
-            x="Avg_Interval_Sec",
-            y="Rapid_Hits",
-            size="Rapid_Hits",
-            color="Rapid_Hits",
-            hover_data=["NIK", "SourceApps"],
-            title="Rapid Fire Pattern Analysis",
-            color_continuous_scale="Reds"
-        )
-        st.plotly_chart(fig_rapid, use_container_width=True)
-else:
-    st.success("✅ Tidak ada rapid fire pattern")
+            with col_rapid2:
+                fig_rapid = px.scatter(
+                    rapid_summary.head(20),
+                    x="Avg_Interval_Sec",
+                    y="Rapid_Hits",
+                    size="Rapid_Hits",
+                    color="Rapid_Hits",
+                    hover_data=["NIK", "SourceApps"],
+                    title="Rapid Fire Pattern Analysis",
+                    color_continuous_scale="Reds"
+                )
+                st.plotly_chart(fig_rapid, use_container_width=True)
+        else:
+            st.success("✅ Tidak ada rapid fire pattern")
+
+        # 3b. BURST WINDOW (≥k request dalam T detik per key, bukan hanya jarak ke request sebelumnya)
+        perf.mark("FRAUD BURST", rows=n_rows)
+        st.markdown(f"### ⏱️ Burst Window (≥{burst_min} request dalam {burst_sec} detik per {burst_key})")
+
+        burst_by = BURST_KEYS[burst_key]
+        bursts = burst_results(burst_by, int(burst_min), int(burst_sec))
+        df_burst = bursts["df_burst"]
+
+        if len(df_burst) > 0:
+            burst_table = bursts["burst_summary"]
+            st.error(f"⚠️ **{len(burst_table)}** {burst_key} dengan burst · **{len(df_burst)}** request di dalam window burst")
+    
+            col_burst1, col_burst2 = st.columns([1, 1])
+    
+            with col_burst1:
+                st.dataframe(burst_table.head(15), use_container_width=True)
+    
+            with col_burst2:
+                top_burst = burst_table.head(20).assign(Key=lambda t: t[burst_by].astype(str).agg(" · ".join, axis=1))
+                fig_burst = px.bar(
+                    top_burst,
+                    x="Key",
+                    y="Burst_Requests",
+                    color="Max_In_Window",
+                    title=f"Top Burst per {burst_key}",
+                    color_continuous_scale="Reds"
+                )
+                st.plotly_chart(fig_burst, use_container_width=True)
+    
+            st.markdown("**Detail Request dalam Burst:**")
+            paged_table(df_burst, key="burst")
+        else:
+            st.success(f"✅ Tidak ada burst ≥{burst_min} request dalam {burst_sec} detik")
 
-# 4. CROSS-SOURCE INCONSISTENCY
-st.markdown("### 4️⃣ Cross-Source Data Inconsistency")
+        # 4. CROSS-SOURCE INCONSISTENCY
+        perf.mark("FRAUD CROSS SOURCE", rows=n_rows)
+        st.markdown("### 4️⃣ Cross-Source Data Inconsistency")
 
-cross_inconsistency = []
+        # Modus status per (NIK, SourceResult, field) dalam satu groupby per field
+        df_cross = results["df_cross"]
 
-for nik in df_f["Nik"].unique():
-    df_nik_cross = df_f[df_f["Nik"] == nik]
+        if len(df_cross) > 0:
     
-    if df_nik_cross["SourceResult"].nunique() > 1:
-        for col in status_cols:
-            statuses_by_source = df_nik_cross.groupby("SourceResult")[col].apply(lambda x: x.mode()[0] if len(x.mode()) > 0 else x.iloc[0])
-            
-            if statuses_by_source.nunique() > 1:
-                cross_inconsistency.append({
-                    "NIK": nik,
-                    "Field": col,
-                    "Sources": ", ".join(statuses_by_source.index.tolist()),
-                    "Values": ", ".join(statuses_by_source.values.tolist()),
-                    "Hit_Count": len(df_nik_cross)
-                })
-
-if len(cross_inconsistency) > 0:
-    df_cross = pd.DataFrame(cross_inconsistency)
+            st.warning(f"⚠️ Ditemukan **{len(df_cross)}** kasus inconsistency antar source")
     
-    st.warning(f"⚠️ Ditemukan **{len(df_cross)}** kasus inconsistency antar source")
+            cross_summary = results["cross_summary"]
     
-    cross_summary = df_cross.groupby("Field").size().reset_index(name="Inconsistency_Count")
-    cross_summary = cross_summary.sort_values("Inconsistency_Count", ascending=False)
+            col_cross1, col_cross2 = st.columns([1, 2])
     
-    col_cross1, col_cross2 = st.columns([1, 2])
+            with col_cross1:
+                st.dataframe(cross_summary, use_container_width=True)
     
-    with col_cross1:
-        st.dataframe(cross_summary, use_container_width=True)
+            with col_cross2:
+                fig_cross = px.bar(
+                    cross_summary,
+                    x="Field",
+                    y="Inconsistency_Count",
+                    title="Cross-Source Inconsistency by Field",
+                    color="Inconsistency_Count",
+                    color_continuous_scale="Oranges"
+                )
+                st.plotly_chart(fig_cross, use_container_width=True)
     
-    with col_cross2:
-        fig_cross = px.bar(
-            cross_summary,
-            x="Field",
-            y="Inconsistency_Count",
-            title="Cross-Source Inconsistency by Field",
-            color="Inconsistency_Count",
-            color_continuous_scale="Oranges"
+            st.markdown("**Detail Inconsistency Cases:**")
+            paged_table(df_cross, key="cross")
+        else:
+            st.success("✅ Data konsisten antar source")
+
+        # ======================
+        # CACHE REPLAY SIMULATOR (policy DB_CACHE)
+        # ======================
+        st.markdown("---")
+        perf.mark("CACHE REPLAY", rows=n_rows)
+        st.subheader("💾 Cache Replay Simulator")
+        st.caption(
+            "Log diputar ulang urut CreatedDate: request NIK yang ada di cache simulasi = hit DB_CACHE, "
+            "selain itu panggilan DUKCAPIL/BCA yang lalu disimpan ke cache."
         )
-        st.plotly_chart(fig_cross, use_container_width=True)
-    
-    st.markdown("**Detail Inconsistency Cases (Top 20):**")
-    st.dataframe(
-        df_cross.head(20),
-        use_container_width=True
-    )
-else:
-    st.success("✅ Data konsisten antar source")
 
-# ======================
-# TAMBAHAN: ACTIONABLE INSIGHTS
-# ======================
-st.markdown("---")
-st.subheader("💡 Actionable Insights & Recommendations")
+        c_cap, c_ttl = st.columns(2)
+        sim_capacity = c_cap.number_input("Kapasitas LRU / LFU (NIK)", min_value=1, value=CACHE_SIM_CAPACITY, step=1000, key="sim_capacity")
+        sim_ttl = c_ttl.number_input("TTL (hari)", min_value=1, value=CACHE_SIM_TTL_DAYS, step=1, key="sim_ttl")
+
+        replay_report = cache_replay(int(sim_capacity), int(sim_ttl))
+        # Policy terbaik yang realistis (unbounded hanya batas atas)
+        best_policy = replay_report[replay_report["Policy"] != "UNBOUNDED"].sort_values("Avoided_Calls", ascending=False).iloc[0]
+
+        col_sim1, col_sim2 = st.columns([2, 1])
+
+        with col_sim1:
+            st.dataframe(
+                replay_report.style.format({"Hit_Ratio": "{:.1%}"}),
+                use_container_width=True,
+                hide_index=True
+            )
+
+        with col_sim2:
+            fig_sim = px.bar(
+                replay_report,
+                x="Policy",
+                y="Avoided_Calls",
+                color="Hit_Ratio",
+                title="Avoided DUKCAPIL/BCA Calls per Policy",
+                text="Avoided_Calls",
+                color_continuous_scale="Greens"
+            )
+            st.plotly_chart(fig_sim, use_container_width=True)
+
+        st.info(
+            f"🏆 **{best_policy['Policy']}**: hit ratio {best_policy['Hit_Ratio']:.1%}, "
+            f"{best_policy['Avoided_Calls']:,} panggilan eksternal dihindari, "
+            f"butuh ±{best_policy['Peak_Entries']:,} entry cache"
+        )
 
-insights_col1, insights_col2 = st.columns(2)
+        # ======================
+        # TAMBAHAN: ACTIONABLE INSIGHTS
+        # ======================
+        st.markdown("---")
+        perf.mark("INSIGHTS", rows=n_rows)
 
-with insights_col1:
-    st.markdown("### ⚠️ Issues Detected")
+        st.subheader("💡 Actionable Insights & Recommendations")
+
+        source_perf = results["source_perf"]
+        field_df = results["field_df"]
+        peak_hour = results["peak_hour"]
+
+        insights_col1, insights_col2 = st.columns(2)
+
+        with insights_col1:
+            st.markdown("### ⚠️ Issues Detected")
+    
+            # Fraud risk
+            if high_risk_nik > 0:
+                st.error(f"🚨 **{high_risk_nik} NIK** dengan hit >5x → Investigate for potential fraud")
     
-    # Fraud risk
-    if high_risk_nik > 0:
-        st.error(f"🚨 **{high_risk_nik} NIK** dengan hit >5x → Investigate for potential fraud")
+            # Same app pattern
+            if len(same_app_suspicious) > 0:
+                st.error(f"🤖 **{len(same_app_suspicious)}** suspicious SourceApps patterns → Possible bot activity")
     
-    # Same app pattern
-    if len(same_app_suspicious) > 0:
-        st.error(f"🤖 **{len(same_app_suspicious)}** suspicious SourceApps patterns → Possible bot activity")
+            # Status inconsistency
+            if len(df_inconsist) > 0:
+                st.error(f"🔄 **{len(df_inconsist)}** status inconsistencies detected → Data integrity issue")
     
-    # Status inconsistency
-    if len(inconsistency_results) > 0:
-        st.error(f"🔄 **{len(inconsistency_results)}** status inconsistencies detected → Data integrity issue")
+            # Rapid fire
+            if len(df_rapid) > 0:
+                st.error(f"⚡ **{len(df_rapid)}** rapid fire requests → Bot detection")
     
-    # Rapid fire
-    if len(rapid_fire) > 0:
-        st.error(f"⚡ **{len(rapid_fire)}** rapid fire requests → Bot detection")
+            # Burst window
+            if len(df_burst) > 0:
+                st.error(f"⏱️ **{len(bursts['burst_summary'])}** {burst_key} burst (≥{burst_min} req / {burst_sec}s) → Rate limit per {burst_key}")
     
-    # Low efficiency source
-    worst_source = source_perf.loc[source_perf["Cost_Efficiency"].idxmin()]
-    if worst_source["Cost_Efficiency"] < 0.8:
-        st.warning(f"💰 **{worst_source['SourceResult']}** efficiency hanya {worst_source['Cost_Efficiency']:.1%} → Optimize caching")
+            # Low efficiency source
+            worst_source = source_perf.loc[source_perf["Cost_Efficiency"].idxmin()]
+            if worst_source["Cost_Efficiency"] < 0.8:
+                st.warning(f"💰 **{worst_source['SourceResult']}** efficiency hanya {worst_source['Cost_Efficiency']:.1%} → Optimize caching ({best_policy['Policy']}: {best_policy['Avoided_Calls']:,} call dihindari)")
     
-    # Field accuracy
-    worst_field = field_df.iloc[0]
-    if worst_field["Accuracy"] < 80:
-        st.warning(f"📋 **{worst_field['Field']}** accuracy {worst_field['Accuracy']:.1f}% → Check data quality")
+            # Field accuracy
+            worst_field = field_df.iloc[0]
+            if worst_field["Accuracy"] < 80:
+                st.warning(f"📋 **{worst_field['Field']}** accuracy {worst_field['Accuracy']:.1f}% → Check data quality")
 
-with insights_col2:
-    st.markdown("### ✅ Recommendations")
+        with insights_col2:
+            st.markdown("### ✅ Recommendations")
     
-    st.success(f"⏰ Peak hour: **{int(peak_hour['Hour'])}:00** → Scale infrastructure during this time")
+            st.success(f"⏰ Peak hour: **{int(peak_hour['Hour'])}:00** → Scale infrastructure during this time")
     
-    best_source = source_perf.loc[source_perf["Cost_Efficiency"].idxmax()]
-    st.success(f"🎯 **{best_source['SourceResult']}** has best efficiency ({best_source['Cost_Efficiency']:.1%}) → Use as primary source")
+            best_source = source_perf.loc[source_perf["Cost_Efficiency"].idxmax()]
+            st.success(f"🎯 **{best_source['SourceResult']}** has best efficiency ({best_source['Cost_Efficiency']:.1%}) → Use as primary source")
     
-    if duplicate_rate > 0.3:
-        st.info(f"♻️ {duplicate_rate:.1%} duplicate rate → Implement better caching strategy")
+            if duplicate_rate > 0.3:
+                st.info(
+                    f"♻️ {duplicate_rate:.1%} duplicate rate → Implement better caching strategy: "
+                    f"{best_policy['Policy']} hit ratio {best_policy['Hit_Ratio']:.1%} dengan ±{best_policy['Peak_Entries']:,} entry"
+                )
     
-    if len(rapid_fire) > 0:
-        st.info("🛡️ Implement rate limiting & CAPTCHA for suspicious SourceApps")
+            if len(df_rapid) > 0:
+                st.info("🛡️ Implement rate limiting & CAPTCHA for suspicious SourceApps")
     
-    if len(inconsistency_results) > 0:
-        st.info("🔍 Audit data source reliability & implement version control")
+            if len(df_inconsist) > 0:
+                st.info("🔍 Audit data source reliability & implement version control")
 
 # ======================
-# SIDEBAR - NIK DRILL DOWN
+# NIK DRILL DOWN (fragment: ganti NIK hanya rerun bagian ini)
 # ======================
-st.sidebar.subheader("🔍 NIK Drill Down")
-
-nik_list = sorted(df["Nik"].dropna().astype(str).unique())
-
-nik_options = [""] + nik_list  # opsi kosong
-
-selected_nik = st.sidebar.selectbox(
-    "Cari NIK",
-    options=nik_options,
-    format_func=lambda x: "Ketik NIK..." if x == "" else x
-)
-
-# Drill-down data
-if selected_nik != "":
-    df_nik = df[df["Nik"].astype(str) == selected_nik]
+@st.fragment
+def nik_drill_down():
+    if USE_DUCKDB:
+        search_nik, count_nik, rows_of = log_db.search_nik, log_db.count_nik, log_db.nik_rows
+    else:
+        nik_index = get_nik_index(df_key, df)
+        search_nik, count_nik = nik_index.search, nik_index.count
+        
+        def rows_of(nik):
+            return df.iloc[nik_index.rows(nik)]
     
-    # Ringkasan per Source
-    nik_source = (
-        df_nik["SourceResult"]
-        .value_counts()
-        .reset_index()
-    )
+    nik_query = st.text_input(
+        "Cari NIK",
+        placeholder="Ketik awalan NIK...",
+        help=f"Menampilkan maksimal {NIK_MATCH_LIMIT} NIK pertama yang cocok"
+    ).strip()
+    if USE_STORE:
+        st.caption("📦 Pencarian di partisi yang dibuka oleh filter tanggal")
     
-    nik_source.columns = ["SourceResult", "Total"]
+    selected_nik = ""
+    if nik_query:
+        # Prefix search di index terurut (searchsorted), hanya top match yang dikirim ke browser
+        matches = search_nik(nik_query, limit=NIK_MATCH_LIMIT)
+        n_match = count_nik(nik_query)
+        
+        if matches:
+            selected_nik = st.selectbox(
+                f"{n_match:,} NIK cocok",
+                options=matches,
+                index=matches.index(nik_query) if nik_query in matches else 0
+            )
+        else:
+            st.warning(f"Tidak ada NIK yang diawali '{nik_query}'")
     
-    c1, c2, c3 = st.columns(3)
+    # Drill-down data
+    if selected_nik != "":
+        df_nik = rows_of(selected_nik)
     
-    c1.metric(
-        "DB_CACHE",
-        int(nik_source.loc[nik_source["SourceResult"] == "DB_CACHE", "Total"].sum())
-    )
+        # Ringkasan per Source
+        nik_source = nik_source_counts(df_nik)
     
-    c2.metric(
-        "DUKCAPIL",
-        int(nik_source.loc[nik_source["SourceResult"] == "DUKCAPIL", "Total"].sum())
-    )
+        c1, c2, c3 = st.columns(3)
     
-    c3.metric(
-        "BCA",
-        int(nik_source.loc[nik_source["SourceResult"] == "BCA", "Total"].sum())
-    )
+        c1.metric(
+            "DB_CACHE",
+            int(nik_source.loc[nik_source["SourceResult"] == "DB_CACHE", "Total"].sum())
+        )
     
-    # Chart
-    fig_nik = px.bar(
-        nik_source,
-        x="SourceResult",
-        y="Total",
-        color="SourceResult",
-        text="Total",
-        title=f"Request Distribution for NIK {selected_nik}"
-    )
+        c2.metric(
+            "DUKCAPIL",
+            int(nik_source.loc[nik_source["SourceResult"] == "DUKCAPIL", "Total"].sum())
+        )
     
-    st.plotly_chart(fig_nik, use_container_width=True)
+        c3.metric(
+            "BCA",
+            int(nik_source.loc[nik_source["SourceResult"] == "BCA", "Total"].sum())
+        )
     
-    # Detail Table
-    st.markdown("**Detail Request**")
+        # Chart
+        fig_nik = px.bar(
+            nik_source,
+            x="SourceResult",
+            y="Total",
+            color="SourceResult",
+            text="Total",
+            title=f"Request Distribution for NIK {selected_nik}"
+        )
     
-    st.dataframe(
-        df_nik.sort_values("CreatedDate", ascending=False),
-        use_container_width=True
-    )
-else:
-    st.info("👆 Pilih NIK dari dropdown untuk melihat detail")
+        st.plotly_chart(fig_nik, use_container_width=True)
+    
+        # Detail Table
+        st.markdown("**Detail Request**")
+    
+        paged_table(df_nik, key="nik_detail", sort_by="CreatedDate", ascending=False)
+    else:
+        st.info("👆 Ketik NIK (atau awalannya) untuk melihat detail")
+
+
+with tab_nik:
+    if tab_nik.open:
+        perf.mark("DRILL DOWN", rows=n_total)
+        nik_drill_down()
 
 # ======================
 # RAW DATA
 # ======================
-with st.expander("Raw Data"):
-    st.dataframe(df_f, use_container_width=True)
+@st.fragment
+def raw_table():
+    # Backend DuckDB: satu halaman = satu query LIMIT/OFFSET, export lewat COPY di DuckDB
+    pages = n_pages(n_rows, RAW_PAGE_SIZE)
+    page = st.number_input("Halaman", min_value=1, max_value=pages, key="raw_db_page")
+    
+    page_df = log_db.rows(source_filter, date_range[0], date_range[-1], limit=RAW_PAGE_SIZE, offset=(page - 1) * RAW_PAGE_SIZE)
+    st.dataframe(page_df.drop(columns=MASK_COLS, errors="ignore"), use_container_width=True)
+    st.caption(f"{n_rows:,} baris · halaman {page:,} dari {pages:,}")
+    
+    d1, d2 = st.columns(2)
+    d1.download_button(
+        "⬇️ Download CSV",
+        data=lambda: log_db.export_file(source_filter, date_range[0], date_range[-1], "csv"),
+        file_name="raw.csv",
+        mime="text/csv",
+        on_click="ignore",
+        key="raw_db_csv"
+    )
+    d2.download_button(
+        "⬇️ Download Parquet",
+        data=lambda: log_db.export_file(source_filter, date_range[0], date_range[-1], "parquet"),
+        file_name="raw.parquet",
+        mime="application/vnd.apache.parquet",
+        on_click="ignore",
+        key="raw_db_parquet"
+    )
+
+
+with tab_raw:
+    if tab_raw.open:
+        perf.mark("RAW DATA", rows=n_rows)
+        if USE_DUCKDB:
+            raw_table()
+        else:
+            paged_table(df_f, key="raw", page_size=RAW_PAGE_SIZE)
+
+perf.finish()
+
+# ======================
+# SIDEBAR - PERFORMANCE
+# ======================
+with st.sidebar.expander("⏱️ Performance"):
+    perf_summary = perf.summary()
+    
+    st.dataframe(
+        perf_summary.style.format({
+            "Compute_ms": "{:,.1f}",
+            "Render_ms": "{:,.1f}",
+            "Rows": "{:,.0f}",
+            "Mem_Delta_MB": "{:+,.1f}"
+        }),
+        use_container_width=True,
+        hide_index=True
+    )
+    st.caption("ANALYTICS = lookup cache; section dihitung (compute) saat tab-nya pertama kali dibuka per filter")
+    
+    if st.checkbox(f"Catat ke {PERF_LOG}", key="perf_log"):
+        perf.write_jsonl(PERF_LOG)
@@ -0,0 +1,943 @@
+import numpy as np
+import pandas as pd
+
+from ingest import STATUS_MASK_COLS, status_cols, status_mask
+from profiling import section
+
+
+# ======================
+# HELPERS
+# ======================
+def _sort_by_nik_time(df):
+    # Lexsort multi-kolom stabil: urutan dalam satu NIK sama dengan sort per-NIK by CreatedDate
+    return df.sort_values(["Nik", "CreatedDate"], kind="stable")
+
+
+def _join_ordered(frame, key, col, sep):
+    """Join ``col`` per ``key`` in row order without a Python lambda per group.
+
+    Rows are spread into one column per position (via ``cumcount``) and the
+    positions are concatenated with vectorized string ops.
+    """
+    if frame.empty:
+        return pd.Series(dtype=object)
+
+    pos = frame.groupby(key, sort=False).cumcount()
+    wide = frame.assign(_pos=pos.to_numpy()).pivot(index=key, columns="_pos", values=col)
+
+    out = wide[0].astype(object)
+    for p in wide.columns[1:]:
+        nxt = wide[p]
+        out = out.where(nxt.isna(), out + sep + nxt.astype(object))
+    return out
+
+
+def _mask(df, status):
+    col = STATUS_MASK_COLS[status]
+    if col in df.columns:
+        return df[col].to_numpy(dtype=np.uint16)
+    return status_mask(df, status)
+
+
+def popcount(mask):
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(mask)
+    mask = mask.astype(np.uint16)
+    return _POPCOUNT8[mask & 0xFF] + _POPCOUNT8[mask >> 8]
+
+
+_POPCOUNT8 = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def _bit_counts(mask, n_bits):
+    """Set-bit count per bit position (= per field)."""
+    return np.array([np.count_nonzero(mask & np.uint16(1 << b)) for b in range(n_bits)], dtype=np.int64)
+
+
+def _source_codes(df):
+    codes, sources = pd.factorize(df["SourceResult"], sort=True)
+    return codes, np.asarray(sources, dtype=object)
+
+
+def _nik_order(df):
+    # Urutan NIK sesuai kemunculan pertama (sama seperti df["Nik"].unique())
+    niks = df["Nik"].dropna().unique()
+    return pd.Series(range(len(niks)), index=niks)
+
+
+# ======================
+# FILTER (log terurut by CreatedDate)
+# ======================
+def date_bounds(df, start, end):
+    """Row range ``[lo, hi)`` of a CreatedDate-sorted log covering dates ``start``..``end`` inclusive."""
+    ts = df["CreatedDate"].to_numpy()
+    lo_ts = pd.Timestamp(start).to_datetime64().astype(ts.dtype)
+    hi_ts = (pd.Timestamp(end) + pd.Timedelta(days=1)).to_datetime64().astype(ts.dtype)
+    return int(np.searchsorted(ts, lo_ts, side="left")), int(np.searchsorted(ts, hi_ts, side="left"))
+
+
+def filter_log(df, sources, start, end):
+    """Date range as a binary-search slice, SourceResult via categorical codes.
+
+    ``df`` must be sorted by CreatedDate (see ``ingest.sort_by_time``). When
+    every source is selected the result is a plain positional slice.
+    """
+    lo, hi = date_bounds(df, start, end)
+    df_f = df.iloc[lo:hi]
+
+    src = df_f["SourceResult"]
+    if not isinstance(src.dtype, pd.CategoricalDtype):
+        return df_f[src.isin(sources)]
+
+    # Lookup table per code (slot 0 = NaN / code -1)
+    wanted = src.cat.categories.get_indexer(list(sources))
+    keep = np.zeros(len(src.cat.categories) + 1, dtype=bool)
+    keep[wanted[wanted >= 0] + 1] = True
+
+    codes = src.cat.codes.to_numpy()
+    dropped = np.flatnonzero(~keep) - 1
+    if not any((codes == c).any() for c in dropped):
+        return df_f
+    return df_f[keep[codes.astype(np.intp) + 1]]
+
+
+# ======================
+# DATA QUALITY (popcount / bincount atas bitmask status)
+# ======================
+def quality_score(df, cols=status_cols):
+    """Share of "Sesuai" over all (row, field) cells."""
+    total = len(df) * len(cols)
+    return popcount(_mask(df, "Sesuai")).sum() / total if total > 0 else 0
+
+
+def source_quality_score(df, cols=status_cols):
+    """Quality_Score per SourceResult."""
+    codes, sources = _source_codes(df)
+    valid = codes >= 0
+    sesuai = np.bincount(codes[valid], weights=popcount(_mask(df, "Sesuai"))[valid], minlength=len(sources))
+    rows = np.bincount(codes[valid], minlength=len(sources))
+    return pd.DataFrame({"SourceResult": sources, "Quality_Score": sesuai / (rows * len(cols))})
+
+
+def field_status_counts(df, cols=status_cols):
+    """Long (Field, Status, Count) table per field; statuses outside the masks count as "Lainnya"."""
+    totals = np.zeros(len(cols), dtype=np.int64)
+    frames = []
+    for status in STATUS_MASK_COLS:
+        counts = _bit_counts(_mask(df, status), len(cols))
+        totals += counts
+        frames.append(pd.DataFrame({"Field": cols, "Status": status, "Count": counts}))
+    frames.append(pd.DataFrame({"Field": cols, "Status": "Lainnya", "Count": len(df) - totals}))
+
+    out = pd.concat(frames, ignore_index=True)
+    out = out[out["Count"] > 0]
+    return out.sort_values(["Field", "Status"], kind="stable").reset_index(drop=True)
+
+
+def field_accuracy(df, cols=status_cols):
+    """Percentage of "Sesuai" per field, lowest first."""
+    counts = _bit_counts(_mask(df, "Sesuai"), len(cols))
+    accuracy = counts / len(df) * 100 if len(df) else np.full(len(cols), np.nan)
+    out = pd.DataFrame({"Field": cols, "Accuracy": accuracy})
+    return out.sort_values("Accuracy", kind="stable")
+
+
+def source_field_accuracy(df, cols=status_cols):
+    """Share of "Sesuai" per (SourceResult, field) via one bincount per field."""
+    codes, sources = _source_codes(df)
+    valid = codes >= 0
+    mask = _mask(df, "Sesuai")[valid]
+    codes = codes[valid]
+    rows = np.bincount(codes, minlength=len(sources))
+
+    out = pd.DataFrame({"SourceResult": sources})
+    for bit, c in enumerate(cols):
+        hits = (mask & np.uint16(1 << bit)) > 0
+        out[c] = np.bincount(codes, weights=hits, minlength=len(sources)) / rows
+    return out
+
+
+# ======================
+# NIK PROFILE (satu agregasi per filter state)
+# ======================
+SOURCE_PREFIX = "SourceResult="
+
+
+def nik_profile(df, cols=status_cols):
+    """Per-NIK summary table built in a single sort + grouped aggregation.
+
+    Columns: Hit_Count, First_Seen, Last_Seen, Min_Interval_Sec, Sources
+    (distinct SourceResult), ``SourceResult=<src>`` hit counts,
+    Dominant_SourceApps / Dominant_App_Hits and ``<field>=<status>`` counts.
+    Index is the NIK, sorted ascending like ``groupby("Nik")``.
+    """
+    cols = [c for c in cols if c in df.columns]
+    d = _sort_by_nik_time(df[df["Nik"].notna()])
+
+    same_nik = d["Nik"].eq(d["Nik"].shift(1))
+    gap = d["CreatedDate"].diff().dt.total_seconds().where(same_nik)
+
+    profile = pd.DataFrame({
+        "Nik": d["Nik"],
+        "Hit_Count": 1,
+        "First_Seen": d["CreatedDate"],
+        "Last_Seen": d["CreatedDate"],
+        "Min_Interval_Sec": gap,
+    }).groupby("Nik", observed=True).agg(
+        {"Hit_Count": "sum", "First_Seen": "min", "Last_Seen": "max", "Min_Interval_Sec": "min"}
+    )
+
+    # d terurut by Nik: nomor grup = urutan NIK di profile
+    group = (~same_nik).to_numpy().cumsum() - 1
+    counts = pd.concat(
+        [_group_value_counts(group, len(profile), d[c], c) for c in ["SourceResult"] + cols], axis=1
+    )
+    counts.index = profile.index
+    profile = pd.concat([profile, counts], axis=1)
+
+    source_cols = [c for c in counts.columns if c.startswith(SOURCE_PREFIX)]
+    profile.insert(4, "Sources", (profile[source_cols] > 0).sum(axis=1))
+
+    dominant = dominant_apps(nik_app_hits(d))
+    pos = 5 + len(source_cols)
+    profile.insert(pos, "Dominant_SourceApps", dominant["Dominant_SourceApps"])
+    profile.insert(pos + 1, "Dominant_App_Hits", dominant["Dominant_App_Hits"].fillna(0).astype(int))
+
+    return profile
+
+
+def _group_value_counts(group, n_groups, values, name):
+    """``<name>=<value>`` count columns per group (like ``get_dummies`` + sum), one bincount per column.
+
+    The temporary is ``n_groups × n_values``, not one dummy column per row
+    and value.
+    """
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        codes, uniques = values.cat.codes.to_numpy(), values.cat.categories
+    else:
+        codes, uniques = pd.factorize(values, sort=True)
+    k = len(uniques)
+    valid = codes >= 0
+    counts = np.bincount(group[valid] * k + codes[valid], minlength=n_groups * k)
+    return pd.DataFrame(
+        counts.reshape(n_groups, k).astype(np.int32), columns=[f"{name}={u}" for u in uniques]
+    )
+
+
+def nik_app_hits(df):
+    """Requests per (Nik, SourceApps) as a long table with a ``Hits`` column."""
+    return df[df["Nik"].notna()].groupby(["Nik", "SourceApps"], observed=True).size().reset_index(name="Hits")
+
+
+def dominant_apps(app_hits):
+    """Most used SourceApps per NIK (ties → first app) from ``nik_app_hits`` counts."""
+    return (
+        app_hits
+        .sort_values(["Nik", "Hits", "SourceApps"], ascending=[True, False, True], kind="stable")
+        .drop_duplicates("Nik")
+        .set_index("Nik")
+        .rename(columns={"SourceApps": "Dominant_SourceApps", "Hits": "Dominant_App_Hits"})
+    )
+
+
+def _field_order(field):
+    return status_cols.index(field) if field in status_cols else len(status_cols)
+
+
+def merge_nik_profiles(old, new, app_hits):
+    """``nik_profile`` of old + new rows, from the two profiles instead of the rows.
+
+    Valid when every NIK's new rows come after its old ones (appended log):
+    the gap between old Last_Seen and new First_Seen is the only interval
+    the separate profiles miss. ``app_hits`` are the combined
+    ``nik_app_hits`` counts, for the dominant SourceApps.
+    """
+    both = old.index.intersection(new.index)
+    # Kolom hitungan "<kolom>=<nilai>" dalam urutan nik_profile: SourceResult dulu, lalu status_cols (nilai urut)
+    count_cols = sorted(
+        {c for c in old.columns.union(new.columns) if "=" in c},
+        key=lambda c: (not c.startswith(SOURCE_PREFIX), _field_order(c.split("=", 1)[0]), c)
+    )
+
+    merged = pd.DataFrame(index=old.index.union(new.index))
+    merged["Hit_Count"] = old["Hit_Count"].add(new["Hit_Count"], fill_value=0).astype("int64")
+    merged["First_Seen"] = pd.concat([old["First_Seen"], new["First_Seen"]], axis=1).min(axis=1)
+    merged["Last_Seen"] = pd.concat([old["Last_Seen"], new["Last_Seen"]], axis=1).max(axis=1)
+    gap = (new.loc[both, "First_Seen"] - old.loc[both, "Last_Seen"]).dt.total_seconds()
+    merged["Min_Interval_Sec"] = pd.concat([old["Min_Interval_Sec"], new["Min_Interval_Sec"], gap], axis=1).min(axis=1)
+
+    counts = old.reindex(columns=count_cols, fill_value=0).add(new.reindex(columns=count_cols, fill_value=0), fill_value=0)
+    counts = counts.astype("int32")
+    source_cols = [c for c in count_cols if c.startswith(SOURCE_PREFIX)]
+    merged["Sources"] = (counts[source_cols] > 0).sum(axis=1)
+    merged = pd.concat([merged, counts[source_cols]], axis=1)
+
+    dominant = dominant_apps(app_hits)
+    merged["Dominant_SourceApps"] = dominant["Dominant_SourceApps"]
+    merged["Dominant_App_Hits"] = dominant["Dominant_App_Hits"].reindex(merged.index).fillna(0).astype(int)
+
+    merged = pd.concat([merged, counts.drop(columns=source_cols)], axis=1)
+    return merged.rename_axis(new.index.name)
+
+
+def profile_sources(profile):
+    """SourceResult values that have a hit-count column in ``profile``."""
+    return [c[len(SOURCE_PREFIX):] for c in profile.columns if c.startswith(SOURCE_PREFIX)]
+
+
+def source_hit_types(profile):
+    """NIK count per (SourceResult, "Hit 1x"/"Hit >1x") from the per-source hit counts."""
+    frames = []
+    for src in profile_sources(profile):
+        hits = profile[SOURCE_PREFIX + src]
+        hits = hits[hits > 0]
+        frames.append(pd.DataFrame({
+            "SourceResult": src,
+            "hit_type": ["Hit 1x", "Hit >1x"],
+            "nik_count": [int((hits == 1).sum()), int((hits > 1).sum())],
+        }))
+    if not frames:
+        return pd.DataFrame({
+            "SourceResult": pd.Series(dtype=object),
+            "hit_type": pd.Series(dtype=object),
+            "nik_count": pd.Series(dtype="int64"),
+        })
+    out = pd.concat(frames, ignore_index=True)
+    return out[out["nik_count"] > 0].reset_index(drop=True)
+
+
+def source_counts(profile):
+    """Total_Requests and Unique_NIK per SourceResult."""
+    srcs = profile_sources(profile)
+    hits = profile[[SOURCE_PREFIX + s for s in srcs]]
+    out = pd.DataFrame({
+        "SourceResult": pd.Series(srcs, dtype=object),
+        "Total_Requests": hits.sum().to_numpy(dtype="int64"),
+        "Unique_NIK": (hits > 0).sum().to_numpy(dtype="int64"),
+    })
+    # Kategori SourceResult yang tidak ada di filter ikut jadi kolom (isi 0)
+    return out[out["Total_Requests"] > 0].reset_index(drop=True)
+
+
+def repeat_niks(profile, df):
+    """Hit_Count per NIK, descending; ties keep first-appearance order like ``value_counts``."""
+    order = _nik_order(df).reindex(profile.index)
+    out = pd.DataFrame({"Nik": profile.index, "Total Request": profile["Hit_Count"].to_numpy(), "_o": order.to_numpy()})
+    return out.sort_values(["Total Request", "_o"], ascending=[False, True], kind="stable").drop(columns="_o").reset_index(drop=True)
+
+
+# ======================
+# SAME SOURCEAPPS & RAPID FIRE
+# ======================
+def same_app_hits(df, profile=None, min_hits=3):
+    """(SourceApps, Nik) pairs with more than ``min_hits`` hits, highest first."""
+    if profile is not None:
+        # NIK yang app dominannya saja tidak lewat threshold tidak mungkin lolos
+        df = df[df["Nik"].isin(profile.index[profile["Dominant_App_Hits"] > min_hits])]
+    same_app = df.groupby(["SourceApps", "Nik"], observed=True).size().reset_index(name="Hit_Count")
+    return same_app[same_app["Hit_Count"] > min_hits].sort_values("Hit_Count", ascending=False)
+
+
+# Rapid fire: request berikutnya dari NIK yang sama dalam < sekian detik
+RAPID_FIRE_SEC = 5
+
+
+def rapid_fire(df, profile=None, max_interval_sec=RAPID_FIRE_SEC):
+    """Requests that follow the previous request of the same NIK within ``max_interval_sec``."""
+    if profile is not None:
+        df = df[df["Nik"].isin(profile.index[profile["Min_Interval_Sec"] < max_interval_sec])]
+    df_sorted = df.sort_values(["Nik", "CreatedDate"])
+    df_sorted["Time_Diff"] = df_sorted.groupby("Nik", observed=True)["CreatedDate"].diff().dt.total_seconds()
+    return df_sorted[df_sorted["Time_Diff"] < max_interval_sec].copy()
+
+
+# Pilihan key burst detector → kolom log
+BURST_KEYS = {
+    "NIK": ["Nik"],
+    "SourceApps": ["SourceApps"],
+    "SourceApps + NIK": ["SourceApps", "Nik"],
+}
+
+
+def burst_windows(df, by=("Nik",), min_requests=5, window_sec=60):
+    """Requests inside a sliding window of ``window_sec`` seconds holding at least ``min_requests`` requests of the same ``by`` key.
+
+    Rows are ordered by (key, CreatedDate) with a stable sort of the
+    integer key over the time-sorted log, and every window start is one
+    ``searchsorted`` over a (key, time) array that increases monotonically,
+    so there is no per-key loop. A window is ``(t - window_sec, t]``;
+    ``Window_Count`` is the number of requests in the window ending at the row.
+    """
+    by = list(by)
+    valid = df["CreatedDate"].notna().to_numpy()
+    for col in by:
+        valid = valid & df[col].notna().to_numpy()
+    df = df[valid] if not valid.all() else df
+    if not df["CreatedDate"].is_monotonic_increasing:
+        df = df.iloc[np.argsort(df["CreatedDate"].to_numpy(), kind="stable")]
+
+    key = np.zeros(len(df), dtype=np.int64)
+    for col in by:
+        codes, uniques = pd.factorize(df[col])
+        key = key * len(uniques) + codes
+    order = np.argsort(key, kind="stable")  # urutan waktu dalam satu key tetap
+    key = key[order]
+
+    # Waktu (ms) + offset per key yang lebih besar dari rentang waktu: satu array naik untuk semua key
+    ms = df["CreatedDate"].to_numpy().astype("datetime64[ms]").astype(np.int64)[order]
+    window_ms = int(window_sec * 1000)
+    if len(ms):
+        ms -= ms.min()
+    group = np.r_[0, np.cumsum(key[1:] != key[:-1])] if len(key) else key
+    t = ms + group * (int(ms.max(initial=0)) + window_ms + 1)
+
+    lo = np.searchsorted(t, t - window_ms, side="right")
+    hi = np.searchsorted(t, t, side="right")
+    count = hi - lo
+    hot = np.flatnonzero(count >= min_requests)
+
+    # Baris anggota burst = gabungan range [lo, hi) dari window yang lolos threshold
+    cover = np.zeros(len(t) + 1, dtype=np.int64)
+    np.add.at(cover, lo[hot], 1)
+    np.add.at(cover, hi[hot], -1)
+    member = np.flatnonzero(np.cumsum(cover[:-1]) > 0)
+
+    out = df.iloc[order[member]].copy()
+    out["Window_Count"] = count[member]
+    return out
+
+
+def burst_summary(df_burst, by=("Nik",)):
+    """Per key: requests inside bursts, the largest window, first/last burst request."""
+    by = list(by)
+    agg = {
+        "Burst_Requests": ("Window_Count", "size"),
+        "Max_In_Window": ("Window_Count", "max"),
+        "First_Seen": ("CreatedDate", "min"),
+        "Last_Seen": ("CreatedDate", "max"),
+    }
+    if "Nik" not in by:
+        agg["Unique_NIK"] = ("Nik", "nunique")
+    if "SourceApps" not in by:
+        agg["SourceApps"] = ("SourceApps", "first")
+    summary = df_burst.groupby(by, observed=True).agg(**agg).reset_index()
+    return summary.sort_values(["Burst_Requests", "Max_In_Window"], ascending=False, kind="stable").reset_index(drop=True)
+
+
+# ======================
+# STATUS INCONSISTENCY
+# ======================
+def _profile_field_statuses(profile, cols):
+    """Distinct statuses and "has a '-'" per (NIK, field) from the ``<field>=<status>`` counts of ``nik_profile``."""
+    n_unique = {}
+    has_dash = {}
+    for c in cols:
+        counts = profile[[k for k in profile.columns if k.startswith(f"{c}=")]]
+        n_unique[c] = (counts > 0).sum(axis=1)
+        has_dash[c] = profile[f"{c}=-"] > 0 if f"{c}=-" in profile.columns else pd.Series(False, index=profile.index)
+    return pd.DataFrame(n_unique), pd.DataFrame(has_dash)
+
+
+INCONSISTENCY_COLUMNS = [
+    "NIK", "Field", "Status_Sequence", "Unique_Statuses", "Total_Hits",
+    "First_Date", "Last_Date", "Sources_Used", "SourceApps"
+]
+
+
+def status_inconsistency(df, cols=status_cols, max_sequence=5, profile=None):
+    """NIK/field pairs whose status changes across requests.
+
+    A pair is flagged when the NIK has more than one distinct status for the
+    field and none of them is "-". Rows come out in NIK first-appearance
+    order, then field order, matching the original per-NIK loop. With a
+    ``profile`` the flags come from its ``<field>=<status>`` counts and
+    only the rows of flagged NIKs are read.
+    """
+    cols = [c for c in cols if c in df.columns]
+    if not cols:
+        return pd.DataFrame(columns=INCONSISTENCY_COLUMNS)
+    if profile is not None:
+        n_unique, has_dash = _profile_field_statuses(profile, cols)
+    else:
+        d = _sort_by_nik_time(df[df["Nik"].notna()])
+        n_unique = d.groupby("Nik", sort=False)[cols].nunique()
+        has_dash = (d[cols] == "-").groupby(d["Nik"], sort=False).any()
+
+    flagged = (n_unique > 1) & ~has_dash
+    pairs = flagged.stack()
+    pairs = pairs[pairs].index.to_frame(index=False)
+    pairs.columns = ["NIK", "Field"]
+    if pairs.empty:
+        return pd.DataFrame(columns=INCONSISTENCY_COLUMNS)
+
+    # Baris log hanya dibaca untuk NIK yang ter-flag
+    flagged_niks = pairs["NIK"].unique()
+    d = _sort_by_nik_time(df[df["Nik"].isin(flagged_niks)])
+    g = d.groupby("Nik", sort=False)
+
+    first = d.drop_duplicates("Nik", keep="first").set_index("Nik")
+    last = d.drop_duplicates("Nik", keep="last").set_index("Nik")
+
+    per_nik = pd.DataFrame({
+        "Total_Hits": g.size(),
+        "First_Date": first["CreatedDate"],
+        "Last_Date": last["CreatedDate"],
+        "SourceApps": first["SourceApps"],
+    })
+
+    sources = d[["Nik", "SourceResult"]].dropna().drop_duplicates()
+    per_nik["Sources_Used"] = _join_ordered(sources, "Nik", "SourceResult", ", ")
+
+    head = d[g.cumcount() < max_sequence]
+    sequences = pd.DataFrame({
+        c: _join_ordered(head, "Nik", c, " → ") for c in cols
+    })
+
+    pairs["Status_Sequence"] = sequences.stack().reindex(
+        pd.MultiIndex.from_frame(pairs[["NIK", "Field"]])
+    ).to_numpy()
+    pairs["Unique_Statuses"] = n_unique.stack().reindex(
+        pd.MultiIndex.from_frame(pairs[["NIK", "Field"]])
+    ).to_numpy()
+
+    out = pairs.join(per_nik, on="NIK")
+
+    field_rank = {c: i for i, c in enumerate(cols)}
+    order = (
+        out["NIK"].map(_nik_order(df)).to_numpy() * len(cols)
+        + out["Field"].map(field_rank).to_numpy()
+    )
+    out = out.iloc[order.argsort(kind="stable")]
+
+    return out[INCONSISTENCY_COLUMNS].reset_index(drop=True)
+
+
+# ======================
+# STATUS TRANSITIONS (Sesuai → Tidak Sesuai, dst.)
+# ======================
+def _consecutive_pairs(df, cols):
+    """Sorted frame plus previous-row statuses within the same NIK."""
+    d = _sort_by_nik_time(df[df["Nik"].notna()])
+    same_nik = d["Nik"].eq(d["Nik"].shift(1)).to_numpy()
+    prev = d[cols].shift(1)
+    return d, prev, same_nik
+
+
+def status_flips(df, cols=status_cols, from_status="Sesuai", to_status="Tidak Sesuai"):
+    """First ``from_status`` → ``to_status`` flip per (NIK, Field), with its timestamp."""
+    cols = [c for c in cols if c in df.columns]
+    d, prev, same_nik = _consecutive_pairs(df, cols)
+
+    hit = (prev == from_status) & (d[cols] == to_status)
+    hit = hit[same_nik]
+    hits = hit.stack()
+    hits = hits[hits].index.to_frame(index=False)
+    hits.columns = ["_row", "Field"]
+    if hits.empty:
+        return pd.DataFrame(columns=["NIK", "Field", "When"])
+
+    hits["NIK"] = d.loc[hits["_row"], "Nik"].to_numpy()
+    hits["When"] = d.loc[hits["_row"], "CreatedDate"].to_numpy()
+    # stack() menjaga urutan waktu dalam NIK, jadi baris pertama per (NIK, Field) = flip pertama
+    hits = hits.drop_duplicates(["NIK", "Field"])
+
+    field_rank = {c: i for i, c in enumerate(cols)}
+    order = (
+        hits["NIK"].map(_nik_order(df)).to_numpy() * len(cols)
+        + hits["Field"].map(field_rank).to_numpy()
+    )
+    hits = hits.iloc[order.argsort(kind="stable")]
+
+    return hits[["NIK", "Field", "When"]].reset_index(drop=True)
+
+
+def status_transition_matrix(df, cols=status_cols):
+    """Counts of consecutive status transitions per field (From → To), same-NIK pairs only."""
+    cols = [c for c in cols if c in df.columns]
+    d, prev, same_nik = _consecutive_pairs(df, cols)
+
+    frames = []
+    for c in cols:
+        counts = (
+            pd.DataFrame({"From": prev[c][same_nik].astype(object), "To": d[c][same_nik].astype(object)})
+            .groupby(["From", "To"], observed=True)
+            .size()
+            .reset_index(name="Count")
+        )
+        counts.insert(0, "Field", c)
+        frames.append(counts)
+
+    if not frames:
+        return pd.DataFrame(columns=["Field", "From", "To", "Count"])
+    return pd.concat(frames, ignore_index=True)
+
+
+# ======================
+# CROSS-SOURCE INCONSISTENCY
+# ======================
+CROSS_COLUMNS = ["NIK", "Field", "Sources", "Values", "Hit_Count"]
+
+
+def source_modes(df, col):
+    """Modal ``col`` status per (Nik, SourceResult); ties go to the smallest value like ``Series.mode()[0]``."""
+    counts = (
+        df.groupby(["Nik", "SourceResult", col], observed=True)
+        .size()
+        .reset_index(name="_n")
+    )
+    counts = counts.sort_values(
+        ["Nik", "SourceResult", "_n", col],
+        ascending=[True, True, False, True],
+        kind="stable"
+    )
+    return counts.drop_duplicates(["Nik", "SourceResult"])[["Nik", "SourceResult", col]]
+
+
+def cross_source_inconsistency(df, cols=status_cols, profile=None):
+    """NIK/field pairs where the modal status differs between SourceResult values.
+
+    With a ``profile`` each field only scans NIKs seen with more than one
+    status for it (from the profile's ``<field>=<status>`` counts).
+    """
+    cols = [c for c in cols if c in df.columns]
+    d = df[df["Nik"].notna()]
+
+    if profile is None:
+        profile = pd.DataFrame({
+            "Hit_Count": d.groupby("Nik", observed=True).size(),
+            "Sources": d.groupby("Nik", observed=True)["SourceResult"].nunique(),
+        })
+    hit_count = profile["Hit_Count"]
+    multi = profile.index[profile["Sources"] > 1]
+
+    d = d[d["Nik"].isin(multi) & d["SourceResult"].notna()]
+    if d.empty or not cols:
+        return pd.DataFrame(columns=CROSS_COLUMNS)
+
+    if profile is not None and any(k.startswith(f"{c}=") for c in cols for k in profile.columns):
+        # NIK dengan satu status saja untuk field ini tidak mungkin beda antar source
+        n_unique = _profile_field_statuses(profile, cols)[0]
+    else:
+        n_unique = None
+
+    frames = []
+    for c in cols:
+        d_c = d if n_unique is None else d[d["Nik"].isin(n_unique.index[n_unique[c] > 1])]
+        modes = source_modes(d_c, c)
+        disagree = modes.groupby("Nik", observed=True)[c].nunique()
+        modes = modes[modes["Nik"].isin(disagree.index[disagree > 1])]
+        if modes.empty:
+            continue
+
+        frames.append(pd.DataFrame({
+            "Field": c,
+            "Sources": _join_ordered(modes, "Nik", "SourceResult", ", "),
+            "Values": _join_ordered(modes.astype({c: object}), "Nik", c, ", "),
+        }))
+
+    if not frames:
+        return pd.DataFrame(columns=CROSS_COLUMNS)
+
+    out = pd.concat(frames).rename_axis("NIK").reset_index()
+    out["Hit_Count"] = out["NIK"].map(hit_count).to_numpy()
+
+    field_rank = {c: i for i, c in enumerate(cols)}
+    order = (
+        out["NIK"].map(_nik_order(df)).to_numpy() * len(cols)
+        + out["Field"].map(field_rank).to_numpy()
+    )
+    out = out.iloc[order.argsort(kind="stable")]
+
+    return out[CROSS_COLUMNS].reset_index(drop=True)
+
+
+# ======================
+# KPI, SOURCE PERFORMANCE, TREND, PEAK TIME
+# ======================
+def kpi_summary(df, profile):
+    nik_counts = profile["Hit_Count"]
+    return kpi_from_counts(
+        total_requests=len(df),
+        total_nik=int(nik_counts.shape[0]),
+        nik_hit_1=int((nik_counts == 1).sum()),
+        nik_hit_gt1=int((nik_counts > 1).sum()),
+        high_risk_nik=int((nik_counts > 5).sum()),
+        data_quality=quality_score(df),
+    )
+
+
+def kpi_from_counts(total_requests, total_nik, nik_hit_1, nik_hit_gt1, high_risk_nik, data_quality):
+    """KPI dict from already aggregated counts (shared by the pandas and DuckDB paths)."""
+    duplicate_requests = total_requests - total_nik
+
+    return {
+        "total_nik": total_nik,
+        "nik_hit_1": nik_hit_1,
+        "nik_hit_gt1": nik_hit_gt1,
+        "pct_hit_1": nik_hit_1 / total_nik if total_nik else 0,
+        "pct_hit_gt1": nik_hit_gt1 / total_nik if total_nik else 0,
+        "total_requests": total_requests,
+        "duplicate_requests": duplicate_requests,
+        "duplicate_rate": duplicate_requests / total_requests if total_requests > 0 else 0,
+        "high_risk_nik": high_risk_nik,
+        "risk_rate": high_risk_nik / total_nik if total_nik > 0 else 0,
+        "data_quality": data_quality,
+    }
+
+
+def source_performance(df, profile):
+    """Total_Requests, Unique_NIK, Quality_Score, Cost_Efficiency and Duplicate_Rate per SourceResult."""
+    source_perf = source_counts(profile).merge(source_quality_score(df), on="SourceResult")
+    source_perf["Cost_Efficiency"] = source_perf["Unique_NIK"] / source_perf["Total_Requests"]
+    source_perf["Duplicate_Rate"] = 1 - source_perf["Cost_Efficiency"]
+    return source_perf
+
+
+def top_repeat(profile, n=10):
+    top = profile["Hit_Count"].nlargest(n).reset_index()
+    top.columns = ["NIK", "Hit_Count"]
+    return top
+
+
+def daily_trend(df):
+    """Per day: Total rows, Total_Requests (non-null Nik) and Unique_NIK."""
+    day = df["CreatedDate"].dt.normalize()
+    daily = df.groupby(day).agg(
+        Total=("CreatedDate", "size"),
+        Total_Requests=("Nik", "count"),
+        Unique_NIK=("Nik", "nunique"),
+    )
+    return daily.rename_axis("Date").reset_index()
+
+
+def hourly_traffic(df):
+    """Requests per Hour with a >2σ anomaly flag."""
+    return flag_hourly_anomalies(df.groupby("Hour").size().reset_index(name="Total_Request"))
+
+
+def flag_hourly_anomalies(hourly):
+    """Add Anomaly (> mean + 2σ) and Status columns to an (Hour, Total_Request) table."""
+    mean_hourly = hourly["Total_Request"].mean()
+    std_hourly = hourly["Total_Request"].std()
+    hourly["Anomaly"] = hourly["Total_Request"] > (mean_hourly + 2*std_hourly)
+    hourly["Status"] = np.where(hourly["Anomaly"], "Anomaly", "Normal")
+    return hourly
+
+
+def peak_hour(hourly):
+    return hourly.loc[hourly["Total_Request"].idxmax()]
+
+
+DAY_ORDER = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+
+def weekday_traffic(df):
+    """Requests per day of week (Weekday 0 = Monday), Monday first."""
+    return weekday_table(df.groupby("Weekday").size())
+
+
+def weekday_table(counts):
+    """(Day, Total_Request) from request counts indexed by Weekday (0 = Monday)."""
+    return (
+        counts
+        .reindex(range(7))
+        .set_axis(pd.Index(DAY_ORDER, name="Day"))
+        .reset_index(name="Total_Request")
+    )
+
+
+# ======================
+# FRAUD SUMMARIES
+# ======================
+def app_summary(same_app_suspicious):
+    summary = same_app_suspicious.groupby("SourceApps", observed=True).agg({
+        "Nik": "count",
+        "Hit_Count": "sum"
+    }).reset_index()
+    summary.columns = ["SourceApps", "Unique_NIK", "Total_Hits"]
+    return summary.sort_values("Total_Hits", ascending=False)
+
+
+def inconsistency_summary(df_inconsist):
+    summary = df_inconsist.groupby("Field").agg({
+        "NIK": "count",
+        "Total_Hits": "sum"
+    }).reset_index()
+    summary.columns = ["Field", "Affected_NIK", "Total_Inconsistent_Hits"]
+    return summary.sort_values("Affected_NIK", ascending=False)
+
+
+def changed_transitions(matrix, cols=status_cols):
+    """Field × "From → To" count table, status changes only."""
+    changed = matrix[matrix["From"] != matrix["To"]]
+    if changed.empty:
+        return pd.DataFrame()
+    changed = changed.assign(Transition=changed["From"] + " → " + changed["To"])
+    return (
+        changed.pivot(index="Field", columns="Transition", values="Count")
+        .reindex([c for c in cols if c in changed["Field"].values])
+        .fillna(0)
+        .astype(int)
+    )
+
+
+def rapid_fire_summary(df_rapid):
+    summary = df_rapid.groupby("Nik").agg({
+        "Id": "count",
+        "Time_Diff": "mean",
+        "SourceApps": lambda x: x.iloc[0]
+    }).reset_index()
+    summary.columns = ["NIK", "Rapid_Hits", "Avg_Interval_Sec", "SourceApps"]
+    return summary.sort_values("Rapid_Hits", ascending=False)
+
+
+def cross_summary(df_cross):
+    summary = df_cross.groupby("Field").size().reset_index(name="Inconsistency_Count")
+    return summary.sort_values("Inconsistency_Count", ascending=False)
+
+
+# ======================
+# NIK DRILL DOWN
+# ======================
+def nik_rows(df, nik):
+    """All requests of one NIK (``nik`` as shown in the drill-down, i.e. a string)."""
+    return df[df["Nik"].astype(str) == str(nik)]
+
+
+def nik_source_counts(df_nik):
+    nik_source = df_nik["SourceResult"].value_counts().reset_index()
+    nik_source.columns = ["SourceResult", "Total"]
+    return nik_source[nik_source["Total"] > 0]  # SourceResult kategori: buang yang 0
+
+
+# ======================
+# BUNDLE (semua hasil untuk satu filter state)
+# ======================
+# Section dashboard → fungsi(df, profile) yang mengembalikan hasil section tsb
+def _kpi_section(df, profile):
+    return {"kpi": kpi_summary(df, profile)}
+
+
+def _source_performance_section(df, profile):
+    return {
+        "src_nik_stack": source_hit_types(profile),
+        "source_perf": source_performance(df, profile),
+        "source_quality": source_field_accuracy(df),
+    }
+
+
+def _status_recap_section(df, profile):
+    return {"rekap_long": field_status_counts(df), "field_df": field_accuracy(df)}
+
+
+def _repeat_nik_section(df, profile):
+    return {"repeat_table": repeat_niks(profile, df), "top_repeat": top_repeat(profile)}
+
+
+def _trend_section(df, profile):
+    return {"daily": daily_trend(df)}
+
+
+def _peak_time_section(df, profile):
+    hourly = hourly_traffic(df)
+    return {
+        "hourly": hourly,
+        "peak_hour": peak_hour(hourly) if len(hourly) else None,
+        "weekday": weekday_traffic(df),
+    }
+
+
+def _same_app_section(df, profile):
+    same_app_suspicious = same_app_hits(df, profile, min_hits=3)
+    return {"same_app_suspicious": same_app_suspicious, "app_summary": app_summary(same_app_suspicious)}
+
+
+def _status_inconsistency_section(df, profile):
+    df_inconsist = status_inconsistency(df, profile=profile)
+    return {
+        "df_inconsist": df_inconsist,
+        "inconsist_summary": inconsistency_summary(df_inconsist),
+        "sesuai_to_tidak": status_flips(df),
+        "transitions": changed_transitions(status_transition_matrix(df)),
+    }
+
+
+def _rapid_fire_section(df, profile):
+    df_rapid = rapid_fire(df, profile, max_interval_sec=RAPID_FIRE_SEC)
+    return {"df_rapid": df_rapid, "rapid_summary": rapid_fire_summary(df_rapid)}
+
+
+def _cross_source_section(df, profile):
+    df_cross = cross_source_inconsistency(df, profile=profile)
+    return {"df_cross": df_cross, "cross_summary": cross_summary(df_cross)}
+
+
+ANALYTICS_SECTIONS = {
+    "KPI": _kpi_section,
+    "SOURCE PERFORMANCE": _source_performance_section,
+    "STATUS RECAP": _status_recap_section,
+    "REPEAT NIK": _repeat_nik_section,
+    "TREND": _trend_section,
+    "PEAK TIME": _peak_time_section,
+    "FRAUD SAME APP": _same_app_section,
+    "FRAUD STATUS INCONSISTENCY": _status_inconsistency_section,
+    "FRAUD RAPID FIRE": _rapid_fire_section,
+    "FRAUD CROSS SOURCE": _cross_source_section,
+}
+
+# Section yang tidak butuh nik_profile (cukup dari kolom log / bitmask)
+PROFILE_FREE_SECTIONS = {"STATUS RECAP", "TREND", "PEAK TIME"}
+
+
+def compute_sections(df, names, results, profiler=None):
+    """Add the outputs of the dashboard sections ``names`` to ``results`` (in place) and return it.
+
+    Sections already listed in ``results["sections"]`` are skipped, so the
+    dict can be filled lazily as the dashboard opens more sections. The
+    per-NIK profile most sections share is built once and kept under
+    ``results["profile"]`` until every section that needs it is done.
+    ``results`` must be private to the caller; a bundle shared through the
+    result cache is copied first and published with ``merge_results``.
+    """
+    done = results.setdefault("sections", [])
+    rows = len(df)
+    for name in names:
+        if name in done:
+            continue
+        if name not in PROFILE_FREE_SECTIONS and results.get("profile") is None:
+            with section(profiler, "PROFILE", rows):
+                results["profile"] = nik_profile(df)
+        with section(profiler, name, rows):
+            results.update(ANALYTICS_SECTIONS[name](df, results.get("profile")))
+        done.append(name)
+    if set(ANALYTICS_SECTIONS) - PROFILE_FREE_SECTIONS <= set(done):
+        # Profile (satu baris per NIK) tidak dipakai lagi: jangan ikut tersimpan di result cache
+        results.pop("profile", None)
+    return results
+
+
+def merge_results(shared, local):
+    """New bundle with the entries of ``shared`` and ``local``; neither dict is modified.
+
+    ``shared`` is the bundle in the result cache (read by other sessions),
+    ``local`` a private copy the current session filled with
+    ``compute_sections``. The profile is dropped once every section that
+    needs it is in the merged bundle.
+    """
+    shared = shared or {}
+    merged = {**shared, **local}
+    merged["sections"] = list(dict.fromkeys([*shared.get("sections", []), *local.get("sections", [])]))
+    if set(ANALYTICS_SECTIONS) - PROFILE_FREE_SECTIONS <= set(merged["sections"]):
+        merged.pop("profile", None)
+    return merged
+
+
+def compute_analytics(df, profiler=None):
+    """Every table/KPI the dashboard renders for an already filtered log, as a dict.
+
+    With a ``profiling.Profiler`` each step is recorded under the dashboard
+    section it feeds.
+    """
+    results = compute_sections(df, ANALYTICS_SECTIONS, {}, profiler)
+    results.pop("profile", None)
+    return results
@@ -0,0 +1,318 @@
+"""Scaling benchmark for the analytics sections on synthetic logs.
+
+    python benchmark.py                       # 10k, 100k, 1M, 10M rows
+    python benchmark.py --sizes 10k,100k --json bench.jsonl
+    python benchmark.py --sizes 1M --no-memory
+    python benchmark.py --sizes 100k,1M --hll-error 0.02   # + akurasi Unique NIK mode HLL
+    python benchmark.py --sizes 1M --no-memory --workers 8  # + speedup section paralel (process pool)
+
+Each section is timed on its own. Peak memory comes from a second run of the
+section under ``tracemalloc`` (tracing slows the code down, so it is never
+mixed with the timing run).
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import timedelta
+
+import numpy as np
+
+from analytics import (
+    burst_summary, burst_windows, compute_sections, cross_source_inconsistency, daily_trend, field_accuracy, field_status_counts, filter_log,
+    hourly_traffic, kpi_summary, nik_profile, nik_source_counts, rapid_fire,
+    rapid_fire_summary, same_app_hits, source_field_accuracy, source_hit_types, source_performance,
+    status_flips, status_inconsistency, status_transition_matrix, weekday_traffic
+)
+from cache_sim import Replay, default_policies
+from ingest import clean_log, encode_log, sort_by_time, write_shared
+from nik_index import NikIndex
+from profiling import Profiler, peak_rss_bytes
+from parallel import PARALLEL_SECTIONS, SectionPool
+from rollup import Rollup
+from synthetic import generate_log
+
+DEFAULT_SIZES = "10k,100k,1M,10M"
+
+
+def parse_size(text):
+    text = text.strip().lower()
+    factor = {"k": 1_000, "m": 1_000_000}.get(text[-1], 1)
+    return int(float(text.rstrip("km")) * factor)
+
+
+# ======================
+# SECTIONS
+# ======================
+# (nama, fungsi(ctx)) — ctx berisi df, df_f, profile, dst. Section boleh menambah isi ctx.
+def _ingest(ctx):
+    df, _ = encode_log(clean_log(ctx["raw"]))
+    ctx["df"] = sort_by_time(df)
+
+
+def _filter(ctx):
+    df = ctx["df"]
+    start, end = df["CreatedDate"].min().date(), df["CreatedDate"].max().date()
+    ctx["view"] = (["BCA", "DB_CACHE", "DUKCAPIL"], start, end)
+    ctx["df_f"] = filter_log(df, *ctx["view"])
+
+
+def _kpi(ctx):
+    ctx["profile"] = nik_profile(ctx["df_f"])
+    kpi_summary(ctx["df_f"], ctx["profile"])
+
+
+def _source_performance(ctx):
+    source_hit_types(ctx["profile"])
+    source_performance(ctx["df_f"], ctx["profile"])
+
+
+def _status_recap(ctx):
+    field_status_counts(ctx["df_f"])
+    field_accuracy(ctx["df_f"])
+    source_field_accuracy(ctx["df_f"])
+
+
+def _trend(ctx):
+    daily_trend(ctx["df_f"])
+    hourly_traffic(ctx["df_f"])
+    weekday_traffic(ctx["df_f"])
+
+
+def _rollup(ctx):
+    ctx["cube"] = Rollup(ctx["df"])
+
+
+def _trend_rollup(ctx):
+    # Trend + peak time dari cube: biaya ikut jumlah bucket, bukan jumlah baris
+    ctx["cube"].compute_sections(["TREND", "PEAK TIME"], {}, *ctx["view"])
+
+
+def _same_app(ctx):
+    same_app_hits(ctx["df_f"], ctx["profile"], min_hits=3)
+
+
+def _status_inconsistency(ctx):
+    status_inconsistency(ctx["df_f"], profile=ctx["profile"])
+    status_flips(ctx["df_f"])
+    status_transition_matrix(ctx["df_f"])
+
+
+def _rapid_fire(ctx):
+    rapid_fire_summary(rapid_fire(ctx["df_f"], ctx["profile"], max_interval_sec=5))
+
+
+def _burst(ctx):
+    # Semua key sekaligus: NIK, SourceApps, SourceApps + NIK
+    for by in (["Nik"], ["SourceApps"], ["SourceApps", "Nik"]):
+        burst_summary(burst_windows(ctx["df_f"], by, min_requests=5, window_sec=60), by)
+
+
+def _cache_replay(ctx):
+    Replay(ctx["df_f"]).report(default_policies(capacity=100_000, ttl_days=30))
+
+
+def _cross_source(ctx):
+    cross_source_inconsistency(ctx["df_f"], profile=ctx["profile"])
+
+
+def _drill_down(ctx):
+    index = NikIndex(ctx["df"]["Nik"])
+    nik = ctx["profile"]["Hit_Count"].idxmax()
+    index.search(str(nik)[:6])
+    nik_source_counts(ctx["df"].iloc[index.rows(nik)])
+
+
+SECTIONS = [
+    ("INGEST", _ingest),
+    ("FILTER", _filter),
+    ("KPI", _kpi),
+    ("SOURCE PERFORMANCE", _source_performance),
+    ("STATUS RECAP", _status_recap),
+    ("TREND", _trend),
+    ("ROLLUP BUILD", _rollup),
+    ("TREND (ROLLUP)", _trend_rollup),
+    ("FRAUD SAME APP", _same_app),
+    ("FRAUD STATUS INCONSISTENCY", _status_inconsistency),
+    ("FRAUD RAPID FIRE", _rapid_fire),
+    ("FRAUD BURST (3 keys)", _burst),
+    ("FRAUD CROSS SOURCE", _cross_source),
+    ("CACHE REPLAY (4 policies)", _cache_replay),
+    ("DRILL DOWN", _drill_down),
+]
+
+
+# ======================
+# RUNNER
+# ======================
+def _timed(fn, ctx):
+    gc.collect()
+    start = time.perf_counter()
+    fn(ctx)
+    return time.perf_counter() - start
+
+
+def _peak_mb(fn, ctx):
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn(dict(ctx))  # salinan ctx: hasil run memori tidak menimpa hasil run timing
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 1e6
+
+
+def run(sizes, memory=True, seed=0):
+    """Yield one result dict per (size, section)."""
+    for n_rows in sizes:
+        ctx = {"raw": generate_log(n_rows, seed=seed)}
+        for name, fn in SECTIONS:
+            before = dict(ctx)
+            seconds = _timed(fn, ctx)
+            result = {
+                "rows": n_rows,
+                "section": name,
+                "seconds": round(seconds, 4),
+                "rows_per_sec": round(n_rows / seconds) if seconds > 0 else None,
+            }
+            if memory:
+                result["peak_mb"] = round(_peak_mb(fn, before), 1)
+            yield result
+        del ctx
+        gc.collect()
+
+
+# ======================
+# HLL ACCURACY
+# ======================
+def hll_accuracy(sizes, error, seed=0):
+    """Yield the max relative error of the HLL Unique NIK figures vs the exact cube, per size and scope."""
+    for n_rows in sizes:
+        df, _ = encode_log(clean_log(generate_log(n_rows, seed=seed)))
+        df = sort_by_time(df)
+        exact, approx = Rollup(df), Rollup(df, hll_error=error)
+        sources = list(exact.sources)
+        end = df["CreatedDate"].max().date()
+        for scope, start in [("all", df["CreatedDate"].min().date()), ("30d", end - timedelta(days=29))]:
+            checks = {
+                "total": ([exact.unique_nik(sources, start, end)], [approx.unique_nik(sources, start, end)]),
+                "per source": (
+                    exact.unique_nik_by_source(sources, start, end)["Unique_NIK"],
+                    approx.unique_nik_by_source(sources, start, end)["Unique_NIK"],
+                ),
+                "per day": (exact.unique_nik_by_day(sources, start, end), approx.unique_nik_by_day(sources, start, end)),
+            }
+            for name, (truth, estimate) in checks.items():
+                truth, estimate = np.asarray(truth, dtype=float), np.asarray(estimate, dtype=float)
+                present = truth > 0
+                rel = np.abs(estimate[present] - truth[present]) / truth[present]
+                yield {
+                    "rows": n_rows,
+                    "scope": f"{scope} {name}",
+                    "n": int(present.sum()),
+                    "max_rel_error": round(float(rel.max()), 5) if len(rel) else 0.0,
+                    "bound": error,
+                    "within": bool((rel <= error).all()),
+                }
+
+
+# ======================
+# PARALLEL SPEEDUP
+# ======================
+def parallel_speedup(sizes, workers, seed=0):
+    """Yield sequential vs process-pool wall time of ``PARALLEL_SECTIONS`` per size (pool warmed up first).
+
+    ``ideal`` is the speedup bound with enough cores: sequential time over
+    the critical path (profile + slowest section).
+    """
+    pool = SectionPool(workers)
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            for n_rows in sizes:
+                df, _ = encode_log(clean_log(generate_log(n_rows, seed=seed)))
+                df = sort_by_time(df)
+                shared = os.path.join(tmp, f"log_{n_rows}.arrow")
+                write_shared(df, shared)
+                pool.warm_up(shared)
+                sources = list(df["SourceResult"].cat.categories)
+                start, end = df["CreatedDate"].min().date(), df["CreatedDate"].max().date()
+
+                profiler = Profiler()
+                sequential = _timed(lambda ctx: compute_sections(df, PARALLEL_SECTIONS, {}, profiler), None)
+                seconds = profiler.to_frame().set_index("section")["seconds"]
+                critical = seconds.get("PROFILE", 0.0) + seconds.drop("PROFILE", errors="ignore").max()
+                parallel = _timed(
+                    lambda ctx: pool.compute_sections(df, PARALLEL_SECTIONS, {}, shared, sources, start, end), None
+                )
+                yield {
+                    "rows": n_rows,
+                    "workers": workers,
+                    "cpus": os.cpu_count(),
+                    "sequential_sec": round(sequential, 3),
+                    "parallel_sec": round(parallel, 3),
+                    "speedup": round(sequential / parallel, 2),
+                    "ideal": round(sequential / critical, 2),
+                }
+    finally:
+        pool.shutdown()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark dashboard analytics on synthetic logs.")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help=f"Comma-separated row counts (default: {DEFAULT_SIZES})")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc peak-memory pass")
+    parser.add_argument("--json", help="Append results as JSON lines to this file")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--hll-error", type=float, help="Also check HLL Unique NIK accuracy against this relative error bound")
+    parser.add_argument("--workers", type=int, help="Also time the independent sections on a process pool of this size")
+    args = parser.parse_args(argv)
+
+    sizes = [parse_size(s) for s in args.sizes.split(",")]
+    out = open(args.json, "a") if args.json else None
+
+    print(f"{'rows':>12}  {'section':<28}{'seconds':>10}{'rows/s':>14}{'peak MB':>10}")
+    try:
+        for result in run(sizes, memory=not args.no_memory, seed=args.seed):
+            peak = f"{result['peak_mb']:>10.1f}" if "peak_mb" in result else f"{'-':>10}"
+            rate = f"{result['rows_per_sec']:>14,}" if result["rows_per_sec"] else f"{'-':>14}"
+            print(f"{result['rows']:>12,}  {result['section']:<28}{result['seconds']:>10.3f}{rate}{peak}")
+            if out:
+                out.write(json.dumps(result) + "\n")
+                out.flush()
+    finally:
+        if out:
+            out.close()
+
+    within = True
+    if args.hll_error:
+        print(f"\n{'rows':>12}  {'unique NIK (HLL)':<22}{'n':>6}{'max err':>10}{'bound':>8}")
+        for result in hll_accuracy(sizes, args.hll_error, seed=args.seed):
+            within &= result["within"]
+            flag = "" if result["within"] else "  OVER BOUND"
+            print(f"{result['rows']:>12,}  {result['scope']:<22}{result['n']:>6}"
+                  f"{result['max_rel_error']:>10.2%}{result['bound']:>8.0%}{flag}")
+
+    if args.workers:
+        if (os.cpu_count() or 1) < args.workers:
+            print(f"\nNOTE: {os.cpu_count()} cpu < {args.workers} workers → worker berbagi core, speedup bukan angka multi-core")
+        print(f"\n{'rows':>12}  {'workers':>8}{'cpus':>6}{'sequential':>12}{'parallel':>10}{'speedup':>9}{'ideal':>8}")
+        for result in parallel_speedup(sizes, args.workers, seed=args.seed):
+            print(f"{result['rows']:>12,}  {result['workers']:>8}{result['cpus']:>6}{result['sequential_sec']:>12.3f}"
+                  f"{result['parallel_sec']:>10.3f}{result['speedup']:>8.2f}x{result['ideal']:>7.2f}x")
+            if args.json:
+                with open(args.json, "a") as f:
+                    f.write(json.dumps(result) + "\n")
+
+    rss = peak_rss_bytes()
+    if rss is not None:
+        print(f"max RSS: {rss / 1e6:,.0f} MB")
+    return 0 if within else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,222 @@
+"""Replay the historical log through simulated DB_CACHE policies.
+
+Every request with a NIK is looked up in a simulated cache in CreatedDate
+order. A hit would have been served by DB_CACHE; a miss is an external
+call (DUKCAPIL / BCA) whose result is then cached. Comparing hits with
+the SourceResult that actually served each row gives the external calls
+a policy would have avoided.
+
+Policies:
+
+- ``("LRU", n)``: at most ``n`` NIKs, least recently used evicted first
+- ``("LFU", n)``: at most ``n`` NIKs, least frequently used evicted first (ties: oldest)
+- ``("TTL", days)``: unbounded, a cached NIK expires ``days`` after it was fetched
+- ``("UNBOUNDED", None)``: every repeat is a hit (upper bound)
+
+    python cache_sim.py "LogDUKCAPIL_2025 (1).xlsx" --lru 1000,10000 --ttl 7,30 --lfu 10000
+"""
+import argparse
+import sys
+import time
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from ingest import load_log
+
+CACHE_SOURCE = "DB_CACHE"
+
+REPORT_COLUMNS = [
+    "Policy", "Hit_Ratio", "Hits", "External_Calls", "Actual_External", "Avoided_Calls",
+    "Saving_vs_Actual", "Peak_Entries", "Replay_Sec",
+]
+
+
+def policy_name(policy):
+    kind, size = policy
+    if kind == "TTL":
+        return f"TTL {size:g} hari"
+    return kind if size is None else f"{kind} {size:,}"
+
+
+class Replay:
+    """Requests of a log as integer NIK codes in CreatedDate order, ready to be replayed."""
+
+    def __init__(self, df):
+        df = df[df["Nik"].notna() & df["CreatedDate"].notna()]
+        if not df["CreatedDate"].is_monotonic_increasing:
+            df = df.iloc[np.argsort(df["CreatedDate"].to_numpy(), kind="stable")]
+
+        self.keys, niks = pd.factorize(df["Nik"])
+        self.n_keys = len(niks)
+        self.seconds = df["CreatedDate"].to_numpy().astype("datetime64[s]").astype(np.int64)
+        source = df["SourceResult"].astype(object).to_numpy()
+        self.sources = source
+        # Baris yang aslinya dilayani sumber eksternal (bukan DB_CACHE)
+        self.external = pd.notna(source) & (source != CACHE_SOURCE)
+
+    def __len__(self):
+        return len(self.keys)
+
+    # ======================
+    # POLICIES (hit per request + jumlah entry maksimum)
+    # ======================
+    def unbounded(self):
+        hits = pd.Series(self.keys).duplicated().to_numpy()
+        return hits, self.n_keys
+
+    def lru(self, capacity):
+        cache = OrderedDict()
+        hits = bytearray(len(self.keys))
+        for i, key in enumerate(self.keys.tolist()):
+            if key in cache:
+                cache.move_to_end(key)
+                hits[i] = 1
+            else:
+                cache[key] = None
+                if len(cache) > capacity:
+                    cache.popitem(last=False)
+        return np.frombuffer(hits, dtype=bool), min(capacity, self.n_keys)
+
+    def lfu(self, capacity):
+        # O(1) LFU: bucket per frekuensi (OrderedDict urut insert → yang terlama dievict dulu)
+        if capacity < 1:
+            # Sama dengan LRU kapasitas 0: tidak ada yang tersimpan, semua request miss
+            return np.zeros(len(self.keys), dtype=bool), 0
+        freq = {}
+        buckets = {}
+        min_freq = 0
+        hits = bytearray(len(self.keys))
+        for i, key in enumerate(self.keys.tolist()):
+            f = freq.get(key)
+            if f is not None:
+                hits[i] = 1
+                bucket = buckets[f]
+                del bucket[key]
+                if not bucket:
+                    del buckets[f]
+                    if min_freq == f:
+                        min_freq = f + 1
+                freq[key] = f + 1
+                buckets.setdefault(f + 1, OrderedDict())[key] = None
+                continue
+            if len(freq) >= capacity:
+                bucket = buckets[min_freq]
+                evicted, _ = bucket.popitem(last=False)
+                if not bucket:
+                    del buckets[min_freq]
+                del freq[evicted]
+            freq[key] = 1
+            buckets.setdefault(1, OrderedDict())[key] = None
+            min_freq = 1
+        return np.frombuffer(hits, dtype=bool), min(capacity, self.n_keys)
+
+    def ttl(self, days):
+        """Fetch times per NIK found with one ``searchsorted`` round per refresh, not per request."""
+        ttl = int(days * 86400)
+        order = np.argsort(self.keys, kind="stable")  # urutan waktu dalam satu NIK tetap
+        key = self.keys[order]
+        t = self.seconds[order]
+        if len(t):
+            t = t - t.min()
+        # Offset per NIK lebih besar dari rentang waktu + TTL: satu array naik untuk semua NIK
+        u = t + key * (int(t.max(initial=0)) + ttl + 1)
+
+        fetched = np.zeros(len(u), dtype=bool)
+        cur = np.flatnonzero(np.r_[True, key[1:] != key[:-1]]) if len(key) else key
+        while len(cur):
+            fetched[cur] = True
+            nxt = np.searchsorted(u, u[cur] + ttl, side="left")
+            same = nxt < len(u)
+            same[same] = key[nxt[same]] == key[cur[same]]
+            cur = nxt[same]
+
+        hits = np.empty(len(u), dtype=bool)
+        hits[order] = ~fetched
+        # Entry hidup [fetch, fetch + TTL): puncak = maksimum entry yang overlap
+        start = np.sort(t[fetched])
+        ends = start + ttl
+        alive = np.arange(1, len(start) + 1) - np.searchsorted(ends, start, side="right")
+        return hits, int(alive.max(initial=0))
+
+    POLICIES = {"UNBOUNDED": unbounded, "LRU": lru, "LFU": lfu, "TTL": ttl}
+
+    # ======================
+    # REPORT
+    # ======================
+    def simulate(self, policy):
+        """One report row (see ``REPORT_COLUMNS``) for ``policy`` = ``(kind, size)``."""
+        kind, size = policy
+        start = time.perf_counter()
+        fn = self.POLICIES[kind]
+        hits, peak = fn(self) if size is None else fn(self, size)
+        elapsed = time.perf_counter() - start
+
+        n_hits = int(hits.sum())
+        external_calls = len(hits) - n_hits
+        actual_external = int(self.external.sum())
+        avoided = hits & self.external
+        row = {
+            "Policy": policy_name(policy),
+            "Hit_Ratio": n_hits / len(hits) if len(hits) else 0.0,
+            "Hits": n_hits,
+            "External_Calls": external_calls,
+            "Actual_External": actual_external,
+            "Avoided_Calls": int(avoided.sum()),
+            "Saving_vs_Actual": actual_external - external_calls,
+            "Peak_Entries": peak,
+            "Replay_Sec": round(elapsed, 3),
+        }
+        # Panggilan yang dihindari per sumber eksternal (mis. Avoided_DUKCAPIL, Avoided_BCA)
+        for src, n in pd.Series(self.sources[avoided]).value_counts().items():
+            row[f"Avoided_{src}"] = int(n)
+        return row
+
+    def report(self, policies):
+        rows = [self.simulate(p) for p in policies]
+        extra = sorted({c for r in rows for c in r} - set(REPORT_COLUMNS))
+        return pd.DataFrame(rows, columns=REPORT_COLUMNS + extra).fillna({c: 0 for c in extra})
+
+
+def default_policies(capacity, ttl_days, lfu_capacity=None):
+    return [
+        ("LRU", capacity),
+        ("LFU", capacity if lfu_capacity is None else lfu_capacity),
+        ("TTL", ttl_days),
+        ("UNBOUNDED", None),
+    ]
+
+
+# ======================
+# CLI
+# ======================
+def _numbers(text, kind=int):
+    return [kind(x) for x in text.split(",") if x] if text else []
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay a verification log through simulated DB_CACHE policies.")
+    parser.add_argument("log", help="Log export (.xlsx, .csv or .parquet)")
+    parser.add_argument("--lru", default="10000", help="LRU capacities, comma separated")
+    parser.add_argument("--lfu", default="10000", help="LFU capacities, comma separated")
+    parser.add_argument("--ttl", default="30", help="TTL in days, comma separated")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    replay = Replay(load_log(args.log))
+    print(f"{len(replay):,} requests · {replay.n_keys:,} NIK · load {time.perf_counter() - start:.1f}s")
+
+    policies = (
+        [("LRU", n) for n in _numbers(args.lru)]
+        + [("LFU", n) for n in _numbers(args.lfu)]
+        + [("TTL", d) for d in _numbers(args.ttl, float)]
+        + [("UNBOUNDED", None)]
+    )
+    with pd.option_context("display.width", 200, "display.max_columns", None):
+        print(replay.report(policies).to_string(index=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,84 @@
+"""Headless run of the dashboard analytics.
+
+    python cli.py "LogDUKCAPIL_2025 (1).xlsx" --out precomputed
+    python cli.py log.xlsx --start 2025-01-01 --end 2025-01-31 --source DUKCAPIL --format json
+    python cli.py log_store --start 2025-06-01     # log store berpartisi: hanya partisi yang overlap dibaca
+    python cli.py .snapshot --backend duckdb      # query Parquet langsung (file, folder atau glob)
+
+Results land in ``<out>/<view_id>/`` and are picked up by EKYC.py when the
+sidebar filter matches the same view.
+"""
+import argparse
+import sys
+from datetime import date
+from pathlib import Path
+
+from analytics import compute_analytics, filter_log
+from duckdb_backend import DuckDBLog, source_fingerprint
+from export import PRECOMPUTED_DIR, write_results
+from ingest import SNAPSHOT_DIR, file_fingerprint, load_log
+from log_store import MANIFEST, LogStore
+from result_cache import filter_key
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Compute NIK verification analytics without Streamlit.")
+    parser.add_argument("log", help="Log export (.xlsx or .csv) or log store directory; Parquet file, directory or glob with --backend duckdb")
+    parser.add_argument("--start", type=date.fromisoformat, help="First date (YYYY-MM-DD), default: earliest in log")
+    parser.add_argument("--end", type=date.fromisoformat, help="Last date (YYYY-MM-DD), default: latest in log")
+    parser.add_argument("--source", action="append", help="SourceResult to include (repeatable), default: all")
+    parser.add_argument("--out", default=PRECOMPUTED_DIR, help=f"Output directory (default: {PRECOMPUTED_DIR})")
+    parser.add_argument("--format", choices=["parquet", "json"], default="parquet")
+    parser.add_argument("--snapshot-dir", default=SNAPSHOT_DIR)
+    parser.add_argument("--backend", choices=["pandas", "duckdb"], default="pandas",
+                        help="pandas: load the log into memory (default); duckdb: query the Parquet files out-of-core")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    if args.backend == "duckdb":
+        log_db = DuckDBLog(args.log)
+        fingerprint = source_fingerprint(args.log)
+        source_options = log_db.source_options()
+        date_min, date_max = log_db.date_bounds()
+    elif (Path(args.log) / MANIFEST).exists():
+        store = LogStore(args.log)
+        df = None  # dibaca setelah range tanggal diketahui: hanya partisi yang overlap
+        fingerprint = store.fingerprint()
+        source_options = store.source_options()
+        date_min, date_max = store.date_bounds()
+    else:
+        df = load_log(args.log, args.snapshot_dir)
+        fingerprint = file_fingerprint(args.log)
+        source_options = sorted(df["SourceResult"].dropna().unique())
+        date_min = df["CreatedDate"].min().date()
+        date_max = df["CreatedDate"].max().date()
+
+    sources = args.source or source_options
+    start = args.start or date_min
+    end = args.end or date_max
+
+    if args.backend == "duckdb":
+        n_rows = log_db.count(sources, start, end)
+        results = log_db.compute_analytics(sources, start, end)
+    else:
+        if df is None:
+            df = store.read(start, end)
+        df_f = filter_log(df, sources, start, end)
+        n_rows = len(df_f)
+        results = compute_analytics(df_f)
+
+    key = filter_key(
+        fingerprint, sources, start, end,
+        all_sources=source_options, date_min=date_min, date_max=date_max
+    )
+    view_dir = write_results(results, args.out, key, fmt=args.format)
+
+    print(f"{n_rows:,} rows → {view_dir}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,553 @@
+"""Out-of-core query backend: DuckDB over (partitioned) Parquet.
+
+The log never enters pandas as a whole. Filters are pushed into the
+Parquet scan and every dashboard section is one aggregate query, so only
+the (small) result tables come back as DataFrames with the same columns
+as ``analytics.compute_sections``. DuckDB is optional (``pip install
+duckdb``); the pandas path stays the default.
+
+    log = DuckDBLog(".snapshot")               # or a dir of partitions / glob / single file
+    results = log.compute_analytics(["DUKCAPIL"], date(2023, 1, 1), date(2025, 12, 31))
+"""
+import glob
+import hashlib
+import os
+import tempfile
+from datetime import timedelta
+
+import pandas as pd
+
+from analytics import (
+    ANALYTICS_SECTIONS, RAPID_FIRE_SEC, app_summary, changed_transitions, flag_hourly_anomalies,
+    inconsistency_summary, kpi_from_counts, peak_hour, rapid_fire_summary, weekday_table,
+    cross_summary
+)
+from ingest import STATUS_MASK_COLS, file_fingerprint, status_cols
+from profiling import section
+
+try:
+    import duckdb
+except ImportError:  # backend opsional
+    duckdb = None
+
+# Repeat NIK di DuckDB: hanya NIK dengan hit >1, paling banyak sekian baris (dashboard tampilkan top 50)
+REPEAT_LIMIT = 1000
+
+
+def _q(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _lit(text):
+    return "'" + text.replace("'", "''") + "'"
+
+
+def parquet_files(source):
+    """Parquet files behind ``source``: a file, a directory (searched recursively) or a glob.
+
+    In a directory, paths with a part starting with ``_`` or ``.`` (e.g. the
+    log store's ``_agg/`` aggregates) are skipped.
+    """
+    if not os.path.isdir(source):
+        return sorted(glob.glob(source, recursive=True))
+    files = glob.glob(os.path.join(source, "**", "*.parquet"), recursive=True)
+    return sorted(
+        f for f in files
+        if not any(part.startswith(("_", ".")) for part in os.path.relpath(f, source).split(os.sep))
+    )
+
+
+def source_fingerprint(source):
+    """Changes whenever a Parquet file behind ``source`` is added, removed or rewritten."""
+    files = parquet_files(source)
+    if len(files) == 1 and os.path.abspath(files[0]) == os.path.abspath(source):
+        return file_fingerprint(source)
+    digest = hashlib.sha1()
+    for path in files:
+        st = os.stat(path)
+        digest.update(f"{os.path.abspath(path)}|{st.st_size}|{st.st_mtime_ns}\n".encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+class DuckDBLog:
+    """Dashboard analytics as DuckDB queries over the Parquet files behind ``source``.
+
+    One in-memory DuckDB database per instance; every call uses its own
+    cursor, so an instance can be shared by Streamlit sessions.
+    """
+
+    def __init__(self, source, memory_limit=None, threads=None):
+        if duckdb is None:
+            raise ImportError("DuckDB backend butuh paket 'duckdb' (pip install duckdb)")
+
+        self.source = source
+        self.files = parquet_files(source)
+        if not self.files:
+            raise FileNotFoundError(f"Tidak ada file Parquet di '{source}'")
+
+        self._con = duckdb.connect()
+        if memory_limit:
+            self._con.execute(f"SET memory_limit = {_lit(memory_limit)}")
+        if threads:
+            self._con.execute(f"SET threads = {int(threads)}")
+
+        files = ", ".join(_lit(f) for f in self.files)
+        self._con.execute(
+            f"CREATE VIEW raw_log AS SELECT * FROM read_parquet([{files}], union_by_name = true)"
+        )
+        self.columns = [r[0] for r in self._con.execute("DESCRIBE raw_log").fetchall()]
+        self.status_cols = [c for c in status_cols if c in self.columns]
+        # Urutan dalam satu NIK: CreatedDate, lalu Id (urutan export) kalau ada
+        self._order = "CreatedDate, Id" if "Id" in self.columns else "CreatedDate"
+
+    # ======================
+    # QUERY HELPERS
+    # ======================
+    def _query(self, sql, params=None):
+        return self._con.cursor().execute(sql, params or {}).df()
+
+    def _log_cte(self):
+        # Filter di-push ke scan Parquet (statistik row group / file dipakai untuk skip)
+        return """log AS (
+            SELECT * FROM raw_log
+            WHERE CreatedDate >= $start AND CreatedDate < $end
+              AND list_contains($sources::VARCHAR[], SourceResult)
+        )"""
+
+    @staticmethod
+    def params(sources, start, end):
+        return {
+            "sources": [str(s) for s in sources],
+            "start": pd.Timestamp(start).to_pydatetime(),
+            "end": (pd.Timestamp(end) + timedelta(days=1)).to_pydatetime(),
+        }
+
+    def _count_if(self, status, alias_fmt):
+        return ", ".join(
+            f"count_if({_q(c)} = {_lit(status)}) AS {_q(alias_fmt.format(c))}" for c in self.status_cols
+        )
+
+    def _field_pos(self, expr):
+        fields = ", ".join(_lit(c) for c in self.status_cols)
+        return f"list_position([{fields}], {expr})"
+
+    # ======================
+    # LOG INFO
+    # ======================
+    def date_bounds(self):
+        """``(first, last)`` CreatedDate day; ``(None, None)`` when no row has a valid date."""
+        lo, hi = self._con.cursor().execute("SELECT min(CreatedDate), max(CreatedDate) FROM raw_log").fetchone()
+        if lo is None:
+            return None, None
+        return pd.Timestamp(lo).date(), pd.Timestamp(hi).date()
+
+    def source_options(self):
+        rows = self._con.cursor().execute(
+            "SELECT DISTINCT SourceResult FROM raw_log WHERE SourceResult IS NOT NULL ORDER BY 1"
+        ).fetchall()
+        return [r[0] for r in rows]
+
+    def count(self, sources, start, end):
+        sql = f"WITH {self._log_cte()} SELECT count(*) FROM log"
+        return int(self._con.cursor().execute(sql, self.params(sources, start, end)).fetchone()[0])
+
+    # ======================
+    # SECTIONS
+    # ======================
+    def kpi(self, p):
+        sesuai = " + ".join(f"count_if({_q(c)} = 'Sesuai')" for c in self.status_cols) or "0"
+        row = self._query(f"""
+            WITH {self._log_cte()},
+            nik AS (SELECT count(*) AS hits FROM log WHERE Nik IS NOT NULL GROUP BY Nik)
+            SELECT
+                (SELECT count(*) FROM log) AS total_requests,
+                (SELECT {sesuai} FROM log) AS sesuai_cells,
+                count(*) AS total_nik,
+                count_if(hits = 1) AS nik_hit_1,
+                count_if(hits > 1) AS nik_hit_gt1,
+                count_if(hits > 5) AS high_risk_nik
+            FROM nik
+        """, p).iloc[0]
+
+        total_requests = int(row["total_requests"])
+        cells = total_requests * len(status_cols)
+        return {"kpi": kpi_from_counts(
+            total_requests=total_requests,
+            total_nik=int(row["total_nik"]),
+            nik_hit_1=int(row["nik_hit_1"]),
+            nik_hit_gt1=int(row["nik_hit_gt1"]),
+            high_risk_nik=int(row["high_risk_nik"]),
+            data_quality=int(row["sesuai_cells"]) / cells if cells > 0 else 0,
+        )}
+
+    def source_performance(self, p):
+        hits = self._query(f"""
+            WITH {self._log_cte()},
+            per AS (
+                SELECT SourceResult, Nik, count(*) AS hits
+                FROM log WHERE Nik IS NOT NULL AND SourceResult IS NOT NULL
+                GROUP BY ALL
+            )
+            SELECT
+                SourceResult,
+                count_if(hits = 1) AS hit_1,
+                count_if(hits > 1) AS hit_gt1,
+                sum(hits)::BIGINT AS Total_Requests,
+                count(*) AS Unique_NIK
+            FROM per GROUP BY SourceResult ORDER BY SourceResult
+        """, p)
+        quality = self._query(f"""
+            WITH {self._log_cte()}
+            SELECT SourceResult, count(*) AS _rows, {self._count_if("Sesuai", "{}")}
+            FROM log WHERE SourceResult IS NOT NULL
+            GROUP BY SourceResult ORDER BY SourceResult
+        """, p)
+
+        src_nik_stack = pd.DataFrame({
+            "SourceResult": hits["SourceResult"].repeat(2).to_numpy(),
+            "hit_type": ["Hit 1x", "Hit >1x"] * len(hits),
+            "nik_count": hits[["hit_1", "hit_gt1"]].to_numpy(dtype="int64").ravel(),
+        })
+        src_nik_stack = src_nik_stack[src_nik_stack["nik_count"] > 0].reset_index(drop=True)
+
+        source_quality = pd.DataFrame({"SourceResult": quality["SourceResult"].astype(object)})
+        for c in self.status_cols:
+            source_quality[c] = quality[c] / quality["_rows"]
+        score = quality[self.status_cols].sum(axis=1) / (quality["_rows"] * len(status_cols))
+
+        source_perf = hits[["SourceResult", "Total_Requests", "Unique_NIK"]].astype(
+            {"SourceResult": object, "Total_Requests": "int64", "Unique_NIK": "int64"}
+        ).merge(
+            pd.DataFrame({"SourceResult": quality["SourceResult"].astype(object), "Quality_Score": score}),
+            on="SourceResult"
+        )
+        source_perf["Cost_Efficiency"] = source_perf["Unique_NIK"] / source_perf["Total_Requests"]
+        source_perf["Duplicate_Rate"] = 1 - source_perf["Cost_Efficiency"]
+
+        return {"src_nik_stack": src_nik_stack, "source_perf": source_perf, "source_quality": source_quality}
+
+    def status_recap(self, p):
+        selects = ", ".join(
+            self._count_if(status, "{}|" + status) for status in STATUS_MASK_COLS
+        )
+        row = self._query(f"WITH {self._log_cte()} SELECT count(*) AS _rows, {selects} FROM log", p).iloc[0]
+        n = int(row["_rows"])
+
+        frames = []
+        totals = pd.Series(0, index=self.status_cols, dtype="int64")
+        for status in STATUS_MASK_COLS:
+            counts = pd.Series([int(row[f"{c}|{status}"]) for c in self.status_cols], index=self.status_cols)
+            totals += counts
+            frames.append(pd.DataFrame({"Field": self.status_cols, "Status": status, "Count": counts.to_numpy()}))
+        frames.append(pd.DataFrame({"Field": self.status_cols, "Status": "Lainnya", "Count": (n - totals).to_numpy()}))
+
+        rekap_long = pd.concat(frames, ignore_index=True)
+        rekap_long = rekap_long[rekap_long["Count"] > 0]
+        rekap_long = rekap_long.sort_values(["Field", "Status"], kind="stable").reset_index(drop=True)
+
+        sesuai = pd.Series([int(row[f"{c}|Sesuai"]) for c in self.status_cols], dtype="float64")
+        field_df = pd.DataFrame({
+            "Field": self.status_cols,
+            "Accuracy": sesuai.to_numpy() / n * 100 if n else float("nan"),
+        }).sort_values("Accuracy", kind="stable")
+
+        return {"rekap_long": rekap_long, "field_df": field_df}
+
+    def repeat_nik(self, p):
+        repeat_table = self._query(f"""
+            WITH {self._log_cte()}
+            SELECT Nik, count(*) AS "Total Request"
+            FROM log WHERE Nik IS NOT NULL
+            GROUP BY Nik HAVING count(*) > 1
+            ORDER BY 2 DESC, min(CreatedDate), Nik
+            LIMIT {REPEAT_LIMIT}
+        """, p)
+        top = self._query(f"""
+            WITH {self._log_cte()}
+            SELECT Nik AS NIK, count(*) AS Hit_Count
+            FROM log WHERE Nik IS NOT NULL
+            GROUP BY Nik ORDER BY Hit_Count DESC, Nik LIMIT 10
+        """, p)
+        return {"repeat_table": repeat_table, "top_repeat": top}
+
+    def trend(self, p):
+        daily = self._query(f"""
+            WITH {self._log_cte()}
+            SELECT
+                date_trunc('day', CreatedDate)::TIMESTAMP AS "Date",
+                count(*) AS Total,
+                count(Nik) AS Total_Requests,
+                count(DISTINCT Nik) AS Unique_NIK
+            FROM log GROUP BY 1 ORDER BY 1
+        """, p)
+        return {"daily": daily}
+
+    def peak_time(self, p):
+        hourly = self._query(f"""
+            WITH {self._log_cte()}
+            SELECT hour(CreatedDate)::TINYINT AS Hour, count(*) AS Total_Request
+            FROM log GROUP BY 1 ORDER BY 1
+        """, p)
+        weekday = self._query(f"""
+            WITH {self._log_cte()}
+            SELECT (isodow(CreatedDate) - 1)::TINYINT AS Weekday, count(*) AS n
+            FROM log GROUP BY 1
+        """, p)
+        hourly = flag_hourly_anomalies(hourly)
+        return {
+            "hourly": hourly,
+            "peak_hour": peak_hour(hourly) if len(hourly) else None,
+            "weekday": weekday_table(weekday.set_index("Weekday")["n"]),
+        }
+
+    def same_app(self, p, min_hits=3):
+        same_app_suspicious = self._query(f"""
+            WITH {self._log_cte()}
+            SELECT SourceApps, Nik, count(*) AS Hit_Count
+            FROM log WHERE Nik IS NOT NULL AND SourceApps IS NOT NULL
+            GROUP BY ALL HAVING count(*) > {int(min_hits)}
+            ORDER BY Hit_Count DESC, SourceApps, Nik
+        """, p)
+        return {"same_app_suspicious": same_app_suspicious, "app_summary": app_summary(same_app_suspicious)}
+
+    def status_inconsistency(self, p, max_sequence=5):
+        cols = ", ".join(_q(c) for c in self.status_cols)
+        prevs = ", ".join(f"lag({_q(c)}) OVER w AS {_q(c + '|prev')}" for c in self.status_cols)
+        pairs = ", ".join(f"({_q(c)}, {_q(c + '|prev')}) AS {_q(c)}" for c in self.status_cols)
+        sequence = ", ".join(f"max(Status) FILTER (WHERE rn = {i})" for i in range(1, int(max_sequence) + 1))
+
+        # Cursor ditutup juga kalau query gagal (temp table ikut hilang)
+        with self._con.cursor() as cur:
+            # Baris NIK yang hit >1, dengan urutan & status request sebelumnya (satu window sort)
+            cur.execute(f"""
+                CREATE TEMP TABLE d AS
+                WITH {self._log_cte()},
+                multi AS (
+                    SELECT Nik, min(CreatedDate) AS first_seen
+                    FROM log WHERE Nik IS NOT NULL GROUP BY Nik HAVING count(*) > 1
+                )
+                SELECT Nik, CreatedDate, SourceResult, SourceApps, first_seen, {cols}, {prevs},
+                    row_number() OVER w AS rn
+                FROM log JOIN multi USING (Nik)
+                WINDOW w AS (PARTITION BY Nik ORDER BY {self._order})
+            """, p)
+            # Long (NIK, urutan, field, status, status sebelumnya) untuk inconsistency, flip & matriks transisi
+            cur.execute(f"""
+                CREATE TEMP TABLE long AS
+                SELECT * FROM (
+                    SELECT Nik, rn, CreatedDate, first_seen, {cols}, {", ".join(_q(c + "|prev") for c in self.status_cols)} FROM d
+                ) UNPIVOT INCLUDE NULLS ((Status, prev) FOR Field IN ({pairs}))
+            """)
+
+            df_inconsist = cur.execute(f"""
+                WITH flagged AS (
+                    SELECT Nik, Field, count(DISTINCT Status) AS Unique_Statuses, any_value(first_seen) AS first_seen,
+                        concat_ws(' → ', {sequence}) AS Status_Sequence
+                    FROM long GROUP BY Nik, Field
+                    HAVING count(DISTINCT Status) > 1 AND NOT bool_or(Status = '-')
+                ),
+                nik_log AS (SELECT * FROM d SEMI JOIN (SELECT DISTINCT Nik FROM flagged) f USING (Nik)),
+                per_nik AS (
+                    SELECT Nik, count(*) AS Total_Hits, min(CreatedDate) AS First_Date,
+                        max(CreatedDate) AS Last_Date, arg_min(SourceApps, rn) AS SourceApps
+                    FROM nik_log GROUP BY Nik
+                ),
+                srcs AS (
+                    SELECT Nik, string_agg(SourceResult, ', ' ORDER BY first_rn) AS Sources_Used
+                    FROM (SELECT Nik, SourceResult, min(rn) AS first_rn FROM nik_log WHERE SourceResult IS NOT NULL GROUP BY ALL)
+                    GROUP BY Nik
+                )
+                SELECT f.Nik AS NIK, f.Field, f.Status_Sequence, f.Unique_Statuses, p.Total_Hits,
+                    p.First_Date, p.Last_Date, srcs.Sources_Used, p.SourceApps
+                FROM flagged f
+                JOIN per_nik p USING (Nik)
+                LEFT JOIN srcs USING (Nik)
+                ORDER BY f.first_seen, f.Nik, {self._field_pos("f.Field")}
+            """).df()
+
+            sesuai_to_tidak = cur.execute(f"""
+                SELECT Nik AS NIK, Field, arg_min(CreatedDate, rn) AS "When"
+                FROM long WHERE prev = 'Sesuai' AND Status = 'Tidak Sesuai'
+                GROUP BY Nik, Field
+                ORDER BY any_value(first_seen), Nik, {self._field_pos("Field")}
+            """).df()
+
+            matrix = cur.execute("""
+                SELECT Field, prev AS "From", Status AS "To", count(*) AS Count
+                FROM long WHERE prev IS NOT NULL GROUP BY ALL
+            """).df()
+
+        return {
+            "df_inconsist": df_inconsist,
+            "inconsist_summary": inconsistency_summary(df_inconsist),
+            "sesuai_to_tidak": sesuai_to_tidak,
+            "transitions": changed_transitions(matrix, self.status_cols),
+        }
+
+    def rapid_fire(self, p, max_interval_sec=RAPID_FIRE_SEC):
+        df_rapid = self._query(f"""
+            WITH {self._log_cte()},
+            t AS (
+                SELECT *,
+                    date_diff('microsecond', lag(CreatedDate) OVER (PARTITION BY Nik ORDER BY {self._order}), CreatedDate)
+                        / 1e6 AS Time_Diff
+                FROM log WHERE Nik IS NOT NULL
+            )
+            SELECT * FROM t WHERE Time_Diff < {float(max_interval_sec)}
+            ORDER BY Nik, {self._order}
+        """, p)
+        return {"df_rapid": df_rapid, "rapid_summary": rapid_fire_summary(df_rapid)}
+
+    def cross_source(self, p):
+        cols = ", ".join(_q(c) for c in self.status_cols)
+        # Source sedikit & diketahui: modus per source jadi kolom, string digabung tanpa ordered aggregate
+        sources = sorted(p["sources"])
+        per_source = ", ".join(
+            f"max(Status) FILTER (WHERE SourceResult = {_lit(s)}) AS {_q('s|' + s)}" for s in sources
+        )
+        names = ", ".join(f"CASE WHEN {_q('s|' + s)} IS NOT NULL THEN {_lit(s)} END" for s in sources)
+        values = ", ".join(_q("s|" + s) for s in sources)
+
+        df_cross = self._query(f"""
+            WITH {self._log_cte()},
+            nik AS (
+                SELECT Nik, count(*) AS hits, min(CreatedDate) AS first_seen
+                FROM log WHERE Nik IS NOT NULL
+                GROUP BY Nik HAVING count(DISTINCT SourceResult) > 1
+            ),
+            long AS (
+                UNPIVOT (
+                    SELECT Nik, SourceResult, {cols}
+                    FROM log SEMI JOIN nik USING (Nik) WHERE SourceResult IS NOT NULL
+                ) ON {cols} INTO NAME Field VALUE Status
+            ),
+            modes AS (
+                SELECT Nik, SourceResult, Field, Status
+                FROM (SELECT Nik, SourceResult, Field, Status, count(*) AS n FROM long GROUP BY ALL)
+                QUALIFY row_number() OVER (PARTITION BY Nik, SourceResult, Field ORDER BY n DESC, Status) = 1
+            ),
+            dis AS (
+                SELECT Nik, Field, {per_source}
+                FROM modes GROUP BY Nik, Field
+                HAVING count(DISTINCT Status) > 1
+            )
+            SELECT dis.Nik AS NIK, dis.Field, concat_ws(', ', {names}) AS Sources,
+                concat_ws(', ', {values}) AS "Values", nik.hits AS Hit_Count
+            FROM dis JOIN nik USING (Nik)
+            ORDER BY nik.first_seen, dis.Nik, {self._field_pos("dis.Field")}
+        """, p)
+        return {"df_cross": df_cross, "cross_summary": cross_summary(df_cross)}
+
+    # Nama section sama dengan analytics.ANALYTICS_SECTIONS
+    SECTIONS = {
+        "KPI": kpi,
+        "SOURCE PERFORMANCE": source_performance,
+        "STATUS RECAP": status_recap,
+        "REPEAT NIK": repeat_nik,
+        "TREND": trend,
+        "PEAK TIME": peak_time,
+        "FRAUD SAME APP": same_app,
+        "FRAUD STATUS INCONSISTENCY": status_inconsistency,
+        "FRAUD RAPID FIRE": rapid_fire,
+        "FRAUD CROSS SOURCE": cross_source,
+    }
+
+    def compute_sections(self, names, results, sources, start, end, profiler=None):
+        """DuckDB counterpart of ``analytics.compute_sections`` for the filter (sources, start..end)."""
+        done = results.setdefault("sections", [])
+        p = self.params(sources, start, end)
+        for name in names:
+            if name in done:
+                continue
+            with section(profiler, name):
+                results.update(self.SECTIONS[name](self, p))
+            done.append(name)
+        return results
+
+    def compute_analytics(self, sources, start, end, profiler=None):
+        return self.compute_sections(ANALYTICS_SECTIONS, {}, sources, start, end, profiler)
+
+    # ======================
+    # BURST WINDOW
+    # ======================
+    def burst_windows(self, sources, start, end, by=("Nik",), min_requests=5, window_sec=60):
+        """``analytics.burst_windows`` as window queries: request count over ``(t - window_sec, t]`` per key."""
+        keys = ", ".join(_q(c) for c in by)
+        not_null = " AND ".join(f"{_q(c)} IS NOT NULL" for c in by)
+        window_ms = int(window_sec * 1000)
+        return self._query(f"""
+            WITH {self._log_cte()},
+            w AS (
+                SELECT *,
+                    count(*) OVER (PARTITION BY {keys} ORDER BY epoch_ms(CreatedDate)
+                        RANGE BETWEEN {window_ms - 1} PRECEDING AND CURRENT ROW) AS Window_Count
+                FROM log WHERE CreatedDate IS NOT NULL AND {not_null}
+            ),
+            m AS (
+                -- Anggota burst: ada window yang lolos threshold dan berakhir dalam window_sec setelah baris ini
+                SELECT *,
+                    max((Window_Count >= {int(min_requests)})::INT) OVER (PARTITION BY {keys} ORDER BY epoch_ms(CreatedDate)
+                        RANGE BETWEEN CURRENT ROW AND {window_ms - 1} FOLLOWING) AS hit
+                FROM w
+            )
+            SELECT * EXCLUDE (hit) FROM m WHERE hit = 1
+            ORDER BY {keys}, {self._order}
+        """, self.params(sources, start, end))
+
+    # ======================
+    # ROWS (drill-down, raw data)
+    # ======================
+    def search_nik(self, prefix, limit=20):
+        rows = self._con.cursor().execute(
+            "SELECT DISTINCT Nik::VARCHAR AS k FROM raw_log WHERE starts_with(Nik::VARCHAR, $prefix) ORDER BY k LIMIT $limit",
+            {"prefix": str(prefix), "limit": int(limit)}
+        ).fetchall()
+        return [r[0] for r in rows]
+
+    def count_nik(self, prefix):
+        return int(self._con.cursor().execute(
+            "SELECT count(DISTINCT Nik) FROM raw_log WHERE starts_with(Nik::VARCHAR, $prefix)",
+            {"prefix": str(prefix)}
+        ).fetchone()[0])
+
+    def nik_rows(self, nik):
+        """All requests of one NIK (time order)."""
+        return self._query(
+            f"SELECT * FROM raw_log WHERE Nik::VARCHAR = $nik ORDER BY {self._order}",
+            {"nik": str(nik)}
+        )
+
+    def rows(self, sources, start, end, limit=50, offset=0):
+        """One page of the filtered log (time order)."""
+        return self._query(
+            f"WITH {self._log_cte()} SELECT * FROM log ORDER BY {self._order} LIMIT {int(limit)} OFFSET {int(offset)}",
+            self.params(sources, start, end)
+        )
+
+    def replay_rows(self, sources, start, end):
+        """Nik, CreatedDate, SourceResult of the filtered log in time order (input of ``cache_sim.Replay``)."""
+        return self._query(
+            f"WITH {self._log_cte()} SELECT Nik, CreatedDate, SourceResult FROM log ORDER BY {self._order}",
+            self.params(sources, start, end)
+        )
+
+    def export_file(self, sources, start, end, fmt="csv"):
+        """Filtered log written by DuckDB (streaming ``COPY``) to a temp file, returned as ``bytes``.
+
+        As ``paging.export_file``: Streamlit keeps the download in memory,
+        the ``COPY`` itself never materializes the log in pandas.
+        """
+        fd, path = tempfile.mkstemp(suffix=f".{fmt}")
+        os.close(fd)
+        options = "FORMAT parquet" if fmt == "parquet" else "FORMAT csv, HEADER"
+        try:
+            with self._con.cursor() as cur:
+                cur.execute(
+                    f"COPY (WITH {self._log_cte()} SELECT * FROM log ORDER BY {self._order}) TO {_lit(path)} ({options})",
+                    self.params(sources, start, end)
+                )
+            # File hasil COPY ditutup dulu sebelum dihapus (Windows tidak bisa hapus file yang masih terbuka)
+            with open(path, "rb") as f:
+                return f.read()
+        finally:
+            os.unlink(path)
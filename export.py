@@ -0,0 +1,109 @@
+import hashlib
+import json
+import os
+from datetime import date, datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+PRECOMPUTED_DIR = "precomputed"
+
+MANIFEST = "manifest.json"
+SUMMARY = "summary.json"
+
+
+def view_id(key):
+    """Directory name for one normalized filter key (see ``result_cache.filter_key``)."""
+    return hashlib.sha1(repr(key).encode("utf-8")).hexdigest()[:12]
+
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (pd.Timestamp, datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def _key_to_json(key):
+    version, sources, start, end = key
+    return {
+        "snapshot_version": version,
+        "sources": list(sources),
+        "start": start.isoformat() if start is not None else None,
+        "end": end.isoformat() if end is not None else None,
+    }
+
+
+def write_results(results, out_dir, key, fmt="parquet"):
+    """Write a ``compute_analytics`` bundle for ``key`` to ``out_dir/<view_id>/``.
+
+    DataFrames go to one ``<name>.parquet`` / ``<name>.json`` file each;
+    dicts and Series (KPIs, peak hour) go to ``summary.json``. Returns the
+    view directory.
+    """
+    view_dir = Path(out_dir) / view_id(key)
+    view_dir.mkdir(parents=True, exist_ok=True)
+
+    tables = {}
+    summary = {}
+    for name, value in results.items():
+        if isinstance(value, pd.DataFrame):
+            index = [] if isinstance(value.index, pd.RangeIndex) else [n for n in value.index.names if n]
+            frame = value.reset_index() if index else value.reset_index(drop=True)
+            path = view_dir / f"{name}.{fmt}"
+            if fmt == "parquet":
+                frame.to_parquet(path, index=False)
+            else:
+                frame.to_json(path, orient="table", index=False, date_format="iso", double_precision=15)
+            tables[name] = {"file": path.name, "index": index, "columns_name": value.columns.name}
+        elif isinstance(value, pd.Series):
+            summary[name] = {"series": value.to_dict(), "name": value.name}
+        else:
+            summary[name] = value
+
+    (view_dir / SUMMARY).write_text(json.dumps(summary, default=_json_default, indent=2))
+
+    manifest = {
+        "key": _key_to_json(key),
+        "format": fmt,
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "tables": tables,
+    }
+    # Manifest terakhir: view dianggap lengkap hanya kalau manifest ada
+    tmp = view_dir / (MANIFEST + ".tmp")
+    tmp.write_text(json.dumps(manifest, indent=2))
+    os.replace(tmp, view_dir / MANIFEST)
+    return view_dir
+
+
+def read_results(out_dir, key):
+    """Load a bundle written by ``write_results`` for exactly ``key``; None if absent or stale."""
+    view_dir = Path(out_dir) / view_id(key)
+    manifest_path = view_dir / MANIFEST
+    if not manifest_path.exists():
+        return None
+
+    manifest = json.loads(manifest_path.read_text())
+    if manifest["key"] != _key_to_json(key):
+        return None
+
+    results = {}
+    for name, meta in manifest["tables"].items():
+        path = view_dir / meta["file"]
+        if manifest["format"] == "parquet":
+            frame = pd.read_parquet(path)
+        else:
+            frame = pd.read_json(path, orient="table")
+        frame = frame.set_index(meta["index"]) if meta["index"] else frame
+        frame.columns.name = meta.get("columns_name")
+        results[name] = frame
+
+    summary = json.loads((view_dir / SUMMARY).read_text())
+    for name, value in summary.items():
+        if isinstance(value, dict) and set(value) in ({"series"}, {"series", "name"}):
+            value = pd.Series(value["series"], name=value.get("name"))
+        results[name] = value
+
+    return results
@@ -0,0 +1,351 @@
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+# ======================
+# SCHEMA
+# ======================
+status_cols = [
+    "NamaDenganGelar", "Nama", "JenisKelamin",
+    "TempatLahir", "TglLahir",
+    "Provinsi", "Kabupaten", "Kecamatan", "Kelurahan"
+]
+
+# Vocabulary tetap untuk kolom kategori; nilai baru di luar daftar ikut ditambahkan (urut)
+SOURCE_VOCAB = ["BCA", "DB_CACHE", "DUKCAPIL"]
+STATUS_VOCAB = ["-", "Sesuai", "Tidak Sesuai"]
+
+NIK_DIGITS = 16
+
+# Bitmask uint16 per baris: bit i = status_cols[i] bernilai status tsb
+STATUS_MASK_COLS = {
+    "Sesuai": "Mask_Sesuai",
+    "Tidak Sesuai": "Mask_Tidak_Sesuai",
+    "-": "Mask_Dash",
+}
+MASK_COLS = list(STATUS_MASK_COLS.values())
+
+SNAPSHOT_DIR = ".snapshot"
+# Naikkan kalau format snapshot berubah supaya snapshot lama di-rebuild
+SNAPSHOT_VERSION = 4
+
+
+# ======================
+# CLEANING
+# ======================
+def clean_log(df):
+    """Basic cleaning applied to every raw export."""
+    df = df.copy()
+    df.columns = df.columns.str.strip()
+
+    df["CreatedDate"] = pd.to_datetime(df["CreatedDate"], errors="coerce")
+
+    for c in status_cols:
+        if c in df.columns:
+            if isinstance(df[c].dtype, pd.CategoricalDtype) and "-" not in df[c].cat.categories:
+                df[c] = df[c].cat.add_categories("-")
+            df[c] = df[c].fillna("-")
+
+    return df
+
+
+# ======================
+# ENCODING
+# ======================
+def encode_nik(nik):
+    """Return ``(encoded, n_invalid)``; Nik becomes int64 only if every value is a 16-digit number."""
+    if pd.api.types.is_numeric_dtype(nik):
+        num = pd.to_numeric(nik)
+    else:
+        text = nik.astype("string").str.strip()
+        digits = text.where(text.str.fullmatch(rf"\d{{{NIK_DIGITS}}}").fillna(False))
+        num = pd.to_numeric(digits, errors="coerce", dtype_backend="numpy_nullable")
+
+    valid = num.notna() & (num % 1 == 0) & num.between(10 ** (NIK_DIGITS - 1), 10 ** NIK_DIGITS - 1)
+    n_invalid = int((nik.notna() & ~valid).sum())
+    if n_invalid:
+        # Format tidak valid: biarkan apa adanya supaya baris tidak hilang dari analisis
+        return nik, n_invalid
+
+    return num.astype("Int64" if nik.isna().any() else "int64"), 0
+
+
+def encode_category(values, vocab=()):
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        # Sudah kategori (mis. dari Parquet/generator): cukup samakan vocabulary tanpa bikin string per baris
+        observed = values.cat.categories[np.unique(values.cat.codes[values.cat.codes >= 0])]
+        categories = sorted(set(vocab) | {str(v) for v in observed})
+        return values.cat.rename_categories([str(v) for v in values.cat.categories]).cat.set_categories(categories).array
+
+    values = values.where(values.isna(), values.astype(str))
+    categories = sorted(set(vocab) | set(values.dropna().unique()))
+    return pd.Categorical(values, categories=categories)
+
+
+def _small_int(values):
+    return values.astype("Int8" if values.isna().any() else "int8")
+
+
+def encode_log(df):
+    """Compact dtypes: int64 Nik, categorical source/app/status columns, int8 Hour/Weekday,
+    plus packed uint16 status masks (``MASK_COLS``).
+
+    Returns ``(encoded, n_invalid_nik)``.
+    """
+    df = df.copy()
+
+    df["Nik"], n_invalid = encode_nik(df["Nik"])
+
+    if "SourceResult" in df.columns:
+        df["SourceResult"] = encode_category(df["SourceResult"], SOURCE_VOCAB)
+    if "SourceApps" in df.columns:
+        df["SourceApps"] = encode_category(df["SourceApps"])
+    for c in status_cols:
+        if c in df.columns:
+            df[c] = encode_category(df[c], STATUS_VOCAB)
+
+    df["Hour"] = _small_int(df["CreatedDate"].dt.hour)
+    df["Weekday"] = _small_int(df["CreatedDate"].dt.weekday)
+
+    for status, col in STATUS_MASK_COLS.items():
+        df[col] = status_mask(df, status)
+
+    return df, n_invalid
+
+
+def status_mask(df, status, cols=status_cols):
+    """uint16 bitmask per row; bit i is set when ``cols[i] == status``."""
+    mask = np.zeros(len(df), dtype=np.uint16)
+    for bit, c in enumerate(cols):
+        if c in df.columns:
+            mask |= (df[c] == status).to_numpy(dtype=bool).astype(np.uint16) << np.uint16(bit)
+    return mask
+
+
+def sort_by_time(df):
+    """Stable sort by CreatedDate (NaT last) with a fresh RangeIndex, as required by ``filter_log``."""
+    return df.sort_values("CreatedDate", kind="stable", na_position="last").reset_index(drop=True)
+
+
+def concat_logs(frames):
+    """Concatenate encoded logs, keeping categorical columns categorical (union of categories)."""
+    frames = [f for f in frames if f is not None]
+    if len(frames) == 1:
+        return frames[0].reset_index(drop=True)
+
+    frames = [f.copy() for f in frames]
+    for c in frames[0].columns:
+        dtypes = [f[c].dtype for f in frames if c in f.columns]
+        if not all(isinstance(d, pd.CategoricalDtype) for d in dtypes):
+            continue
+        # pd.concat menjadikan object kalau kategori beda → samakan dulu (urut, seperti encode_category)
+        categories = sorted(set().union(*(set(d.categories) for d in dtypes)))
+        for f in frames:
+            if c in f.columns:
+                f[c] = f[c].cat.set_categories(categories)
+    return pd.concat(frames, ignore_index=True)
+
+
+def memory_report(before, after):
+    """Bytes per column before/after encoding (deep, incl. Python string objects)."""
+    b = before.memory_usage(index=False, deep=True)
+    a = after.memory_usage(index=False, deep=True)
+    report = pd.DataFrame({"Before_Bytes": b, "After_Bytes": a}).fillna(0).astype("int64")
+    report.index.name = "Column"
+    return report.reset_index()
+
+
+def read_raw(path):
+    path = Path(path)
+    if path.suffix.lower() == ".csv":
+        return pd.read_csv(path)
+    if path.suffix.lower() == ".parquet":
+        return pd.read_parquet(path)
+    return pd.read_excel(path)
+
+
+# ======================
+# SNAPSHOT (Parquet, keyed on file fingerprint)
+# ======================
+def file_fingerprint(path):
+    """Short hash of (absolute path, size, mtime) - changes whenever the file does."""
+    path = Path(path).resolve()
+    stat = path.stat()
+    key = f"{path}|{stat.st_size}|{stat.st_mtime_ns}"
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+
+
+def _source_key(path):
+    # jan/log.xlsx dan feb/log.xlsx punya stem sama: nama snapshot ikut hash path absolutnya
+    return hashlib.sha1(str(Path(path).resolve()).encode("utf-8")).hexdigest()[:8]
+
+
+def _snapshot_path(path, fingerprint, snapshot_dir):
+    return Path(snapshot_dir) / f"{Path(path).stem}-{_source_key(path)}-{fingerprint}.v{SNAPSHOT_VERSION}.parquet"
+
+
+def _report_path(snapshot_path):
+    return Path(snapshot_path).with_suffix(".memory.json")
+
+
+def _shared_path(snapshot_path):
+    return Path(snapshot_path).with_suffix(".arrow")
+
+
+def _snapshot_files(path, snapshot_dir):
+    """Every snapshot file of ``path`` in ``snapshot_dir``, any fingerprint or version.
+
+    Snapshots named before the source key existed (``{stem}-<fingerprint>``)
+    are included so they get cleaned up too.
+    """
+    # Persis {stem}-<source>-<fingerprint 16 hex>.v<versi>.*: export lain dengan prefix sama
+    # (log-2024.xlsx) atau stem sama di folder lain (feb/log.xlsx) tidak ikut
+    stem = re.escape(Path(path).stem)
+    pattern = re.compile(rf"{stem}-({_source_key(path)}-)?[0-9a-f]{{16}}\.v\d+\.")
+    directory = Path(snapshot_dir)
+    if not directory.is_dir():
+        return []
+    return [p for p in directory.iterdir() if pattern.match(p.name)]
+
+
+def _arrow_safe(df):
+    # Kolom object dengan tipe campuran (mis. Nik int + str) tidak bisa ditulis ke Parquet
+    df = df.copy()
+    for c in df.columns:
+        if df[c].dtype == object:
+            kind = pd.api.types.infer_dtype(df[c], skipna=True)
+            if kind.startswith("mixed"):
+                df[c] = df[c].where(df[c].isna(), df[c].astype(str))
+    return df
+
+
+def write_snapshot(df, snapshot_path):
+    """Write ``df`` to ``snapshot_path`` atomically; returns the frame as written (mixed object columns as text)."""
+    snapshot_path = Path(snapshot_path)
+    snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = snapshot_path.with_name(snapshot_path.name + ".tmp")
+    df = _arrow_safe(df)
+    df.to_parquet(tmp, index=False)
+    os.replace(tmp, snapshot_path)
+    return df
+
+
+def write_memory_report(report, n_invalid, report_path):
+    report_path = Path(report_path)
+    report_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = report_path.with_name(report_path.name + ".tmp")
+    tmp.write_text(json.dumps({
+        "invalid_nik": n_invalid,
+        "columns": report.to_dict(orient="records"),
+    }))
+    os.replace(tmp, report_path)
+
+
+def load_log(path, snapshot_dir=SNAPSHOT_DIR):
+    """Load a cleaned log, parsing the workbook only when its fingerprint changes.
+
+    The first call converts the export into a Parquet snapshot under
+    ``snapshot_dir`` (encoded and sorted by CreatedDate); later calls read
+    the snapshot directly. Snapshots of
+    older versions of the same file are removed on rebuild.
+    """
+    fingerprint = file_fingerprint(path)
+    snapshot = _snapshot_path(path, fingerprint, snapshot_dir)
+
+    if snapshot.exists():
+        return pd.read_parquet(snapshot)
+
+    cleaned = clean_log(read_raw(path))
+    df, n_invalid = encode_log(cleaned)
+    df = sort_by_time(df)
+
+    # Report ditulis dulu: snapshot yang ada selalu punya report-nya
+    write_memory_report(memory_report(cleaned, df), n_invalid, _report_path(snapshot))
+    write_snapshot(df, snapshot)
+
+    for stale in _snapshot_files(path, snapshot_dir):
+        # File Arrow lama bisa masih di-map session / worker lain: dibersihkan saat cold start (load_shared)
+        if stale not in (snapshot, _report_path(snapshot)) and stale.suffix != ".arrow":
+            stale.unlink(missing_ok=True)
+
+    return pd.read_parquet(snapshot)
+
+
+# ======================
+# SHARED (Arrow IPC memory-mapped, satu salinan untuk semua session / proses)
+# ======================
+def write_shared(df, shared_path):
+    """Uncompressed Arrow IPC (Feather v2) file with a single record batch, so columns map without copying."""
+    shared_path = Path(shared_path)
+    tmp = shared_path.with_name(shared_path.name + ".tmp")
+    feather.write_feather(_arrow_safe(df), tmp, compression="uncompressed", chunksize=max(len(df), 1))
+    os.replace(tmp, shared_path)
+
+
+def read_shared(shared_path):
+    """DataFrame over a memory-mapped Arrow file.
+
+    Numeric, datetime and bitmask columns without nulls are read-only views
+    of the mapping (pages shared by every process through the OS page
+    cache); categoricals only copy their codes. The mapping stays open as
+    long as a column references it.
+    """
+    table = pa.ipc.open_file(pa.memory_map(str(shared_path))).read_all()
+    return table.to_pandas(split_blocks=True, self_destruct=False)
+
+
+def shared_log_path(path, snapshot_dir=SNAPSHOT_DIR):
+    """Arrow file ``load_shared`` maps for the current version of ``path`` (e.g. to open it in a worker)."""
+    return _shared_path(_snapshot_path(path, file_fingerprint(path), snapshot_dir))
+
+
+# Export yang file Arrow lamanya sudah dibersihkan di proses ini
+_cold_started = set()
+
+
+def _remove_stale_shared(path, snapshot_dir, keep):
+    """Delete Arrow files of older versions of ``path``; ones still mapped elsewhere (Windows) are left for next time."""
+    for stale in _snapshot_files(path, snapshot_dir):
+        if stale.suffix == ".arrow" and stale != keep:
+            try:
+                stale.unlink()
+            except OSError:
+                pass
+
+
+def load_shared(path, snapshot_dir=SNAPSHOT_DIR):
+    """``load_log`` published once as an Arrow file next to the snapshot and memory-mapped (see ``read_shared``).
+
+    Arrow files of older versions stay on disk while this process runs
+    (sessions and pool workers may still map them); the first call after
+    a (re)start removes them.
+    """
+    shared = shared_log_path(path, snapshot_dir)
+    if not shared.exists():
+        write_shared(load_log(path, snapshot_dir), shared)
+    key = (str(Path(path).resolve()), str(Path(snapshot_dir).resolve()))
+    if key not in _cold_started:
+        _cold_started.add(key)
+        _remove_stale_shared(path, snapshot_dir, shared)
+    return read_shared(shared)
+
+
+def load_memory_report(path, snapshot_dir=SNAPSHOT_DIR):
+    """Return ``(report, n_invalid_nik)`` recorded when the current snapshot was built.
+
+    A snapshot written before the report existed has none: the report is
+    then empty and the invalid count 0.
+    """
+    snapshot = _snapshot_path(path, file_fingerprint(path), snapshot_dir)
+    report_path = _report_path(snapshot)
+    if not report_path.exists():
+        return pd.DataFrame(columns=["Column", "Before_Bytes", "After_Bytes"]), 0
+    meta = json.loads(report_path.read_text())
+    return pd.DataFrame(meta["columns"]), meta["invalid_nik"]
@@ -0,0 +1,351 @@
+"""Live tail of a growing verification log (CSV / JSON-lines file or drop directory).
+
+Only the bytes appended since the previous poll are parsed, and every
+new batch updates running counters (hits per NIK, hourly histogram,
+"Sesuai" cells, recent request times per NIK for rapid-fire alerts), so a poll
+costs the size of the batch, not of the history.
+
+    python live.py write live/ --rows 200 --every 2      # writer lokal untuk test (drop directory)
+    EKYC_LIVE=live/ streamlit run EKYC.py
+"""
+import argparse
+import bisect
+import csv
+import io
+import os
+import sys
+import threading
+import time
+from collections import deque
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from analytics import RAPID_FIRE_SEC, flag_hourly_anomalies, kpi_from_counts, popcount
+from ingest import clean_log, status_cols, status_mask
+
+LIVE_SUFFIXES = (".csv", ".jsonl", ".json")
+
+# Alert rapid fire terakhir yang disimpan (yang lebih lama dibuang)
+ALERT_LIMIT = 500
+
+# Batas hit KPI (sama dengan kpi_summary): >1x repeat, >5x high risk
+HIGH_RISK_HITS = 5
+
+# Request yang datang terlambat (CreatedDate lebih lama dari request terakhir NIK yang sama)
+# masih dibandingkan dengan request sekitarnya selama selisihnya tidak lebih dari ini
+LATE_TOLERANCE_SEC = 15 * 60
+
+# Byte awal file yang dipakai sebagai sidik jari (deteksi file diganti / rotasi)
+FINGERPRINT_BYTES = 256
+
+
+# ======================
+# TAIL
+# ======================
+class LogTail:
+    """New complete lines of ``path`` (one file, or every CSV/JSON-lines file in a directory) since the last ``read``.
+
+    Byte offsets are kept per file; a trailing line without newline is left
+    for the next read. A file that shrinks, gets a new inode or whose first
+    bytes change (truncated, rotated, rewritten) is read again from the
+    start. Files starting with ``.`` or ``_`` (e.g. a writer's temp file)
+    are skipped. In a drop directory a file that was read to its end while
+    a newer file (by name) exists is finished and never opened again, so a
+    poll costs the new files, not the whole history.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.offsets = {}
+        self.headers = {}
+        self.identities = {}
+        self.finished = set()
+
+    def files(self):
+        if not self.path.is_dir():
+            return [self.path] if self.path.exists() else []
+        return sorted(
+            p for p in self.path.iterdir()
+            if p.suffix.lower() in LIVE_SUFFIXES and not p.name.startswith((".", "_"))
+        )
+
+    def _same_file(self, path, f, stat):
+        known = self.identities.get(path)
+        if known is None:
+            return False
+        inode, fingerprint = known
+        if inode != (stat.st_dev, stat.st_ino) or stat.st_size < self.offsets.get(path, 0):
+            return False
+        f.seek(0)
+        return f.read(len(fingerprint)) == fingerprint
+
+    def _read_file(self, path):
+        with open(path, "rb") as f:
+            stat = os.fstat(f.fileno())
+            if not self._same_file(path, f, stat):
+                # File baru / di-truncate / diganti: baca ulang dari awal
+                self.offsets.pop(path, None)
+                self.headers.pop(path, None)
+                self.identities.pop(path, None)
+            offset = self.offsets.get(path, 0)
+            f.seek(offset)
+            chunk = f.read()
+        end = chunk.rfind(b"\n") + 1
+        if end == 0:
+            return None
+        if path not in self.identities:
+            self.identities[path] = ((stat.st_dev, stat.st_ino), chunk[:min(end, FINGERPRINT_BYTES)])
+        self.offsets[path] = offset + end
+        chunk = chunk[:end]
+
+        if path.suffix.lower() != ".csv":
+            return pd.read_json(io.BytesIO(chunk), lines=True, dtype={"Nik": str})
+        if path not in self.headers:
+            header, _, chunk = chunk.partition(b"\n")
+            self.headers[path] = [c.strip() for c in next(csv.reader([header.decode("utf-8-sig")]))]
+        if not chunk.strip():
+            return None
+        return pd.read_csv(io.BytesIO(chunk), header=None, names=self.headers[path], dtype={"Nik": str})
+
+    def _finish(self, path):
+        self.finished.add(path.name)
+        self.offsets.pop(path, None)
+        self.headers.pop(path, None)
+        self.identities.pop(path, None)
+
+    def read(self):
+        """Rows appended since the previous call (empty frame if none)."""
+        files = [p for p in self.files() if p.name not in self.finished]
+        drop_dir = self.path.is_dir()
+        frames = []
+        for i, p in enumerate(files):
+            frame = self._read_file(p)
+            if frame is not None and len(frame):
+                frames.append(frame)
+            if drop_dir and i < len(files) - 1 and self.offsets.get(p) == p.stat().st_size:
+                # Writer sudah pindah ke file yang lebih baru: file ini selesai
+                self._finish(p)
+        if not frames:
+            return pd.DataFrame()
+        return pd.concat(frames, ignore_index=True)
+
+
+# ======================
+# ONLINE COUNTERS
+# ======================
+class LiveCounters:
+    """Running KPI counters over every batch seen so far (``update`` per batch, never the full history).
+
+    Rapid fire keeps, per NIK, the request times of the last
+    ``late_tolerance_sec`` seconds (plus the one before), so a request that
+    arrives out of order is compared with its real neighbours and
+    ``rapid_hits`` equals ``analytics.rapid_fire`` on the whole history.
+    A request older than that window is counted in ``late_dropped`` and not
+    compared.
+    """
+
+    def __init__(self, cols=status_cols, late_tolerance_sec=LATE_TOLERANCE_SEC):
+        self.cols = cols
+        self.late_tolerance = pd.Timedelta(seconds=late_tolerance_sec).value
+        self.total_requests = 0
+        self.nik_hits = {}
+        self.nik_hit_1 = 0
+        self.nik_hit_gt1 = 0
+        self.high_risk_nik = 0
+        self.sesuai_cells = 0
+        self.cells = 0
+        self.hourly = np.zeros(24, dtype=np.int64)
+        self.sources = {}
+        self.recent = {}
+        self.pruned = set()
+        self.rapid_hits = 0
+        self.late_dropped = 0
+        self.alerts = deque(maxlen=ALERT_LIMIT)
+        self.first_ts = None
+        self.last_ts = None
+        # update dan view bisa jalan di thread session yang berbeda
+        self._lock = threading.Lock()
+
+    def _count_niks(self, niks):
+        for nik, n in niks.value_counts().items():
+            old = self.nik_hits.get(nik, 0)
+            new = old + n
+            self.nik_hits[nik] = new
+            # Pindah bucket hit 1x / >1x / >5x sesuai perubahan hit NIK ini
+            self.nik_hit_1 += (new == 1) - (old == 1)
+            self.nik_hit_gt1 += (new > 1) - (old > 1)
+            self.high_risk_nik += (new > HIGH_RISK_HITS) - (old > HIGH_RISK_HITS)
+
+    def _rapid_fire(self, batch):
+        # Sisipkan tiap request ke daftar waktu (ns) per NIK yang terurut; request yang datang
+        # terlambat mengubah jarak ke request sesudahnya, jadi hitung selisih (baru - lama)
+        d = batch[batch["Nik"].notna() & batch["CreatedDate"].notna()]
+        d = d.sort_values(["Nik", "CreatedDate"], kind="stable")
+        limit = pd.Timedelta(seconds=RAPID_FIRE_SEC).value
+
+        def rapid(a, b):
+            return a is not None and b is not None and b - a < limit
+
+        for nik, ts, app in zip(d["Nik"], d["CreatedDate"], d["SourceApps"]):
+            t = ts.value
+            times = self.recent.setdefault(nik, [])
+            if nik in self.pruned and t < times[0]:
+                self.late_dropped += 1
+                continue
+            i = bisect.bisect_right(times, t)
+            prev = times[i - 1] if i else None
+            nxt = times[i] if i < len(times) else None
+            times.insert(i, t)
+            self.rapid_hits += rapid(prev, t) + rapid(t, nxt) - rapid(prev, nxt)
+            if rapid(prev, t):
+                self.alerts.append({"Nik": nik, "CreatedDate": ts, "SourceApps": app, "Time_Diff": (t - prev) / 1e9})
+
+        for nik in d["Nik"].unique():
+            times = self.recent[nik]
+            # Buang waktu di luar toleransi, sisakan satu sebelum batas sebagai pembanding
+            drop = max(bisect.bisect_left(times, times[-1] - self.late_tolerance) - 1, 0)
+            if drop:
+                del times[:drop]
+                self.pruned.add(nik)
+
+    def update(self, batch):
+        """Fold one cleaned batch (see ``ingest.clean_log``) into the counters."""
+        if batch.empty:
+            return
+        batch = batch.assign(Nik=batch["Nik"].astype("string"))
+        cols = [c for c in self.cols if c in batch.columns]
+        sesuai = int(popcount(status_mask(batch, "Sesuai", cols)).sum())
+        created = batch["CreatedDate"].dropna()
+
+        with self._lock:
+            self.total_requests += len(batch)
+            self._count_niks(batch["Nik"].dropna())
+            self.sesuai_cells += sesuai
+            self.cells += len(batch) * len(cols)
+
+            self.hourly += np.bincount(created.dt.hour, minlength=24)
+            for src, n in batch["SourceResult"].value_counts().items():
+                self.sources[src] = self.sources.get(src, 0) + int(n)
+            if len(created):
+                self.first_ts = created.min() if self.first_ts is None else min(self.first_ts, created.min())
+                self.last_ts = created.max() if self.last_ts is None else max(self.last_ts, created.max())
+
+            self._rapid_fire(batch)
+
+    # ======================
+    # VIEWS (format sama dengan analytics)
+    # ======================
+    # Dibaca di bawah lock: poll dari session lain bisa sedang mengubah dict / deque yang sama
+    def kpi(self):
+        with self._lock:
+            return kpi_from_counts(
+                total_requests=self.total_requests,
+                total_nik=len(self.nik_hits),
+                nik_hit_1=self.nik_hit_1,
+                nik_hit_gt1=self.nik_hit_gt1,
+                high_risk_nik=self.high_risk_nik,
+                data_quality=self.sesuai_cells / self.cells if self.cells else 0,
+            )
+
+    def hourly_table(self):
+        """Same table as ``analytics.hourly_traffic``."""
+        with self._lock:
+            hourly = self.hourly.copy()
+        hours = np.flatnonzero(hourly)
+        return flag_hourly_anomalies(pd.DataFrame({
+            "Hour": hours.astype(np.int8),
+            "Total_Request": hourly[hours],
+        }))
+
+    def source_table(self):
+        with self._lock:
+            sources = list(self.sources.items())
+        return pd.DataFrame(sorted(sources, key=lambda kv: -kv[1]), columns=["SourceResult", "Total_Requests"])
+
+    def alert_table(self):
+        """Latest rapid-fire requests first."""
+        with self._lock:
+            alerts = list(reversed(self.alerts))
+        return pd.DataFrame(alerts, columns=["Nik", "CreatedDate", "SourceApps", "Time_Diff"])
+
+
+class LiveMonitor:
+    """``LogTail`` + ``LiveCounters``; one instance can be polled by several sessions."""
+
+    def __init__(self, path):
+        self.tail = LogTail(path)
+        self.counters = LiveCounters()
+        self.polls = 0
+        self.last_batch = 0
+        self.last_poll = None
+        self._lock = threading.Lock()
+
+    def poll(self):
+        """Read and count the rows appended since the last poll; returns the number of new rows."""
+        with self._lock:
+            batch = self.tail.read()
+            if len(batch):
+                self.counters.update(clean_log(batch))
+            self.polls += 1
+            self.last_batch = len(batch)
+            self.last_poll = pd.Timestamp.now()
+            return self.last_batch
+
+
+# ======================
+# WRITER (test lokal)
+# ======================
+def _write_batch(df, path, batch_no):
+    if path.is_dir():
+        # Drop directory: satu file per batch, ditulis ke temp lalu rename (tail tidak baca file setengah jadi)
+        target = path / f"batch_{time.time_ns()}_{batch_no:06d}.jsonl"
+        tmp = path / f".{target.name}.tmp"
+        df.to_json(tmp, orient="records", lines=True, date_format="iso")
+        os.replace(tmp, target)
+    elif path.suffix.lower() == ".csv":
+        df.to_csv(path, mode="a", header=not path.exists() or path.stat().st_size == 0, index=False)
+    else:
+        with open(path, "a") as f:
+            f.write(df.to_json(orient="records", lines=True, date_format="iso"))
+
+
+def write(path, rows, every, batches=None, seed=0):
+    """Append ``rows`` synthetic requests stamped "now" to ``path`` every ``every`` seconds."""
+    from synthetic import generate_log
+
+    path = Path(path)
+    batch_no = 0
+    while batches is None or batch_no < batches:
+        df = generate_log(rows, days=1, seed=seed + batch_no)
+        now = pd.Timestamp.now().floor("s")
+        df["CreatedDate"] = now - (df["CreatedDate"].max() - df["CreatedDate"]) / (24 * 3600) * every
+        df["Nik"] = df["Nik"].astype(str)
+        _write_batch(df, path, batch_no)
+        batch_no += 1
+        print(f"batch {batch_no}: {rows} rows → {path}")
+        if batches is None or batch_no < batches:
+            time.sleep(every)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Synthetic live log writer for the dashboard live mode.")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    w = sub.add_parser("write", help="Append synthetic rows to a CSV/JSON-lines file or drop directory")
+    w.add_argument("path")
+    w.add_argument("--rows", type=int, default=100, help="Rows per batch")
+    w.add_argument("--every", type=float, default=2.0, help="Seconds between batches")
+    w.add_argument("--batches", type=int, help="Stop after this many batches (default: run until Ctrl+C)")
+    w.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    try:
+        write(args.path, args.rows, args.every, args.batches, args.seed)
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,405 @@
+"""Partitioned on-disk log store: one Parquet file per month (or day).
+
+    python log_store.py "LogDUKCAPIL_2025 (1).xlsx"                  # ingest export → log_store/
+    python log_store.py export_2025-06.csv --store log_store --granularity day
+    python log_store.py "LogDUKCAPIL_2025 (1).xlsx" --append                # refresh harian: hanya baris baru
+
+Every export is cleaned and encoded once (same as the snapshot in
+``ingest.load_log``) and split by CreatedDate into partitions. Only the
+partitions covered by a new export are rewritten: its rows replace stored
+rows with the same ``Id`` and are added otherwise. ``_manifest.json``
+keeps rows, bytes and the CreatedDate range of each partition, so a date
+filter only opens the partitions that overlap it.
+
+``--append`` is the daily refresh for full re-dumps: only rows past the
+``Id`` / ``CreatedDate`` high-water marks are encoded and appended (dedup
+on ``Id``), and the per-NIK profile and daily/hourly aggregates under
+``_agg/`` are updated from those rows instead of recomputed.
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from datetime import date
+from pathlib import Path
+
+import pandas as pd
+import pyarrow.parquet as pq
+
+from analytics import (
+    daily_trend, flag_hourly_anomalies, merge_nik_profiles, nik_app_hits, nik_profile,
+    peak_hour, weekday_table
+)
+from ingest import SNAPSHOT_VERSION, clean_log, concat_logs, encode_log, read_raw, sort_by_time, write_snapshot
+
+STORE_DIR = "log_store"
+MANIFEST = "_manifest.json"
+
+# Nama partisi dari CreatedDate; urutan nama = urutan waktu
+PARTITION_FORMATS = {"month": "%Y-%m", "day": "%Y-%m-%d"}
+
+# Baris tanpa CreatedDate valid (tidak pernah lolos filter tanggal)
+UNDATED = "undated"
+
+# Agregat inkremental; diawali "_" supaya tidak ikut terbaca sebagai partisi (lihat duckdb_backend.parquet_files)
+AGG_DIR = "_agg"
+AGGREGATES = ["nik_profile", "nik_apps", "daily", "hourly"]
+
+
+class LogStore:
+    """Partitioned log under ``root`` (see module docstring)."""
+
+    def __init__(self, root=STORE_DIR, granularity="month"):
+        self.root = Path(root)
+        manifest = self._read_manifest()
+        if manifest and manifest.get("version") == SNAPSHOT_VERSION:
+            self.granularity = manifest["granularity"]
+            self.partitions = manifest["partitions"]
+        else:
+            # Store baru (atau format lama: partisi ditulis ulang saat ingest berikutnya)
+            if granularity not in PARTITION_FORMATS:
+                raise ValueError(f"granularity harus salah satu dari {sorted(PARTITION_FORMATS)}")
+            self.granularity = granularity
+            self.partitions = {}
+
+    # ======================
+    # MANIFEST
+    # ======================
+    def _read_manifest(self):
+        path = self.root / MANIFEST
+        return json.loads(path.read_text()) if path.exists() else None
+
+    def _write_manifest(self):
+        self.root.mkdir(parents=True, exist_ok=True)
+        path = self.root / MANIFEST
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(json.dumps({
+            "version": SNAPSHOT_VERSION,
+            "granularity": self.granularity,
+            "partitions": dict(sorted(self.partitions.items())),
+        }, indent=1))
+        os.replace(tmp, path)
+
+    def fingerprint(self):
+        """Changes whenever a partition is added or rewritten."""
+        key = json.dumps([self.granularity, self.partitions], sort_keys=True)
+        return hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+
+    def __len__(self):
+        return sum(meta["rows"] for meta in self.partitions.values())
+
+    def date_bounds(self):
+        """``(first, last)`` CreatedDate day stored; ``(None, None)`` when no row has a valid date."""
+        dated = [meta for name, meta in self.partitions.items() if name != UNDATED and meta["min"]]
+        if not dated:
+            return None, None
+        return (
+            min(date.fromisoformat(meta["min"][:10]) for meta in dated),
+            max(date.fromisoformat(meta["max"][:10]) for meta in dated),
+        )
+
+    def source_options(self):
+        return sorted(set().union(*(meta["sources"] for meta in self.partitions.values())))
+
+    # ======================
+    # PRUNING
+    # ======================
+    def partitions_for(self, start=None, end=None):
+        """Names (time order) of the partitions overlapping ``start``..``end``; all of them when both are None."""
+        if start is None and end is None:
+            return sorted(self.partitions)
+        names = []
+        for name, meta in sorted(self.partitions.items()):
+            if name == UNDATED:
+                continue
+            if end is not None and date.fromisoformat(meta["min"][:10]) > end:
+                continue
+            if start is not None and date.fromisoformat(meta["max"][:10]) < start:
+                continue
+            names.append(name)
+        return names
+
+    def files(self, names=None):
+        names = sorted(self.partitions) if names is None else names
+        return [self.root / self.partitions[name]["file"] for name in names]
+
+    def read(self, start=None, end=None, columns=None):
+        """Log rows of the partitions overlapping ``start``..``end`` (whole partitions, time-sorted)."""
+        return self.read_partitions(self.partitions_for(start, end), columns)
+
+    def read_partitions(self, names, columns=None):
+        if not self.partitions:
+            raise FileNotFoundError(f"Log store '{self.root}' masih kosong")
+        if not names:
+            # Range di luar data: frame kosong dengan skema (dan dtype) yang sama
+            schema = pq.read_schema(self.files()[0])
+            return schema.empty_table().to_pandas()[columns or schema.names]
+        # Partisi urut waktu & masing-masing sudah terurut → cukup disambung (undated di akhir)
+        names = sorted(names, key=lambda name: (name == UNDATED, name))
+        return concat_logs([pd.read_parquet(path, columns=columns) for path in self.files(names)])
+
+    # ======================
+    # INGEST
+    # ======================
+    def partition_names(self, created):
+        """Partition name per row of a CreatedDate series (``UNDATED`` for NaT)."""
+        return created.dt.strftime(PARTITION_FORMATS[self.granularity]).fillna(UNDATED)
+
+    def _write_partition(self, name, part):
+        if "Id" in part.columns:
+            # Urutan dalam detik yang sama ikut Id, tidak tergantung urutan ingest
+            part = part.sort_values(["CreatedDate", "Id"], kind="stable", na_position="last").reset_index(drop=True)
+        else:
+            part = sort_by_time(part)
+        file = f"{name}.parquet"
+        part = write_snapshot(part, self.root / file)
+        created = part["CreatedDate"].dropna()
+        self.partitions[name] = {
+            "file": file,
+            "rows": len(part),
+            "bytes": (self.root / file).stat().st_size,
+            "min": created.min().isoformat() if len(created) else None,
+            "max": created.max().isoformat() if len(created) else None,
+            "sources": sorted(str(s) for s in part["SourceResult"].dropna().unique()),
+            "max_id": int(part["Id"].max()) if "Id" in part.columns and part["Id"].notna().any() else None,
+        }
+        return part
+
+    def _merge(self, name, part):
+        if name not in self.partitions or "Id" not in part.columns:
+            return part
+        stored = pd.read_parquet(self.root / self.partitions[name]["file"])
+        # Export ulang (re-dump) menimpa baris dengan Id yang sama
+        stored = stored[~stored["Id"].isin(part["Id"])]
+        return concat_logs([stored, part]) if len(stored) else part
+
+    def write(self, df):
+        """Merge the encoded log ``df`` into the partitions it covers; returns their names."""
+        names = self.partition_names(df["CreatedDate"])
+        parts = {}
+        for name, part in df.groupby(names, sort=True):
+            parts[name] = self._write_partition(name, self._merge(name, part))
+        # Baris lama bisa berubah/terhapus → agregat dibangun ulang; partisi yang baru ditulis tidak dibaca lagi
+        self.rebuild_aggregates(parts)
+        self._write_manifest()
+        return list(parts)
+
+    def ingest(self, path):
+        """Clean, encode and write one export (.xlsx/.csv/.parquet); returns ``(partitions, n_invalid_nik)``."""
+        df, n_invalid = encode_log(clean_log(read_raw(path)))
+        return self.write(df), n_invalid
+
+    # ======================
+    # INCREMENTAL APPEND
+    # ======================
+    def high_water(self):
+        """``(max Id, max CreatedDate)`` stored so far (None for an empty store)."""
+        ids = [meta["max_id"] for meta in self.partitions.values() if meta.get("max_id") is not None]
+        created = [meta["max"] for meta in self.partitions.values() if meta["max"]]
+        return (max(ids) if ids else None), (pd.Timestamp(max(created)) if created else None)
+
+    def unseen(self, df):
+        """Rows of a (raw or encoded) export at/after the high-water marks, de-duplicated on Id.
+
+        Assumes Id and CreatedDate grow with time, as in the DUKCAPIL
+        exports; backfilled old rows need a full ``ingest``.
+        """
+        max_id, max_created = self.high_water()
+        if max_created is None:
+            keep = pd.Series(True, index=df.index)
+        else:
+            # >= : baris di detik yang sama bisa baru; duplikat dibuang lewat Id saat merge
+            keep = pd.to_datetime(df["CreatedDate"], errors="coerce") >= max_created
+            if max_id is not None and "Id" in df.columns:
+                keep |= pd.to_numeric(df["Id"], errors="coerce") > max_id
+        new = df[keep.to_numpy()]
+        return new.drop_duplicates("Id", keep="last") if "Id" in new.columns else new
+
+    def append(self, df):
+        """Append the rows of the encoded log ``df`` not yet stored; returns ``(partitions, n_appended)``."""
+        new = self.unseen(df)
+        # Store baru / belum punya agregat: dibangun penuh sekali setelah append
+        incremental = self.aggregates() is not None
+
+        added, parts = [], {}
+        names = self.partition_names(new["CreatedDate"])
+        for name, part in new.groupby(names, sort=True):
+            if name in self.partitions:
+                stored = pd.read_parquet(self.root / self.partitions[name]["file"])
+                if "Id" in part.columns:
+                    part = part[~part["Id"].isin(stored["Id"])]
+                if not len(part):
+                    continue
+                merged = concat_logs([stored, part])
+            else:
+                merged = part
+            parts[name] = self._write_partition(name, merged)
+            added.append(part)
+
+        if added:
+            if incremental:
+                self._update_aggregates(concat_logs(added), list(parts.values()))
+            else:
+                self.rebuild_aggregates(parts)
+            self._write_manifest()
+        return list(parts), sum(len(part) for part in added)
+
+    def append_export(self, path):
+        """Read one full export and append only its new rows; returns ``(partitions, n_appended, n_invalid_nik)``."""
+        raw = read_raw(path).rename(columns=str.strip)
+        # Filter high-water sebelum clean/encode: hanya baris baru yang di-parse lebih lanjut
+        df, n_invalid = encode_log(clean_log(self.unseen(raw)))
+        touched, n_appended = self.append(df)
+        return touched, n_appended, n_invalid
+
+    # ======================
+    # AGGREGATES (per-NIK profile, daily, hourly)
+    # ======================
+    @staticmethod
+    def _visible(df):
+        # Baris yang lolos filter dashboard default (tanggal & SourceResult terisi)
+        return df[df["CreatedDate"].notna() & df["SourceResult"].notna()]
+
+    @staticmethod
+    def _hourly(df):
+        day = df["CreatedDate"].dt.normalize().rename("Date")
+        return df.groupby([day, "Hour"]).size().reset_index(name="Total_Request")
+
+    def _agg_path(self, name):
+        return self.root / AGG_DIR / f"{name}.parquet"
+
+    def aggregates(self):
+        """Dict of the stored aggregate tables, or None when they have not been built."""
+        if not all(self._agg_path(name).exists() for name in AGGREGATES):
+            return None
+        tables = {name: pd.read_parquet(self._agg_path(name)) for name in AGGREGATES}
+        tables["nik_profile"] = tables["nik_profile"].set_index("Nik")
+        return tables
+
+    def _write_aggregates(self, tables):
+        for name in AGGREGATES:
+            table = tables[name].reset_index() if name == "nik_profile" else tables[name]
+            write_snapshot(table, self._agg_path(name))
+
+    def rebuild_aggregates(self, parts=None):
+        """Recompute every aggregate from all dated partitions.
+
+        ``parts`` maps partition names to their rows already in memory (as
+        just written by ``write``); only the other partitions are read.
+        """
+        parts = parts or {}
+        names = sorted(name for name in self.partitions if name != UNDATED)
+        if not names:
+            return
+        df = self._visible(concat_logs([
+            parts[name] if name in parts else pd.read_parquet(path)
+            for name, path in zip(names, self.files(names))
+        ]))
+        self._write_aggregates({
+            "nik_profile": nik_profile(df),
+            "nik_apps": nik_app_hits(df),
+            "daily": daily_trend(df),
+            "hourly": self._hourly(df),
+        })
+
+    def _update_aggregates(self, added, parts):
+        tables = self.aggregates()
+        added = self._visible(added)
+        if not len(added):
+            return
+
+        # Profil per NIK: gabung profil lama + profil baris baru
+        apps = concat_logs([tables["nik_apps"], nik_app_hits(added)])
+        apps = apps.groupby(["Nik", "SourceApps"], observed=True)["Hits"].sum().reset_index()
+        old, new = tables["nik_profile"], nik_profile(added)
+        profile = merge_nik_profiles(old, new, apps)
+
+        # NIK dengan baris baru yang lebih awal dari Last_Seen lama: interval minimum dihitung ulang dari store
+        both = old.index.intersection(new.index)
+        late = both[new.loc[both, "First_Seen"] < old.loc[both, "Last_Seen"]]
+        if len(late):
+            rows = concat_logs([
+                pd.read_parquet(path, filters=[("Nik", "in", late.tolist())])
+                for path in self.files([name for name in self.partitions if name != UNDATED])
+            ])
+            profile.loc[late, "Min_Interval_Sec"] = nik_profile(self._visible(rows))["Min_Interval_Sec"]
+
+        # Harian/per jam: hanya hari yang kedatangan baris baru, dihitung ulang dari partisinya
+        days = added["CreatedDate"].dt.normalize().unique()
+        rows = self._visible(concat_logs(parts))
+        rows = rows[rows["CreatedDate"].dt.normalize().isin(days)]
+        daily = tables["daily"]
+        hourly = tables["hourly"]
+        tables.update({
+            "nik_profile": profile,
+            "nik_apps": apps,
+            "daily": pd.concat([daily[~daily["Date"].isin(days)], daily_trend(rows)]).sort_values("Date", ignore_index=True),
+            "hourly": pd.concat([hourly[~hourly["Date"].isin(days)], self._hourly(rows)]).sort_values(["Date", "Hour"], ignore_index=True),
+        })
+        self._write_aggregates(tables)
+
+    def seed_results(self, sources, start, end):
+        """Dashboard bundle entries answered from the aggregates for the view (sources, start..end).
+
+        Only views with every source selected qualify; the per-NIK profile
+        additionally needs the full date range.
+        """
+        tables = self.aggregates() if self.partitions else None
+        if tables is None or not set(self.source_options()) <= set(sources):
+            return {}
+
+        lo, hi = pd.Timestamp(start), pd.Timestamp(end)
+        daily = tables["daily"][tables["daily"]["Date"].between(lo, hi)].reset_index(drop=True)
+        hourly = tables["hourly"][tables["hourly"]["Date"].between(lo, hi)]
+        hourly = flag_hourly_anomalies(hourly.groupby("Hour")["Total_Request"].sum().reset_index())
+
+        results = {
+            "sections": ["TREND", "PEAK TIME"],
+            "daily": daily,
+            "hourly": hourly,
+            "peak_hour": peak_hour(hourly) if len(hourly) else None,
+            "weekday": weekday_table(daily.groupby(daily["Date"].dt.weekday)["Total"].sum()),
+        }
+        date_min, date_max = self.date_bounds()
+        if date_min is not None and start <= date_min and end >= date_max:
+            results["profile"] = tables["nik_profile"]
+        return results
+
+
+# ======================
+# CLI
+# ======================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ingest a log export into the partitioned log store.")
+    parser.add_argument("export", help="Log export (.xlsx, .csv or .parquet)")
+    parser.add_argument("--store", default=STORE_DIR, help=f"Store directory (default: {STORE_DIR})")
+    parser.add_argument("--granularity", choices=sorted(PARTITION_FORMATS), default="month",
+                        help="Partition size for a new store (default: month)")
+    parser.add_argument("--append", action="store_true",
+                        help="Only append rows past the Id/CreatedDate high-water marks and update aggregates incrementally")
+    args = parser.parse_args(argv)
+
+    store = LogStore(args.store, args.granularity)
+    start = time.perf_counter()
+    if args.append:
+        touched, n_appended, n_invalid = store.append_export(args.export)
+        print(f"{n_appended:,} new rows")
+    else:
+        touched, n_invalid = store.ingest(args.export)
+
+    for name in touched:
+        meta = store.partitions[name]
+        print(f"{name:<12}{meta['rows']:>12,} rows{meta['bytes'] / 1e6:>10.1f} MB")
+    print(
+        f"{len(touched)} partition(s) written → {store.root} "
+        f"({len(store):,} rows in {len(store.partitions)} partitions, {time.perf_counter() - start:.1f} s)"
+    )
+    if n_invalid:
+        print(f"warning: {n_invalid:,} NIK tidak valid (bukan 16 digit)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+
+from ingest import NIK_DIGITS
+
+
+class NikIndex:
+    """Sorted NIK → row-position index for the drill-down.
+
+    Built once per log: the row positions are argsorted by NIK (stable, so
+    each NIK keeps the log's time order), and ``keys``/``starts`` mark where
+    each distinct NIK's run begins. A lookup or prefix search is then a
+    ``searchsorted`` on ``keys`` instead of a scan over the whole column.
+
+    Encoded logs (int64 Nik, see ``ingest.encode_nik``) use the integer
+    keys directly: a prefix of a 16-digit number is a numeric range. Logs
+    with any NIK that is not a 16-digit number (``encode_nik`` then leaves
+    the column as is, possibly still integer) fall back to sorted string keys.
+    """
+
+    def __init__(self, nik):
+        present = np.flatnonzero(nik.notna().to_numpy())
+        self.numeric = False
+        if pd.api.types.is_integer_dtype(nik):
+            values = nik.to_numpy(dtype="int64", na_value=0)
+            # Jalur numerik hanya kalau semua NIK 16 digit (prefix = range angka)
+            nik_values = values[present]
+            self.numeric = bool(((nik_values >= 10 ** (NIK_DIGITS - 1)) & (nik_values < 10 ** NIK_DIGITS)).all())
+        if not self.numeric:
+            values = nik.astype(str).to_numpy(dtype=object)
+
+        order = present[np.argsort(values[present], kind="stable")]
+        self.keys, self.starts = np.unique(values[order], return_index=True)
+        self.ends = np.append(self.starts[1:], len(order))
+        self.order = order
+
+    def __len__(self):
+        return len(self.keys)
+
+    def _key(self, nik):
+        if not self.numeric:
+            return str(nik)
+        text = str(nik).strip()
+        return int(text) if text.isdigit() and len(text) == NIK_DIGITS else None
+
+    def rows(self, nik):
+        """Row positions (time order) of one NIK; empty if unknown."""
+        key = self._key(nik)
+        if key is None:
+            return self.order[:0]
+        i = np.searchsorted(self.keys, key)
+        if i == len(self.keys) or self.keys[i] != key:
+            return self.order[:0]
+        return self.order[self.starts[i]:self.ends[i]]
+
+    def _prefix_range(self, prefix):
+        prefix = str(prefix).strip()
+        if self.numeric:
+            if not prefix.isdigit() or len(prefix) > NIK_DIGITS:
+                return 0, 0
+            scale = 10 ** (NIK_DIGITS - len(prefix))
+            lo, hi = int(prefix) * scale, (int(prefix) + 1) * scale
+            return np.searchsorted(self.keys, lo), np.searchsorted(self.keys, hi)
+        return (
+            np.searchsorted(self.keys, prefix),
+            np.searchsorted(self.keys, prefix + "\U0010ffff")
+        )
+
+    def count(self, prefix):
+        """Number of distinct NIKs starting with ``prefix``."""
+        lo, hi = self._prefix_range(prefix)
+        return int(hi - lo)
+
+    def search(self, prefix, limit=20):
+        """First ``limit`` distinct NIKs (as strings, ascending) starting with ``prefix``."""
+        lo, hi = self._prefix_range(prefix)
+        return [str(k) for k in self.keys[lo:min(hi, lo + limit)]]
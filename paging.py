@@ -0,0 +1,91 @@
+import itertools
+import tempfile
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+PAGE_SIZES = [20, 50, 100, 500]
+
+# Baris per chunk saat export: file ditulis bertahap, frame penuh tidak pernah di-copy/di-serialize sekaligus
+EXPORT_CHUNK_ROWS = 100_000
+
+
+def n_pages(n_rows, page_size):
+    return max(1, -(-n_rows // page_size))
+
+
+def filter_columns(df, filters):
+    """Rows whose column text contains the given value (case-insensitive); ``filters`` maps column → text."""
+    mask = np.ones(len(df), dtype=bool)
+    for col, text in filters.items():
+        if not text:
+            continue
+        values = df[col]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            # Cocokkan kategori (sedikit), lalu petakan lewat kode; kode -1 (NaN) jatuh ke False terakhir
+            hit = values.cat.categories.astype(str).str.contains(text, case=False, regex=False)
+            mask &= np.append(hit, False)[values.cat.codes.to_numpy()]
+        else:
+            mask &= values.astype(str).str.contains(text, case=False, regex=False).to_numpy()
+    return df if mask.all() else df[mask]
+
+
+def sort_positions(df, column, ascending=True):
+    """Row positions of ``df`` ordered by ``column`` (stable, missing last); None keeps the current order."""
+    if column is None:
+        return None
+    values = df[column].reset_index(drop=True)
+    if ascending and values.is_monotonic_increasing:
+        return None  # mis. CreatedDate pada log terurut: tidak perlu sort
+    return values.sort_values(ascending=ascending, kind="stable", na_position="last").index.to_numpy()
+
+
+def get_page(df, page, page_size, order=None):
+    """Rows of page ``page`` (0-based); only these rows are copied out of ``df``."""
+    start = page * page_size
+    stop = min(start + page_size, len(df))
+    return df.iloc[start:stop] if order is None else df.iloc[order[start:stop]]
+
+
+def _chunks(df, order, chunk_rows):
+    for start in range(0, len(df), chunk_rows):
+        yield get_page(df, start // chunk_rows, chunk_rows, order)
+
+
+def _parquet_schema(df, first_chunk):
+    # Skema dari chunk pertama yang berisi: dari frame kosong kolom object jadi tipe null
+    sample = first_chunk if first_chunk is not None and len(first_chunk) else df.iloc[:0]
+    schema = pa.Schema.from_pandas(sample, preserve_index=False)
+    for i, field in enumerate(schema):
+        if pa.types.is_null(field.type):
+            # Kolom object yang kosong di chunk pertama: anggap teks
+            schema = schema.set(i, field.with_type(pa.string()))
+    return schema
+
+
+def export_file(df, fmt="csv", order=None, chunk_rows=EXPORT_CHUNK_ROWS):
+    """``df`` (optionally in ``order``) as CSV or Parquet bytes for ``st.download_button``.
+
+    The file is built chunk by chunk in a temp file (one Parquet row group
+    per chunk), so pandas/Arrow never convert the whole frame at once; the
+    result is read back as ``bytes`` because Streamlit holds the full
+    payload in memory anyway.
+    """
+    with tempfile.TemporaryFile() as f:
+        chunks = _chunks(df, order, chunk_rows)
+        if fmt == "parquet":
+            first = next(chunks, None)
+            schema = _parquet_schema(df, first)
+            if first is not None:
+                chunks = itertools.chain([first], chunks)
+            with pq.ParquetWriter(f, schema) as writer:
+                for chunk in chunks:
+                    writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+        else:
+            df.iloc[:0].to_csv(f, index=False)
+            for chunk in chunks:
+                chunk.to_csv(f, header=False, index=False)
+        f.seek(0)
+        return f.read()
@@ -0,0 +1,171 @@
+"""Run independent dashboard sections in a process pool.
+
+The log is never pickled to the workers: each worker memory-maps the
+shared Arrow file of the snapshot (``ingest.read_shared``) once and
+filters it itself (a slice for a date range). The per-NIK profile most
+sections need is built once in the parent and handed over the same way,
+as a temporary Arrow file. Only the (small) section results travel back.
+
+    pool = SectionPool(workers=8)
+    pool.compute_sections(df_f, PARALLEL_SECTIONS, results, shared_path, sources, start, end)
+
+Workers are spawned once, all at construction, with ``__main__`` hidden
+behind an empty module so they do not re-run the dashboard script.
+Enabled on POSIX only (``SUPPORTED``).
+"""
+import multiprocessing
+import os
+import sys
+import tempfile
+import threading
+import time
+import types
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+
+from analytics import ANALYTICS_SECTIONS, PROFILE_FREE_SECTIONS, filter_log, nik_profile
+from ingest import read_shared, write_shared
+from profiling import section
+
+# Pool hanya diuji di POSIX; di Windows dashboard tetap sequential
+SUPPORTED = os.name == "posix"
+
+# Section yang saling independen (hanya butuh log terfilter + profile)
+PARALLEL_SECTIONS = [
+    "FRAUD SAME APP", "FRAUD STATUS INCONSISTENCY", "FRAUD RAPID FIRE", "FRAUD CROSS SOURCE",
+    "SOURCE PERFORMANCE", "TREND", "PEAK TIME", "STATUS RECAP", "REPEAT NIK", "KPI",
+]
+
+# ======================
+# WORKER
+# ======================
+# Log yang sudah di-memory-map di proses worker ini, per path file Arrow
+_frames = {}
+
+
+def _shared_frame(path):
+    if path not in _frames:
+        _frames.clear()  # versi log baru: mapping lama dilepas
+        _frames[path] = read_shared(path)
+    return _frames[path]
+
+
+def _ready(_):
+    return os.getpid()
+
+
+def _run_section(name, shared_path, profile_path, sources, start, end):
+    started = time.perf_counter()
+    df = filter_log(_shared_frame(shared_path), sources, start, end)
+    profile = read_shared(profile_path).set_index("Nik") if profile_path else None
+    return name, ANALYTICS_SECTIONS[name](df, profile), time.perf_counter() - started
+
+
+# ======================
+# POOL
+# ======================
+_main_lock = threading.Lock()
+
+
+@contextmanager
+def _hidden_main():
+    """Replace ``sys.modules["__main__"]`` with an empty module while workers are spawned.
+
+    Streamlit runs the dashboard script as ``__main__``; spawn would import
+    it again in every worker (``init_main_from_path``). A module without
+    ``__file__`` / ``__spec__`` gives the workers nothing to re-run.
+    """
+    with _main_lock:
+        main = sys.modules.get("__main__")
+        sys.modules["__main__"] = types.ModuleType("__main__")
+        try:
+            yield
+        finally:
+            if main is None:
+                del sys.modules["__main__"]
+            else:
+                sys.modules["__main__"] = main
+
+
+def _remove(paths):
+    """Delete ``paths``; return the ones that are still in use (a mapping open on Windows)."""
+    left = []
+    for path in paths:
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+        except OSError:
+            left.append(path)
+    return left
+
+
+class SectionPool:
+    """Process pool for ``analytics`` sections over a memory-mapped log.
+
+    Workers are started with ``spawn`` (safe next to the Streamlit server
+    threads), all at construction, and kept for reuse. Once a worker dies
+    (``BrokenProcessPool``, e.g. OOM-killed) the pool is shut down and the
+    error re-raised; the caller drops it and builds a new one.
+    """
+
+    def __init__(self, workers=None):
+        self.workers = workers or os.cpu_count() or 1
+        self._executor = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"))
+        self._stale = []  # file profile yang belum bisa dihapus
+        # Satu task per worker: executor spawn worker baru selama belum ada yang idle, jadi
+        # semua worker sudah jalan sebelum __main__ dikembalikan
+        with _hidden_main():
+            list(self._executor.map(_ready, range(self.workers)))
+
+    def warm_up(self, shared_path):
+        """Import the modules and map the log in every worker ahead of the first request."""
+        list(self._executor.map(_shared_frame, [str(shared_path)] * self.workers))
+
+    def shutdown(self):
+        self._executor.shutdown(cancel_futures=True)
+        self._stale = _remove(self._stale)
+
+    def compute_sections(self, df, names, results, shared_path, sources, start, end, profiler=None):
+        """``analytics.compute_sections`` with the pending ``names`` run in parallel.
+
+        ``df`` is the filtered log in the parent (used for the profile only);
+        the workers rebuild the same view from ``shared_path`` with
+        ``sources``/``start``/``end``.
+        """
+        done = results.setdefault("sections", [])
+        todo = [name for name in dict.fromkeys(names) if name not in done]
+        if not todo:
+            return results
+
+        if set(todo) - PROFILE_FREE_SECTIONS and results.get("profile") is None:
+            with section(profiler, "PROFILE", len(df)):
+                results["profile"] = nik_profile(df)
+
+        profile_path = None
+        try:
+            if set(todo) - PROFILE_FREE_SECTIONS:
+                fd, profile_path = tempfile.mkstemp(suffix=".arrow", prefix="ekyc_profile_")
+                os.close(fd)
+                write_shared(results["profile"].reset_index(), profile_path)
+
+            with section(profiler, "PARALLEL", len(df)):
+                futures = [
+                    self._executor.submit(_run_section, name, str(shared_path), profile_path, list(sources), start, end)
+                    for name in todo
+                ]
+                outputs = [f.result() for f in futures]
+        except BrokenProcessPool:
+            self.shutdown()
+            raise
+        finally:
+            # Semua task selesai, worker sudah melepas profile; yang masih terbuka dicoba lagi nanti
+            self._stale = _remove(self._stale + ([profile_path] if profile_path else []))
+
+        for name, out, seconds in outputs:
+            results.update(out)
+            done.append(name)
+            if profiler is not None:
+                profiler.record(name, seconds, rows=len(df))
+        return results
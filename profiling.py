@@ -0,0 +1,110 @@
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager, nullcontext
+from datetime import datetime, timezone
+
+import pandas as pd
+
+
+def peak_rss_bytes():
+    """Peak resident set size of this process, or None where ``resource`` is unavailable (Windows)."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux: KiB, macOS: bytes
+    return rss if sys.platform == "darwin" else rss * 1024
+
+
+def rss_bytes():
+    """Current resident set size; falls back to peak RSS where /proc is unavailable (None if neither is)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return peak_rss_bytes()
+
+
+class Profiler:
+    """Per-section wall time, rows processed and RSS delta for one dashboard run.
+
+    Use ``section()`` as a context manager, or ``mark()`` in top-to-bottom
+    script code: each mark closes the previous section and opens the next,
+    ``finish()`` closes the last one.
+    """
+
+    def __init__(self):
+        self.run_id = datetime.now(timezone.utc).isoformat(timespec="milliseconds")
+        self.records = []
+        self._open = None
+
+    def _record(self, name, phase, rows, start, rss_start):
+        rss_end = rss_bytes()
+        self.records.append({
+            "run_id": self.run_id,
+            "section": name,
+            "phase": phase,
+            "seconds": time.perf_counter() - start,
+            "rows": rows,
+            "mem_delta_mb": (rss_end - rss_start) / 1e6 if rss_start is not None and rss_end is not None else None,
+        })
+
+    def record(self, name, seconds, rows=None, phase="compute"):
+        """Add a section timed elsewhere (e.g. in a worker process); no memory delta."""
+        self.records.append({
+            "run_id": self.run_id,
+            "section": name,
+            "phase": phase,
+            "seconds": seconds,
+            "rows": rows,
+            "mem_delta_mb": 0.0,
+        })
+
+    @contextmanager
+    def section(self, name, rows=None, phase="compute"):
+        start, rss_start = time.perf_counter(), rss_bytes()
+        try:
+            yield
+        finally:
+            self._record(name, phase, rows, start, rss_start)
+
+    def mark(self, name, rows=None, phase="render"):
+        self.finish()
+        self._open = (name, phase, rows, time.perf_counter(), rss_bytes())
+
+    def finish(self):
+        if self._open is not None:
+            self._record(*self._open)
+            self._open = None
+
+    def to_frame(self):
+        return pd.DataFrame(self.records, columns=["run_id", "section", "phase", "seconds", "rows", "mem_delta_mb"])
+
+    def summary(self):
+        """One row per section (first-seen order) with compute/render ms, rows and memory delta."""
+        records = self.to_frame()
+        if records.empty:
+            return pd.DataFrame(columns=["Section", "Compute_ms", "Render_ms", "Rows", "Mem_Delta_MB"])
+
+        order = list(dict.fromkeys(records["section"]))
+        ms = records.pivot_table(index="section", columns="phase", values="seconds", aggfunc="sum") * 1000
+        out = pd.DataFrame({
+            "Compute_ms": ms["compute"] if "compute" in ms else 0.0,
+            "Render_ms": ms["render"] if "render" in ms else 0.0,
+            "Rows": records.groupby("section")["rows"].max(),
+            "Mem_Delta_MB": records.groupby("section")["mem_delta_mb"].sum(min_count=1),
+        }).reindex(order)
+        return out.fillna({"Compute_ms": 0.0, "Render_ms": 0.0}).rename_axis("Section").reset_index()
+
+    def write_jsonl(self, path):
+        with open(path, "a") as f:
+            for record in self.records:
+                f.write(json.dumps(record) + "\n")
+
+
+def section(profiler, name, rows=None):
+    """``profiler.section(...)`` or a no-op when no profiler is given."""
+    return profiler.section(name, rows=rows) if profiler is not None else nullcontext()
@@ -0,0 +1,140 @@
+import sys
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+
+def value_bytes(value):
+    """Approximate memory of a cached value: DataFrames/Series (deep) inside nested dicts/lists."""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, (pd.Series, pd.Index)):
+        return int(value.memory_usage(index=True, deep=True) if isinstance(value, pd.Series) else value.memory_usage(deep=True))
+    if isinstance(value, dict):
+        return sum(value_bytes(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(value_bytes(v) for v in value)
+    return sys.getsizeof(value)
+
+
+class LRUCache:
+    """Thread-safe LRU map bounded by entry count and (optionally) bytes, with hit/miss counters.
+
+    One instance is shared by every Streamlit session in the process (see
+    ``st.cache_resource`` in EKYC.py), so cached values must be treated as
+    read-only by callers: a value that gains entries is copied, filled and
+    stored again with ``put`` (see ``analytics.merge_results``). Values that
+    grow after ``put`` anyway are re-measured with ``resize``.
+    """
+
+    def __init__(self, maxsize=32, maxbytes=None, sizeof=value_bytes):
+        self.maxsize = maxsize
+        self.maxbytes = maxbytes
+        self.sizeof = sizeof
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bytes = 0
+        self._data = OrderedDict()
+        self._sizes = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return default
+
+    def peek(self, key, default=None):
+        """Current value of ``key`` without counting a hit/miss or refreshing its LRU position."""
+        with self._lock:
+            return self._data.get(key, default)
+
+    def _evict(self):
+        # Entry yang paling baru (baru saja dipakai) tidak dievict meski sendirian lewat batas byte
+        while len(self._data) > self.maxsize or (
+            self.maxbytes is not None and self.bytes > self.maxbytes and len(self._data) > 1
+        ):
+            key, _ = self._data.popitem(last=False)
+            self.bytes -= self._sizes.pop(key)
+            self.evictions += 1
+
+    def put(self, key, value):
+        size = self.sizeof(value) if self.maxbytes is not None else 0
+        with self._lock:
+            self.bytes += size - self._sizes.get(key, 0)
+            self._sizes[key] = size
+            self._data[key] = value
+            self._data.move_to_end(key)
+            self._evict()
+
+    def resize(self, key):
+        """Re-measure ``key`` after its value was filled in place, evicting older entries if needed."""
+        if self.maxbytes is None:
+            return
+        with self._lock:
+            value = self._data.get(key)
+        if value is None:
+            return
+        size = self.sizeof(value)
+        with self._lock:
+            if key in self._data:
+                self.bytes += size - self._sizes[key]
+                self._sizes[key] = size
+                self._evict()
+
+    def get_or_compute(self, key, compute):
+        # Hitung di luar lock: dua session dengan key sama bisa sama-sama compute, hasilnya identik
+        sentinel = object()
+        value = self.get(key, sentinel)
+        if value is sentinel:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._sizes.clear()
+            self.bytes = 0
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "bytes": self.bytes,
+                "maxbytes": self.maxbytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / total if total else 0.0,
+            }
+
+
+def filter_key(snapshot_version, sources, start, end, all_sources=None, date_min=None, date_max=None):
+    """Normalized cache key for a (source_filter, date_range) view of one snapshot.
+
+    Sources are de-duplicated and sorted (and limited to ``all_sources`` when
+    given); dates are clamped to ``[date_min, date_max]`` so equivalent views
+    share an entry.
+    """
+    sources = set(sources)
+    if all_sources is not None:
+        sources &= set(all_sources)
+    if date_min is not None:
+        start = max(start, date_min)
+    if date_max is not None:
+        end = min(end, date_max)
+    if start > end:
+        # Range di luar data: semua view kosong sama saja
+        start = end = None
+    return (snapshot_version, tuple(sorted(sources)), start, end)
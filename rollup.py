@@ -0,0 +1,265 @@
+"""Time-bucket rollup cube for the trend and peak-time charts.
+
+The log is rolled up once to one row per (Date, Hour, SourceResult,
+SourceApps) with request counts and "Sesuai" cell counts. Daily trend,
+hourly traffic / anomaly, day of week and peak hour for any
+source/date filter are then sums over the selected buckets, so their
+cost follows the number of buckets rather than the number of rows.
+
+Distinct NIKs do not add up across buckets, so the cube keeps a
+mergeable exact sketch next to it: the distinct (day, source, app, NIK)
+combinations. Unique_NIK for a filter is the union of the selected
+sketches. For the per-day Unique_NIK of the trend chart the sketch is
+also reduced to a (day × set-of-sources) count table, so any source
+filter is answered by summing the matching columns.
+
+The exact sketch is not bounded by the number of buckets: it holds one
+entry per distinct (day, source, app, NIK), which on a log where most
+NIKs are seen once a day is close to the number of rows. Building it
+sorts those entries, and ``unique_nik`` / ``unique_nik_by_source`` (and
+``unique_nik_by_day`` past ``MAX_SOURCE_SETS`` sources) run ``np.unique``
+over the selected ones, so those queries stay O(rows in the filter).
+Only the bucket sums and the day × source-set table are independent of
+the row count.
+
+With ``hll_error`` the cube runs in approximate mode: distinct NIKs come
+from HyperLogLog sketches per (day, source, app) (see ``hll.py``), kept
+within that relative error, and merging them never touches the rows.
+Their size is fixed per (day, source, app), which is the mode to use
+when the exact sketch gets too large.
+
+    cube = Rollup(df)
+    cube.daily(["DUKCAPIL"], date(2025, 6, 1), date(2025, 6, 30))
+"""
+import numpy as np
+import pandas as pd
+
+from analytics import flag_hourly_anomalies, peak_hour, popcount, weekday_table
+from hll import HllSketches, precision_for_error
+from ingest import STATUS_MASK_COLS, status_cols, status_mask
+from profiling import section
+
+HOURS = 24
+
+# Tabel (hari × kombinasi source) hanya dibangun sampai sekian source (2^n kolom)
+MAX_SOURCE_SETS = 10
+
+
+def _codes(values):
+    """Sorted factorize; missing values get the extra last code ``len(uniques)``."""
+    codes, uniques = pd.factorize(values, sort=True)
+    codes = codes.astype(np.int64)
+    codes[codes < 0] = len(uniques)
+    return codes, uniques
+
+
+class Rollup:
+    """Rollup cube + distinct-NIK sketches of one encoded log (see module docstring)."""
+
+    def __init__(self, df, hll_error=None):
+        df = df[df["CreatedDate"].notna() & df["SourceResult"].notna()]
+
+        day_codes, days = _codes(df["CreatedDate"].dt.normalize())
+        self.days = days.to_numpy()
+        self.day_weekday = days.weekday.to_numpy()
+        src_codes, sources = _codes(df["SourceResult"])
+        app_codes, apps = _codes(df["SourceApps"])
+        hour = (df["Hour"] if "Hour" in df.columns else df["CreatedDate"].dt.hour).to_numpy(dtype=np.int64)
+        self.sources = np.asarray(sources, dtype=object)
+        self.apps = np.append(np.asarray(apps, dtype=object), None)  # slot terakhir = SourceApps kosong
+        n_src, n_app = len(self.sources), len(self.apps)
+
+        col = STATUS_MASK_COLS["Sesuai"]
+        mask = df[col].to_numpy(dtype=np.uint16) if col in df.columns else status_mask(df, "Sesuai")
+        has_nik = df["Nik"].notna().to_numpy()
+
+        # Bucket key urut (hari, jam, source, app) → tabel bucket terurut waktu
+        key = ((day_codes * HOURS + hour) * n_src + src_codes) * n_app + app_codes
+        keys, inverse = np.unique(key, return_inverse=True)
+        self.rows = np.bincount(inverse, minlength=len(keys))
+        self.requests = np.bincount(inverse, weights=has_nik, minlength=len(keys)).astype(np.int64)
+        self.sesuai = np.bincount(inverse, weights=popcount(mask), minlength=len(keys)).astype(np.int64)
+        self.app = keys % n_app
+        self.src = keys // n_app % n_src
+        self.hour = keys // (n_app * n_src) % HOURS
+        self.day = keys // (n_app * n_src * HOURS)
+
+        self.hll_error = hll_error
+        if hll_error is not None:
+            # Mode approx: HLL per (hari, source, app); id grup urut hari seperti bucket
+            group = (day_codes[has_nik] * n_src + src_codes[has_nik]) * n_app + app_codes[has_nik]
+            self.hll = HllSketches(group, df["Nik"].to_numpy()[has_nik], precision_for_error(hll_error))
+            self.hll_day = self.hll.group // (n_app * n_src)
+            self.hll_src = self.hll.group // n_app % n_src
+            return
+
+        # Sketch exact per (hari, source, app): pasangan distinct dengan kode NIK, urut hari.
+        # Ukurannya ~ jumlah baris (bukan jumlah bucket), lihat docstring modul
+        nik_codes, niks = pd.factorize(df["Nik"])
+        self.n_nik = len(niks)
+        pair = ((day_codes * n_src + src_codes) * n_app + app_codes) * (self.n_nik + 1) + nik_codes
+        pair = np.unique(pair[nik_codes >= 0])
+        self.sketch_nik = pair % (self.n_nik + 1)
+        group = pair // (self.n_nik + 1)
+        self.sketch_src = group // n_app % n_src
+        self.sketch_day = group // (n_app * n_src)
+
+        # Per (hari, NIK): bitmask source yang dipakai → jumlah NIK per (hari, bitmask)
+        self.day_source_sets = None
+        if n_src <= MAX_SOURCE_SETS:
+            day_nik = self.sketch_day * (self.n_nik + 1) + self.sketch_nik
+            order = np.argsort(day_nik, kind="stable")
+            day_nik = day_nik[order]
+            starts = np.flatnonzero(np.r_[True, day_nik[1:] != day_nik[:-1]])
+            sets = np.bitwise_or.reduceat(np.left_shift(1, self.sketch_src[order]), starts)
+            n_sets = 1 << n_src
+            self.day_source_sets = np.bincount(
+                day_nik[starts] // (self.n_nik + 1) * n_sets + sets, minlength=len(self.days) * n_sets
+            ).reshape(len(self.days), n_sets)
+
+    def __len__(self):
+        return len(self.rows)
+
+    @property
+    def approximate(self):
+        return self.hll_error is not None
+
+    # ======================
+    # SELECTION
+    # ======================
+    def _day_range(self, start, end):
+        lo = np.searchsorted(self.days, np.datetime64(pd.Timestamp(start).normalize()), side="left")
+        hi = np.searchsorted(self.days, np.datetime64(pd.Timestamp(end).normalize()), side="right")
+        return lo, hi
+
+    def _wanted(self, sources):
+        return np.isin(self.sources, [str(s) for s in sources])
+
+    def _select(self, day, src, sources, start, end):
+        # Kolom hari terurut → range tanggal = slice searchsorted, source via lookup per kode
+        lo, hi = self._day_range(start, end)
+        a, b = np.searchsorted(day, lo, side="left"), np.searchsorted(day, hi, side="left")
+        return np.arange(a, b)[self._wanted(sources)[src[a:b]]]
+
+    def buckets(self, sources, start, end):
+        """Positions of the buckets inside the filter (sources, start..end)."""
+        return self._select(self.day, self.src, sources, start, end)
+
+    # ======================
+    # QUERIES
+    # ======================
+    def unique_nik_by_day(self, sources, start, end):
+        """Distinct NIKs per day code (array over all days) from the union of the selected sketches."""
+        if self.approximate:
+            lo, hi = self._day_range(start, end)
+            sel = self._select(self.hll_day, self.hll_src, sources, start, end)
+            counts = np.zeros(len(self.days), dtype=np.int64)
+            counts[lo:hi] = np.rint(self.hll.count(sel, by=self.hll_day[sel] - lo, n_by=hi - lo))
+            return counts
+        if self.day_source_sets is not None:
+            # NIK dihitung di hari itu kalau set source-nya beririsan dengan filter
+            wanted = int(np.left_shift(1, np.flatnonzero(self._wanted(sources))).sum())
+            hits = (np.arange(self.day_source_sets.shape[1]) & wanted) != 0
+            lo, hi = self._day_range(start, end)
+            counts = np.zeros(len(self.days), dtype=np.int64)
+            counts[lo:hi] = self.day_source_sets[lo:hi][:, hits].sum(axis=1)
+            return counts
+        sel = self._select(self.sketch_day, self.sketch_src, sources, start, end)
+        day_nik = np.unique(self.sketch_day[sel] * (self.n_nik + 1) + self.sketch_nik[sel])
+        return np.bincount(day_nik // (self.n_nik + 1), minlength=len(self.days))
+
+    def unique_nik(self, sources, start, end):
+        """Distinct NIKs over the whole filter."""
+        if self.approximate:
+            sel = self._select(self.hll_day, self.hll_src, sources, start, end)
+            return int(np.rint(self.hll.count(sel)[0]))
+        sel = self._select(self.sketch_day, self.sketch_src, sources, start, end)
+        return int(len(np.unique(self.sketch_nik[sel])))
+
+    def unique_nik_by_source(self, sources, start, end):
+        """(SourceResult, Unique_NIK) for the selected sources that have requests in the range."""
+        if self.approximate:
+            sel = self._select(self.hll_day, self.hll_src, sources, start, end)
+            counts = np.rint(self.hll.count(sel, by=self.hll_src[sel], n_by=len(self.sources))).astype(np.int64)
+        else:
+            sel = self._select(self.sketch_day, self.sketch_src, sources, start, end)
+            src_nik = np.unique(self.sketch_src[sel] * (self.n_nik + 1) + self.sketch_nik[sel])
+            counts = np.bincount(src_nik // (self.n_nik + 1), minlength=len(self.sources))
+        present = np.flatnonzero(counts)
+        return pd.DataFrame({"SourceResult": self.sources[present], "Unique_NIK": counts[present]})
+
+    def daily(self, sources, start, end):
+        """Same table as ``analytics.daily_trend`` on the filtered log."""
+        sel = self.buckets(sources, start, end)
+        day = self.day[sel]
+        days = np.unique(day)
+        return pd.DataFrame({
+            "Date": self.days[days],
+            "Total": np.bincount(day, weights=self.rows[sel], minlength=len(self.days))[days].astype(np.int64),
+            "Total_Requests": np.bincount(day, weights=self.requests[sel], minlength=len(self.days))[days].astype(np.int64),
+            "Unique_NIK": self.unique_nik_by_day(sources, start, end)[days].astype(np.int64),
+        })
+
+    def hourly(self, sources, start, end):
+        """Same table as ``analytics.hourly_traffic`` on the filtered log."""
+        sel = self.buckets(sources, start, end)
+        counts = np.bincount(self.hour[sel], weights=self.rows[sel], minlength=HOURS).astype(np.int64)
+        hours = np.flatnonzero(counts)
+        return flag_hourly_anomalies(pd.DataFrame({
+            "Hour": hours.astype(np.int8),
+            "Total_Request": counts[hours],
+        }))
+
+    def weekday(self, sources, start, end):
+        """Same table as ``analytics.weekday_traffic`` on the filtered log."""
+        sel = self.buckets(sources, start, end)
+        counts = np.bincount(self.day_weekday[self.day[sel]], weights=self.rows[sel], minlength=7).astype(np.int64)
+        present = np.flatnonzero(counts)
+        return weekday_table(pd.Series(counts[present], index=present))
+
+    def quality_score(self, sources, start, end, cols=status_cols):
+        """Share of "Sesuai" cells, as ``analytics.quality_score``."""
+        sel = self.buckets(sources, start, end)
+        total = self.rows[sel].sum() * len(cols)
+        return self.sesuai[sel].sum() / total if total > 0 else 0
+
+    # ======================
+    # SECTIONS
+    # ======================
+    def _trend(self, sources, start, end):
+        return {"daily": self.daily(sources, start, end)}
+
+    def _peak_time(self, sources, start, end):
+        hourly = self.hourly(sources, start, end)
+        return {
+            "hourly": hourly,
+            "peak_hour": peak_hour(hourly) if len(hourly) else None,
+            "weekday": self.weekday(sources, start, end),
+        }
+
+    def _unique_nik(self, sources, start, end):
+        return {
+            "unique_nik": self.unique_nik(sources, start, end),
+            "source_unique_nik": self.unique_nik_by_source(sources, start, end),
+        }
+
+    SECTIONS = {
+        "TREND": _trend,
+        "PEAK TIME": _peak_time,
+        "UNIQUE NIK": _unique_nik,
+    }
+
+    def compute_sections(self, names, results, sources, start, end, profiler=None):
+        """Fill the sections of ``names`` the cube can answer (``SECTIONS``) into ``results``.
+
+        Same bundle contract as ``analytics.compute_sections``; other
+        sections are left for it.
+        """
+        done = results.setdefault("sections", [])
+        for name in names:
+            if name in done or name not in self.SECTIONS:
+                continue
+            with section(profiler, name, len(self)):
+                results.update(self.SECTIONS[name](self, sources, start, end))
+            done.append(name)
+        return results
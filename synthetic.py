@@ -0,0 +1,147 @@
+"""Synthetic DUKCAPIL verification logs with the export schema.
+
+    python synthetic.py 100000 synthetic_100k.csv --duplicate-rate 0.4
+"""
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from ingest import status_cols
+
+SOURCES = ["DB_CACHE", "DUKCAPIL", "BCA"]
+SOURCE_WEIGHTS = [0.5, 0.35, 0.15]
+
+# Distribusi jam: sepi malam, ramai jam kerja
+HOUR_WEIGHTS = np.array([
+    1, 1, 1, 1, 1, 2, 4, 6, 9, 11, 12, 12,
+    10, 11, 12, 11, 9, 7, 5, 4, 3, 2, 2, 1
+], dtype=float)
+
+STATUSES = ["Sesuai", "Tidak Sesuai"]
+
+
+def generate_log(
+    n_rows,
+    duplicate_rate=0.3,
+    rapid_fire_rate=0.01,
+    flip_rate=0.02,
+    cross_source_rate=0.05,
+    n_apps=20,
+    start="2025-01-01",
+    days=365,
+    missing_rate=0.03,
+    seed=0,
+):
+    """Raw log frame (Id, Nik, CreatedDate, SourceResult, SourceApps, status fields).
+
+    - ``duplicate_rate``: share of rows that re-query an already seen NIK
+      (skewed, so a few NIKs become heavy repeaters).
+    - ``rapid_fire_rate``: share of rows that repeat another row's NIK and
+      app 0.5-4 s later.
+    - ``flip_rate``: share of rows where one field deviates from the NIK's
+      usual status.
+    - ``cross_source_rate``: share of NIKs whose DUKCAPIL answers disagree
+      with the other sources on one field.
+
+    Status and source columns are Categoricals (missing status = NaN, as in
+    the export before cleaning) so 10M-row logs stay cheap to build.
+    """
+    rng = np.random.default_rng(seed)
+
+    n_unique = max(1, int(round(n_rows * (1 - duplicate_rate))))
+    niks = np.unique(rng.integers(1_100_000_000_000_000, 9_499_999_999_999_999, size=n_unique))
+    n_unique = len(niks)
+
+    # Baris pertama tiap NIK + duplikat dengan distribusi miring (power law)
+    nik_idx = np.empty(n_rows, dtype=np.int64)
+    first = min(n_unique, n_rows)
+    nik_idx[:first] = rng.permutation(n_unique)[:first]
+    n_dup = n_rows - first
+    nik_idx[first:] = (rng.random(n_dup) ** 3 * n_unique).astype(np.int64)
+
+    day = rng.integers(0, days, size=n_rows)
+    hour = rng.choice(24, size=n_rows, p=HOUR_WEIGHTS / HOUR_WEIGHTS.sum())
+    second = rng.integers(0, 3600, size=n_rows)
+    offset = day * 86400 + hour * 3600 + second
+
+    source = rng.choice(len(SOURCES), size=n_rows, p=SOURCE_WEIGHTS)
+    app_weights = 1 / np.arange(1, n_apps + 1)
+    app = rng.choice(n_apps, size=n_rows, p=app_weights / app_weights.sum())
+
+    # Rapid fire: salin NIK + app dari baris lain, 0.5–4 detik setelahnya
+    n_rapid = int(n_rows * rapid_fire_rate)
+    if n_rapid:
+        burst = rng.choice(n_rows, size=n_rapid, replace=False)
+        anchor = rng.integers(0, n_rows, size=n_rapid)
+        nik_idx[burst] = nik_idx[anchor]
+        app[burst] = app[anchor]
+        source[burst] = source[anchor]
+        offset[burst] = offset[anchor] + rng.integers(1, 5, size=n_rapid)
+
+    # Status "asli" per NIK, diwarisi semua request NIK tsb
+    nik_status = (rng.random((n_unique, len(status_cols))) < 0.12).astype(np.int8)
+    codes = nik_status[nik_idx]
+
+    n_flip = int(n_rows * flip_rate)
+    if n_flip:
+        rows = rng.integers(0, n_rows, size=n_flip)
+        fields = rng.integers(0, len(status_cols), size=n_flip)
+        codes[rows, fields] = 1 - codes[rows, fields]
+
+    disagree = rng.random(n_unique) < cross_source_rate
+    disagree_field = rng.integers(0, len(status_cols), size=n_unique)
+    rows = np.flatnonzero(disagree[nik_idx] & (source == SOURCES.index("DUKCAPIL")))
+    fields = disagree_field[nik_idx[rows]]
+    codes[rows, fields] = 1 - codes[rows, fields]
+
+    codes[rng.random(codes.shape) < missing_rate] = -1
+
+    created = pd.Timestamp(start) + pd.to_timedelta(offset, unit="s")
+    order = np.argsort(created.to_numpy(), kind="stable")
+
+    df = pd.DataFrame({
+        "Id": np.arange(1, n_rows + 1),
+        "Nik": niks[nik_idx[order]],
+        "CreatedDate": created[order],
+        "SourceResult": pd.Categorical.from_codes(source[order], categories=SOURCES),
+        "SourceApps": pd.Categorical.from_codes(app[order], categories=[f"APP{i:03d}" for i in range(1, n_apps + 1)]),
+    })
+    for i, c in enumerate(status_cols):
+        df[c] = pd.Categorical.from_codes(codes[order, i], categories=STATUSES)
+
+    return df
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write a synthetic DUKCAPIL log.")
+    parser.add_argument("rows", type=int)
+    parser.add_argument("out", help=".csv, .parquet or .xlsx")
+    parser.add_argument("--duplicate-rate", type=float, default=0.3)
+    parser.add_argument("--rapid-fire-rate", type=float, default=0.01)
+    parser.add_argument("--flip-rate", type=float, default=0.02)
+    parser.add_argument("--cross-source-rate", type=float, default=0.05)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    df = generate_log(
+        args.rows,
+        duplicate_rate=args.duplicate_rate,
+        rapid_fire_rate=args.rapid_fire_rate,
+        flip_rate=args.flip_rate,
+        cross_source_rate=args.cross_source_rate,
+        days=args.days,
+        seed=args.seed,
+    )
+
+    if args.out.endswith(".parquet"):
+        df.to_parquet(args.out, index=False)
+    elif args.out.endswith(".xlsx"):
+        df.to_excel(args.out, index=False)
+    else:
+        df.to_csv(args.out, index=False)
+
+
+if __name__ == "__main__":
+    main()
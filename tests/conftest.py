@@ -0,0 +1,22 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from ingest import clean_log, status_cols  # noqa: E402
+from synthetic import generate_log  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def raw_log():
+    """Small log shaped like the Excel export: plain string columns, int64 Nik."""
+    df = generate_log(1500, duplicate_rate=0.5, rapid_fire_rate=0.05, days=20, missing_rate=0.01, seed=7)
+    categorical = ["SourceResult", "SourceApps", *status_cols]
+    return df.astype({c: object for c in categorical})
+
+
+@pytest.fixture(scope="session")
+def log(raw_log):
+    return clean_log(raw_log)
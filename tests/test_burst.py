@@ -0,0 +1,64 @@
+import pandas as pd
+import pytest
+
+from analytics import BURST_KEYS, burst_summary, burst_windows
+from ingest import encode_log, sort_by_time
+
+
+def brute_bursts(df, by, min_requests, window_sec):
+    """Id → Window_Count of every row inside a qualifying window, one key at a time."""
+    df = df.dropna(subset=["CreatedDate", *by])
+    window = pd.Timedelta(seconds=window_sec)
+    members = {}
+    for _, group in df.groupby(by, observed=True):
+        t = group["CreatedDate"]
+        for ts in t:
+            inside = group[(t > ts - window) & (t <= ts)]
+            if len(inside) >= min_requests:
+                members.update(dict.fromkeys(inside["Id"], None))
+        for row_id, ts in zip(group["Id"], t):
+            if row_id in members:
+                members[row_id] = int(((t > ts - window) & (t <= ts)).sum())
+    return members
+
+
+@pytest.fixture(scope="module")
+def encoded(log):
+    return sort_by_time(encode_log(log)[0])
+
+
+@pytest.mark.parametrize("key, min_requests, window_sec", [
+    ("NIK", 2, 5),
+    ("NIK", 3, 3600),
+    ("SourceApps", 4, 3600),
+    ("SourceApps + NIK", 2, 60),
+])
+def test_matches_brute_force(encoded, key, min_requests, window_sec):
+    by = BURST_KEYS[key]
+    got = burst_windows(encoded, by, min_requests, window_sec)
+    expected = brute_bursts(encoded, by, min_requests, window_sec)
+    assert len(expected) > 0
+    assert dict(zip(got["Id"], got["Window_Count"])) == expected
+
+
+def test_unsorted_input_and_summary(encoded):
+    shuffled = encoded.sample(frac=1, random_state=1)
+    got = burst_windows(shuffled, ["Nik"], 2, 5)
+    pd.testing.assert_frame_equal(got, burst_windows(encoded, ["Nik"], 2, 5))
+
+    summary = burst_summary(got, ["Nik"])
+    assert summary["Burst_Requests"].sum() == len(got)
+    assert summary["Burst_Requests"].is_monotonic_decreasing
+
+
+def test_duckdb_backend_matches(encoded, tmp_path):
+    pytest.importorskip("duckdb")
+    from duckdb_backend import DuckDBLog
+
+    path = tmp_path / "log.parquet"
+    encoded.to_parquet(path, index=False)
+    sources = sorted(encoded["SourceResult"].dropna().unique())
+    start, end = encoded["CreatedDate"].min().date(), encoded["CreatedDate"].max().date()
+    got = DuckDBLog(str(path)).burst_windows(sources, start, end, ["Nik"], 2, 5)
+    expected = burst_windows(encoded[encoded["SourceResult"].notna()], ["Nik"], 2, 5)
+    assert dict(zip(got["Id"], got["Window_Count"])) == dict(zip(expected["Id"], expected["Window_Count"]))
@@ -0,0 +1,101 @@
+from collections import OrderedDict
+
+import numpy as np
+import pytest
+
+from cache_sim import REPORT_COLUMNS, Replay, default_policies, main
+from ingest import encode_log
+
+
+# ======================
+# REFERENSI (satu request per langkah, tanpa trik struktur data)
+# ======================
+def ref_lru(keys, capacity):
+    cache, hits = OrderedDict(), []
+    for key in keys:
+        hits.append(key in cache)
+        cache[key] = None
+        cache.move_to_end(key)
+        if len(cache) > capacity:
+            cache.popitem(last=False)
+    return hits
+
+
+def ref_lfu(keys, capacity):
+    # Evict frekuensi terkecil; seri → yang paling lama tidak diakses
+    freq, last, hits = {}, {}, []
+    for i, key in enumerate(keys):
+        hits.append(key in freq)
+        if key not in freq and len(freq) >= capacity:
+            victim = min(freq, key=lambda k: (freq[k], last[k]))
+            del freq[victim], last[victim]
+        freq[key] = freq.get(key, 0) + 1
+        last[key] = i
+    return hits
+
+
+def ref_ttl(keys, seconds, ttl):
+    fetched, hits = {}, []
+    for key, t in zip(keys, seconds):
+        hit = key in fetched and t - fetched[key] < ttl
+        hits.append(hit)
+        if not hit:
+            fetched[key] = t
+    return hits
+
+
+@pytest.fixture(scope="module")
+def replay(log):
+    return Replay(encode_log(log)[0])
+
+
+@pytest.mark.parametrize("capacity", [1, 25, 200, 10_000])
+def test_lru(replay, capacity):
+    hits, _ = replay.lru(capacity)
+    assert hits.tolist() == ref_lru(replay.keys.tolist(), capacity)
+
+
+@pytest.mark.parametrize("capacity", [1, 25, 200, 10_000])
+def test_lfu(replay, capacity):
+    hits, _ = replay.lfu(capacity)
+    assert hits.tolist() == ref_lfu(replay.keys.tolist(), capacity)
+
+
+@pytest.mark.parametrize("days", [0.0001, 1, 3, 365])
+def test_ttl(replay, days):
+    hits, peak = replay.ttl(days)
+    assert hits.tolist() == ref_ttl(replay.keys.tolist(), replay.seconds.tolist(), int(days * 86400))
+    assert 0 < peak <= replay.n_keys
+
+
+def test_unbounded_is_upper_bound(replay):
+    hits, peak = replay.unbounded()
+    assert peak == replay.n_keys
+    assert hits.sum() == len(replay) - replay.n_keys
+    for kind, size in [("LRU", 25), ("LFU", 25), ("TTL", 1)]:
+        assert replay.simulate((kind, size))["Hits"] <= hits.sum()
+
+
+def test_report(replay):
+    report = replay.report(default_policies(25, 3))
+    assert list(report.columns[:len(REPORT_COLUMNS)]) == REPORT_COLUMNS
+    assert (report["Hits"] + report["External_Calls"] == len(replay)).all()
+    # Panggilan yang dihindari per sumber menjumlah ke total
+    avoided = report.filter(like="Avoided_").drop(columns="Avoided_Calls")
+    assert np.array_equal(avoided.sum(axis=1).to_numpy(), report["Avoided_Calls"].to_numpy())
+
+
+@pytest.mark.parametrize("kind", ["LRU", "LFU"])
+def test_zero_capacity_always_misses(replay, kind):
+    row = replay.simulate((kind, 0))
+    assert row["Hits"] == 0
+    assert row["External_Calls"] == len(replay)
+    assert row["Peak_Entries"] == 0
+
+
+def test_cli_zero_capacity(raw_log, tmp_path, capsys):
+    path = tmp_path / "log.csv"
+    raw_log.to_csv(path, index=False)
+    assert main([str(path), "--lru", "0", "--lfu", "0,5"]) == 0
+    out = capsys.readouterr().out
+    assert "LFU 0" in out and "LRU 0" in out
@@ -0,0 +1,109 @@
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import cli
+from analytics import compute_analytics, filter_log
+from export import read_results, view_id, write_results
+from ingest import encode_log, file_fingerprint, load_log
+from result_cache import filter_key
+
+KEY = ("snap-1", ("BCA", "DUKCAPIL"), date(2025, 1, 1), date(2025, 1, 31))
+
+
+def assert_same_bundle(got, expected):
+    assert set(got) == set(expected)
+    for name, value in expected.items():
+        if isinstance(value, pd.DataFrame):
+            if not any(value.index.names):
+                value = value.reset_index(drop=True)
+            # JSON/Parquet tidak menyimpan lebar int / unit datetime / dtype string persis
+            pd.testing.assert_frame_equal(got[name], value, check_dtype=False, check_index_type=False)
+        elif isinstance(value, pd.Series):
+            pd.testing.assert_series_equal(got[name], value, check_dtype=False)
+        else:
+            assert got[name] == pytest.approx(value), name
+
+
+@pytest.fixture
+def bundle():
+    return {
+        "table": pd.DataFrame({
+            "NIK": np.array([3201010101010001, 3201010101010002], dtype=np.int64),
+            "When": pd.to_datetime(["2025-01-02 08:00:01", "2025-01-03 17:30:00"]),
+            "Rate": [0.125, 1 / 3],
+            "Status": pd.Categorical(["Sesuai", "Tidak Sesuai"]),
+        }),
+        "indexed": pd.DataFrame({"Count": [4, 2]}, index=pd.Index(["Nama", "Provinsi"], name="Field")),
+        "unnamed_index": pd.DataFrame({"Count": [4, 2]}, index=[7, 3]),
+        "pivot": pd.DataFrame(
+            [[1, 0]], index=pd.Index(["Nama"], name="Field"), columns=pd.Index(["a → b", "b → a"], name="Transition")
+        ),
+        "peak_hour": pd.Series({"Hour": 14, "Total_Request": 120, "Status": "Normal"}, name=np.int64(14)),
+        "kpi": {"total_nik": np.int64(10), "duplicate_rate": 0.25, "total_requests": 40},
+        "n_rows": np.int64(40),
+        "sections": ["KPI", "TREND"],
+        "label": "ok",
+    }
+
+
+@pytest.mark.parametrize("fmt", ["parquet", "json"])
+def test_round_trip_every_section_type(bundle, tmp_path, fmt):
+    write_results(bundle, tmp_path, KEY, fmt=fmt)
+    got = read_results(tmp_path, KEY)
+    assert_same_bundle(got, bundle)
+    assert got["pivot"].columns.name == "Transition"
+    assert got["peak_hour"].name == 14
+
+
+@pytest.mark.parametrize("fmt", ["parquet", "json"])
+def test_round_trip_analytics(log, tmp_path, fmt):
+    results = compute_analytics(encode_log(log)[0])
+    write_results(results, tmp_path, KEY, fmt=fmt)
+    assert_same_bundle(read_results(tmp_path, KEY), results)
+
+
+def test_other_key_is_not_read(bundle, tmp_path):
+    write_results(bundle, tmp_path, KEY)
+    assert read_results(tmp_path, ("snap-2", *KEY[1:])) is None
+
+
+def dashboard_key(log_path, snapshot_dir, source_filter, date_range):
+    # Sama dengan EKYC.py: fingerprint workbook, opsi sidebar dari log, lalu filter_key
+    df = load_log(log_path, snapshot_dir)
+    return filter_key(
+        file_fingerprint(log_path), source_filter, date_range[0], date_range[-1],
+        all_sources=sorted(df["SourceResult"].dropna().unique()),
+        date_min=df["CreatedDate"].min().date(), date_max=df["CreatedDate"].max().date(),
+    )
+
+
+@pytest.mark.parametrize("fmt", ["parquet", "json"])
+def test_cli_output_found_by_dashboard(raw_log, tmp_path, fmt):
+    log_path = tmp_path / "log.csv"
+    raw_log.to_csv(log_path, index=False)
+    out = tmp_path / "precomputed"
+    snap = tmp_path / ".snapshot"
+
+    argv = [str(log_path), "--out", str(out), "--snapshot-dir", str(snap), "--format", fmt,
+            "--start", "2025-01-03", "--end", "2025-01-12", "--source", "DUKCAPIL", "--source", "BCA"]
+    assert cli.main(argv) == 0
+    assert cli.main([str(log_path), "--out", str(out), "--snapshot-dir", str(snap), "--format", fmt]) == 0
+
+    df = load_log(log_path, snap)
+    # Urutan source di sidebar beda, hasil tetap sama view-nya
+    key = dashboard_key(log_path, snap, ["BCA", "DUKCAPIL"], [date(2025, 1, 3), date(2025, 1, 12)])
+    assert (out / view_id(key)).is_dir()
+    got = read_results(out, key)
+    assert got is not None
+    assert_same_bundle(got, compute_analytics(filter_log(df, ["BCA", "DUKCAPIL"], date(2025, 1, 3), date(2025, 1, 12))))
+
+    # Default sidebar (semua source, range penuh; tanggal di luar data di-clamp)
+    all_sources = sorted(df["SourceResult"].dropna().unique())
+    key = dashboard_key(log_path, snap, all_sources, [date(2024, 1, 1), date(2026, 1, 1)])
+    full = read_results(out, key)
+    assert full is not None
+    assert full["kpi"]["total_requests"] == len(df)
+    assert len(list(out.iterdir())) == 2
@@ -0,0 +1,204 @@
+"""Vectorized fraud detectors against the original per-NIK loops of EKYC.py."""
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+
+from analytics import (
+    cross_source_inconsistency,
+    nik_profile,
+    rapid_fire,
+    same_app_hits,
+    status_flips,
+    status_inconsistency,
+    status_transition_matrix,
+)
+from ingest import encode_log, status_cols
+
+
+# ======================
+# LOOP ASLI (EKYC.py sebelum vectorize)
+# ======================
+def loop_status_inconsistency(df_f):
+    inconsistency_results = []
+    for nik in df_f["Nik"].unique():
+        df_nik_check = df_f[df_f["Nik"] == nik].sort_values("CreatedDate")
+        if len(df_nik_check) > 1:
+            for col in status_cols:
+                unique_statuses = df_nik_check[col].unique()
+                if len(unique_statuses) > 1 and "-" not in unique_statuses:
+                    status_sequence = df_nik_check[col].tolist()
+                    inconsistency_results.append({
+                        "NIK": nik,
+                        "Field": col,
+                        "Status_Sequence": " → ".join(status_sequence[:5]),
+                        "Unique_Statuses": len(unique_statuses),
+                        "Total_Hits": len(df_nik_check),
+                        "First_Date": df_nik_check.iloc[0]["CreatedDate"],
+                        "Last_Date": df_nik_check.iloc[-1]["CreatedDate"],
+                        "Sources_Used": ", ".join(df_nik_check["SourceResult"].unique()),
+                        "SourceApps": df_nik_check.iloc[0]["SourceApps"]
+                    })
+    return pd.DataFrame(inconsistency_results)
+
+
+def loop_status_flips(df_f):
+    sesuai_to_tidak = []
+    for nik in df_f["Nik"].unique():
+        df_nik_check = df_f[df_f["Nik"] == nik].sort_values("CreatedDate")
+        if len(df_nik_check) > 1:
+            for col in status_cols:
+                statuses = df_nik_check[col].tolist()
+                for i in range(len(statuses) - 1):
+                    if statuses[i] == "Sesuai" and statuses[i + 1] == "Tidak Sesuai":
+                        sesuai_to_tidak.append({
+                            "NIK": nik,
+                            "Field": col,
+                            "When": df_nik_check.iloc[i + 1]["CreatedDate"]
+                        })
+                        break
+    return pd.DataFrame(sesuai_to_tidak)
+
+
+def loop_cross_source(df_f):
+    cross_inconsistency = []
+    for nik in df_f["Nik"].unique():
+        df_nik_cross = df_f[df_f["Nik"] == nik]
+        if df_nik_cross["SourceResult"].nunique() > 1:
+            for col in status_cols:
+                statuses_by_source = df_nik_cross.groupby("SourceResult")[col].apply(
+                    lambda x: x.mode()[0] if len(x.mode()) > 0 else x.iloc[0]
+                )
+                if statuses_by_source.nunique() > 1:
+                    cross_inconsistency.append({
+                        "NIK": nik,
+                        "Field": col,
+                        "Sources": ", ".join(statuses_by_source.index.tolist()),
+                        "Values": ", ".join(statuses_by_source.values.tolist()),
+                        "Hit_Count": len(df_nik_cross)
+                    })
+    return pd.DataFrame(cross_inconsistency)
+
+
+def loop_rapid_fire(df_f):
+    df_f_sorted = df_f.sort_values(["Nik", "CreatedDate"])
+    df_f_sorted["Time_Diff"] = df_f_sorted.groupby("Nik")["CreatedDate"].diff().dt.total_seconds()
+    return df_f_sorted[df_f_sorted["Time_Diff"] < 5].copy()
+
+
+def loop_same_app(df_f):
+    same_app = df_f.groupby(["SourceApps", "Nik"]).size().reset_index(name="Hit_Count")
+    return same_app[same_app["Hit_Count"] > 3].sort_values("Hit_Count", ascending=False)
+
+
+def loop_transitions(df_f):
+    # Tidak ada di EKYC.py asli: hitung pasangan status berurutan per NIK apa adanya
+    counts = {}
+    for nik in df_f["Nik"].dropna().unique():
+        df_nik_check = df_f[df_f["Nik"] == nik].sort_values("CreatedDate", kind="stable")
+        for col in status_cols:
+            statuses = df_nik_check[col].tolist()
+            for before, after in zip(statuses, statuses[1:]):
+                if pd.notna(before) and pd.notna(after):
+                    counts[(col, before, after)] = counts.get((col, before, after), 0) + 1
+    rows = [{"Field": f, "From": a, "To": b, "Count": n} for (f, a, b), n in counts.items()]
+    order = {c: i for i, c in enumerate(status_cols)}
+    return pd.DataFrame(rows).sort_values(
+        ["Field", "From", "To"], key=lambda s: s.map(order) if s.name == "Field" else s, ignore_index=True
+    )
+
+
+# ======================
+# HELPERS
+# ======================
+def plain(df):
+    """Categorical / nullable columns as plain values, fresh index (log terencode vs mentah)."""
+    df = df.reset_index(drop=True)
+    for c in df.columns:
+        if isinstance(df[c].dtype, pd.CategoricalDtype) or df[c].dtype == "string":
+            df[c] = df[c].astype(object)
+        elif pd.api.types.is_integer_dtype(df[c]):
+            df[c] = df[c].astype("int64")
+    return df
+
+
+@pytest.fixture(scope="module")
+def expected(log):
+    """Output of every original loop on the fixture log (computed once)."""
+    return {
+        "inconsistency": loop_status_inconsistency(log),
+        "flips": loop_status_flips(log),
+        "cross": loop_cross_source(log),
+        "rapid": loop_rapid_fire(log),
+        "same_app": loop_same_app(log),
+        "transitions": loop_transitions(log),
+    }
+
+
+@pytest.fixture(scope="module", params=["raw", "encoded"])
+def frame(request, log):
+    if request.param == "raw":
+        return log
+    return encode_log(log)[0]
+
+
+@pytest.fixture(scope="module", params=[False, True], ids=["no-profile", "profile"])
+def profile(request, frame):
+    return nik_profile(frame) if request.param else None
+
+
+# ======================
+# TESTS
+# ======================
+def test_fixture_has_cases(expected):
+    # Fixture harus memicu semua detector, kalau tidak perbandingan tidak berarti
+    assert all(len(out) > 0 for out in expected.values())
+
+
+def test_status_inconsistency(frame, profile, expected):
+    assert_frame_equal(plain(status_inconsistency(frame, profile=profile)), plain(expected["inconsistency"]))
+
+
+def test_status_flips(frame, expected):
+    assert_frame_equal(plain(status_flips(frame)), plain(expected["flips"]))
+
+
+def test_cross_source(frame, profile, expected):
+    assert_frame_equal(plain(cross_source_inconsistency(frame, profile=profile)), plain(expected["cross"]))
+
+
+def test_transition_matrix(frame, expected):
+    assert_frame_equal(plain(status_transition_matrix(frame)), plain(expected["transitions"]))
+    assert expected["transitions"]["From"].ne(expected["transitions"]["To"]).any()
+
+
+def test_rapid_fire(frame, profile, expected):
+    got = rapid_fire(frame, profile)
+    assert got.index.tolist() == expected["rapid"].index.tolist()
+    assert got["Time_Diff"].tolist() == expected["rapid"]["Time_Diff"].tolist()
+
+
+def dummies_profile_counts(df):
+    # Versi awal nik_profile: get_dummies per baris lalu sum per NIK
+    d = df[df["Nik"].notna()]
+    counts = pd.get_dummies(d[["SourceResult", *status_cols]], prefix_sep="=", dtype="int32")
+    return counts.groupby(d["Nik"]).sum()
+
+
+def test_profile_counts_match_dummies(frame):
+    profile = nik_profile(frame)
+    expected = dummies_profile_counts(frame)
+    assert [c for c in profile.columns if "=" in c] == list(expected.columns)
+    assert_frame_equal(profile[expected.columns], expected.rename_axis(profile.index.name))
+    assert (profile["Hit_Count"] == expected.filter(like="SourceResult=").sum(axis=1)).all()
+
+
+def test_same_app(frame, profile, expected):
+    cols = ["SourceApps", "Nik", "Hit_Count"]
+    got = plain(same_app_hits(frame, profile))[cols]
+    expected = plain(expected["same_app"])[cols]
+    # Urutan hit sama; dalam hit yang sama urutan groupby (app, nik)
+    key = ["Hit_Count", "SourceApps", "Nik"]
+    assert_frame_equal(
+        got.sort_values(key, ascending=[False, True, True], ignore_index=True),
+        expected.sort_values(key, ascending=[False, True, True], ignore_index=True),
+    )
@@ -0,0 +1,122 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import ingest
+from ingest import STATUS_VOCAB, encode_category, encode_nik, load_log, load_memory_report
+
+
+def test_nik_int64():
+    nik, n_invalid = encode_nik(pd.Series([3201010101010001, 1100000000000000], dtype="int64"))
+    assert n_invalid == 0
+    assert nik.dtype == "int64"
+
+
+def test_nik_floats_from_excel():
+    nik, n_invalid = encode_nik(pd.Series([3201010101010001.0, np.nan, 1100000000000000.0]))
+    assert n_invalid == 0
+    assert nik.dtype == "Int64"
+    assert nik.tolist() == [3201010101010001, pd.NA, 1100000000000000]
+
+
+def test_nik_text_and_mixed_from_excel():
+    nik, n_invalid = encode_nik(pd.Series([" 3201010101010001", 3201010101010002, None], dtype=object))
+    assert n_invalid == 0
+    assert nik.dtype == "Int64"
+    assert nik.tolist() == [3201010101010001, 3201010101010002, pd.NA]
+
+
+@pytest.mark.parametrize("values, n_invalid", [
+    (["320101010101000", "3201010101010001"], 1),                  # 15 digit
+    (["32010101010100011", "3201010101010001"], 1),                # 17 digit
+    (["abc", "3201-0101-0101-0001", "3201010101010001", None], 2),
+    (["3.201010101010001e15", "3201010101010001"], 1),             # float Excel jadi teks
+    ([3201010101010001.5, 123.0], 2),
+    ([np.nan, 3201010101010001.5], 1),                             # NaN tidak dihitung invalid
+])
+def test_nik_invalid_kept_as_is(values, n_invalid):
+    raw = pd.Series(values, dtype=object if isinstance(values[0], str) else None)
+    nik, got = encode_nik(raw)
+    assert got == n_invalid
+    pd.testing.assert_series_equal(nik, raw)
+
+
+def test_category_outside_vocab_kept():
+    got = encode_category(pd.Series(["Sesuai", "Belum Dicek", None, "-"]), STATUS_VOCAB)
+    assert list(got.categories) == ["-", "Belum Dicek", "Sesuai", "Tidak Sesuai"]
+    assert got.tolist()[:2] == ["Sesuai", "Belum Dicek"]
+    assert pd.isna(got[2])
+
+
+def test_categorical_input_outside_vocab_kept():
+    values = pd.Series(pd.Categorical(["Sesuai", "Belum Dicek", None], categories=["Sesuai", "Belum Dicek", "Unused"]))
+    got = encode_category(values, STATUS_VOCAB)
+    # Kategori yang tidak muncul di data dibuang, vocabulary tetap lengkap
+    assert list(got.categories) == ["-", "Belum Dicek", "Sesuai", "Tidak Sesuai"]
+    assert got.tolist()[:2] == ["Sesuai", "Belum Dicek"]
+
+
+def test_memory_report(raw_log, tmp_path):
+    path = tmp_path / "log.csv"
+    raw_log.to_csv(path, index=False)
+    snap = tmp_path / ".snapshot"
+    df = load_log(path, snap)
+    report, n_invalid = load_memory_report(path, snap)
+    assert n_invalid == 0
+    assert set(report["Column"]) == set(df.columns)
+    assert report["After_Bytes"].sum() < report["Before_Bytes"].sum()
+
+
+def test_memory_report_missing(raw_log, tmp_path):
+    path = tmp_path / "log.csv"
+    raw_log.to_csv(path, index=False)
+    snap = tmp_path / ".snapshot"
+    load_log(path, snap)
+    # Snapshot tanpa report (mis. ditulis versi lama / crash): dashboard tetap jalan
+    ingest._report_path(ingest._snapshot_path(path, ingest.file_fingerprint(path), snap)).unlink()
+    report, n_invalid = load_memory_report(path, snap)
+    assert report.empty and list(report.columns) == ["Column", "Before_Bytes", "After_Bytes"]
+    assert n_invalid == 0
+
+
+def test_report_written_before_snapshot(raw_log, tmp_path, monkeypatch):
+    path = tmp_path / "log.csv"
+    raw_log.to_csv(path, index=False)
+    snap = tmp_path / ".snapshot"
+
+    def crash(df, snapshot_path):
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(ingest, "write_snapshot", crash)
+    with pytest.raises(KeyboardInterrupt):
+        load_log(path, snap)
+    assert not list(snap.glob("*.parquet"))
+    monkeypatch.undo()
+
+    load_log(path, snap)
+    assert load_memory_report(path, snap)[0].shape[0] > 0
+
+
+def test_same_stem_other_folder_kept(raw_log, tmp_path):
+    snap = tmp_path / ".snapshot"
+    jan, feb = tmp_path / "jan" / "log.csv", tmp_path / "feb" / "log.csv"
+    for path, n in ((jan, 300), (feb, 200)):
+        path.parent.mkdir()
+        raw_log.head(n).to_csv(path, index=False)
+    load_log(jan, snap)
+    load_log(feb, snap)
+    # Snapshot jan/log.csv tidak terhapus oleh rebuild feb/log.csv
+    assert ingest._snapshot_path(jan, ingest.file_fingerprint(jan), snap).exists()
+    assert len(load_log(jan, snap)) != len(load_log(feb, snap))
+    assert load_memory_report(jan, snap)[0].shape[0] > 0
+
+
+def test_legacy_snapshot_name_removed(raw_log, tmp_path):
+    path = tmp_path / "log.csv"
+    raw_log.to_csv(path, index=False)
+    snap = tmp_path / ".snapshot"
+    snap.mkdir()
+    legacy = snap / f"log-{'0' * 16}.v{ingest.SNAPSHOT_VERSION}.parquet"
+    legacy.write_bytes(b"")
+    load_log(path, snap)
+    assert not legacy.exists()
@@ -0,0 +1,189 @@
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from analytics import hourly_traffic, kpi_summary, nik_profile, rapid_fire
+from ingest import clean_log, encode_log
+from live import LiveCounters, LiveMonitor, LogTail, _write_batch
+from synthetic import generate_log
+
+
+@pytest.fixture(scope="module")
+def history():
+    df = generate_log(600, duplicate_rate=0.6, rapid_fire_rate=0.1, days=2, seed=11)
+    return df.assign(Nik=df["Nik"].astype(str))
+
+
+def expected(history):
+    df = encode_log(clean_log(history))[0]
+    return kpi_summary(df, nik_profile(df)), hourly_traffic(df), len(rapid_fire(df))
+
+
+def assert_matches(counters, history):
+    kpi, hourly, rapid_hits = expected(history)
+    assert counters.kpi() == pytest.approx(kpi)
+    pd.testing.assert_frame_equal(counters.hourly_table(), hourly, check_dtype=False)
+    assert counters.rapid_hits == rapid_hits
+
+
+def batches(df, n):
+    return [df.iloc[i] for i in np.array_split(np.arange(len(df)), n)]
+
+
+@pytest.mark.parametrize("target", ["log.csv", "log.jsonl", "drop"])
+def test_monitor_matches_full_history(history, tmp_path, target):
+    path = tmp_path / target
+    if target == "drop":
+        path.mkdir()
+    monitor = LiveMonitor(path)
+    for i, batch in enumerate(batches(history, 4)):
+        _write_batch(batch, path, i)
+        assert monitor.poll() == len(batch)
+    assert monitor.poll() == 0
+    assert_matches(monitor.counters, history)
+
+
+def test_out_of_order_batches(history):
+    shuffled = history.sample(frac=1, random_state=0)
+    counters = LiveCounters(late_tolerance_sec=3 * 86400)
+    for batch in batches(shuffled, 7):
+        counters.update(clean_log(batch))
+    assert counters.late_dropped == 0
+    assert_matches(counters, shuffled)
+
+
+def test_late_row_compared_with_newer_requests(history):
+    row = history.iloc[[0]]
+    at = [pd.Timestamp("2025-01-01 00:00:10"), pd.Timestamp("2025-01-01 00:00:08"), pd.Timestamp("2025-01-01 00:00:12")]
+    b1 = row.assign(CreatedDate=at[:1])
+    b2 = pd.concat([row, row]).assign(CreatedDate=at[1:])
+    counters = LiveCounters()
+    counters.update(clean_log(b1))
+    counters.update(clean_log(b2))
+    assert counters.rapid_hits == len(rapid_fire(clean_log(pd.concat([b1, b2])))) == 2
+
+
+def test_rows_beyond_late_tolerance_are_dropped(history):
+    row = history.iloc[[0]]
+    base = pd.Timestamp("2025-01-01")
+    counters = LiveCounters(late_tolerance_sec=60)
+    counters.update(clean_log(pd.concat([row] * 3).assign(CreatedDate=base + pd.to_timedelta([0, 100, 200], unit="s"))))
+    counters.update(clean_log(row.assign(CreatedDate=[base + pd.Timedelta(seconds=50)])))
+    assert counters.late_dropped == 1
+    # Masih dalam toleransi: dibandingkan dengan 200 detik
+    counters.update(clean_log(row.assign(CreatedDate=[base + pd.Timedelta(seconds=198)])))
+    assert counters.late_dropped == 1
+    assert counters.rapid_hits == 1
+
+
+@pytest.mark.parametrize("name", ["log.csv", "log.jsonl"])
+def test_partial_trailing_line_waits(history, tmp_path, name):
+    path = tmp_path / name
+    tail = LogTail(path)
+    _write_batch(history.iloc[:10], path, 0)
+    extra = tmp_path / ("extra" + path.suffix)
+    _write_batch(history.iloc[10:12], extra, 0)
+    lines = extra.read_bytes().splitlines(keepends=True)
+    last = lines[-1]
+    with open(path, "ab") as f:
+        f.write(lines[-2] + last[:len(last) // 2])
+    assert len(tail.read()) == 11
+    with open(path, "ab") as f:
+        f.write(last[len(last) // 2:])
+    got = tail.read()
+    assert len(got) == 1
+    assert got["Id"].tolist() == [history["Id"].iloc[11]]
+
+
+def test_truncated_file_read_from_start(history, tmp_path):
+    path = tmp_path / "log.csv"
+    tail = LogTail(path)
+    _write_batch(history.iloc[:150], path, 0)
+    assert len(tail.read()) == 150
+    with open(path, "w"):
+        pass
+    assert tail.read().empty
+    _write_batch(history.iloc[150:170], path, 1)
+    got = tail.read()
+    assert got["Id"].tolist() == history["Id"].iloc[150:170].tolist()
+
+
+def test_rotated_to_larger_file(history, tmp_path):
+    path = tmp_path / "log.csv"
+    tail = LogTail(path)
+    _write_batch(history.iloc[:150], path, 0)
+    assert len(tail.read()) == 150
+
+    rotated = tmp_path / "_next.csv"
+    _write_batch(history.iloc[150:550], rotated, 0)
+    os.replace(rotated, path)
+    got = tail.read()
+    assert got["Id"].tolist() == history["Id"].iloc[150:550].tolist()
+
+
+def test_rewritten_in_place_to_larger_file(history, tmp_path):
+    path = tmp_path / "log.csv"
+    tail = LogTail(path)
+    _write_batch(history.iloc[:150], path, 0)
+    assert len(tail.read()) == 150
+
+    # Inode sama, isi baru lebih besar
+    with open(path, "w", newline="") as f:
+        history.iloc[200:600].to_csv(f, index=False)
+    got = tail.read()
+    assert got["Id"].tolist() == history["Id"].iloc[200:600].tolist()
+
+
+def test_quoted_csv_header(history, tmp_path):
+    path = tmp_path / "log.csv"
+    rows = history.iloc[:5]
+    header = ",".join(f'"{c}"' for c in rows.columns)
+    path.write_text("\ufeff" + header + "\n" + rows.to_csv(index=False, header=False), encoding="utf-8")
+    got = LogTail(path).read()
+    assert list(got.columns) == list(rows.columns)
+    assert got["Nik"].tolist() == rows["Nik"].tolist()
+
+
+def test_drop_directory_skips_finished_files(history, tmp_path, monkeypatch):
+    tail = LogTail(tmp_path)
+    for i, batch in enumerate(batches(history, 5)):
+        _write_batch(batch, tmp_path, i)
+    assert len(tail.read()) == len(history)
+    # Semua kecuali file terbaru sudah selesai: tidak dibuka lagi
+    assert len(tail.finished) == 4
+    opened = []
+    read_file = LogTail._read_file
+    monkeypatch.setattr(LogTail, "_read_file", lambda self, p: opened.append(p.name) or read_file(self, p))
+    assert tail.read().empty
+    assert len(opened) == 1
+
+    _write_batch(history.iloc[:3], tmp_path, 9)
+    opened.clear()
+    assert len(tail.read()) == 3
+    assert len(opened) == 2 and len(tail.finished) == 5
+
+
+def test_views_while_polling(history, tmp_path):
+    monitor = LiveMonitor(tmp_path)
+    stop = threading.Event()
+    errors = []
+
+    def read_views():
+        while not stop.is_set():
+            try:
+                monitor.counters.kpi(), monitor.counters.source_table(), monitor.counters.alert_table(), monitor.counters.hourly_table()
+            except Exception as e:
+                errors.append(e)
+
+    reader = threading.Thread(target=read_views)
+    reader.start()
+    for i, batch in enumerate(batches(history, 20)):
+        _write_batch(batch, tmp_path, i)
+        monitor.poll()
+    stop.set()
+    reader.join()
+    assert not errors
+    assert_matches(monitor.counters, history)
@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from ingest import encode_log
+from nik_index import NikIndex
+
+
+def brute_rows(nik, value):
+    return np.flatnonzero((nik.astype(str) == str(value)).to_numpy())
+
+
+def brute_count(nik, prefix):
+    return nik.dropna().astype(str).drop_duplicates().str.startswith(prefix).sum()
+
+
+@pytest.fixture(scope="module")
+def encoded(log):
+    return encode_log(log)[0]
+
+
+def test_numeric_index_on_encoded_log(encoded):
+    idx = NikIndex(encoded["Nik"])
+    assert idx.numeric
+    nik = encoded["Nik"]
+    for value in nik.sample(20, random_state=0):
+        assert idx.rows(str(value)).tolist() == brute_rows(nik, value).tolist()
+    for prefix in ["1", "32", "5123", str(nik.iloc[0])[:10]]:
+        assert idx.count(prefix) == brute_count(nik, prefix)
+    assert len(idx.rows("999")) == 0
+
+
+def test_rows_keep_time_order(encoded):
+    idx = NikIndex(encoded["Nik"])
+    repeated = encoded["Nik"].value_counts().index[0]
+    rows = idx.rows(str(repeated))
+    assert len(rows) > 1
+    assert encoded["CreatedDate"].iloc[rows].is_monotonic_increasing
+
+
+def test_unencoded_integer_nik_falls_back_to_strings(log):
+    # Satu NIK 15 digit: encode_log melapor invalid dan Nik tetap int64 (tidak diencode)
+    df = log.copy()
+    short = 123456789012345
+    df.loc[df.index[5], "Nik"] = short
+    encoded, n_invalid = encode_log(df)
+    assert n_invalid == 1 and encoded["Nik"].dtype == "int64"
+
+    idx = NikIndex(encoded["Nik"])
+    assert not idx.numeric
+    assert idx.rows(str(short)).tolist() == [5]
+    assert idx.count("1234") == brute_count(encoded["Nik"], "1234") >= 1
+    assert str(short) in idx.search("12345678901234")
+    # NIK 16 digit lain tetap bisa dicari
+    other = encoded["Nik"].iloc[0]
+    assert idx.rows(str(other)).tolist() == brute_rows(encoded["Nik"], other).tolist()
+
+
+def test_string_nik_with_missing():
+    nik = pd.Series(["3201", None, "3201", "AB12"], dtype=object)
+    idx = NikIndex(nik)
+    assert idx.rows("3201").tolist() == [0, 2]
+    assert idx.count("") == 2
+    assert idx.search("A") == ["AB12"]
@@ -0,0 +1,70 @@
+import os
+import signal
+import sys
+import types
+
+import pandas as pd
+import pytest
+
+import ingest
+import parallel
+from analytics import compute_sections, filter_log
+
+pytestmark = pytest.mark.skipif(not parallel.SUPPORTED, reason="process pool hanya POSIX")
+
+
+@pytest.fixture(scope="module")
+def shared(raw_log, tmp_path_factory):
+    export = tmp_path_factory.mktemp("export") / "log.csv"
+    raw_log.to_csv(export, index=False)
+    snap = export.parent / ".snapshot"
+    return ingest.load_shared(export, snap), ingest.shared_log_path(export, snap)
+
+
+@pytest.fixture(scope="module")
+def pool():
+    pool = parallel.SectionPool(2)
+    yield pool
+    pool.shutdown()
+
+
+def test_pool_matches_sequential(shared, pool):
+    df, path = shared
+    sources = ["DUKCAPIL", "BCA"]
+    start, end = df["CreatedDate"].min().date(), df["CreatedDate"].max().date()
+    df_f = filter_log(df, sources, start, end)
+    expected = compute_sections(df_f, parallel.PARALLEL_SECTIONS, {})
+    got = pool.compute_sections(df_f, parallel.PARALLEL_SECTIONS, {}, path, sources, start, end)
+    assert sorted(got["sections"]) == sorted(expected["sections"])
+    for key, value in expected.items():
+        if isinstance(value, pd.DataFrame):
+            pd.testing.assert_frame_equal(got[key], value)
+        elif isinstance(value, pd.Series):
+            pd.testing.assert_series_equal(got[key], value)
+        elif key != "sections":
+            assert got[key] == value or (got[key] != got[key] and value != value), key
+
+
+def test_workers_do_not_rerun_main_script(tmp_path, monkeypatch):
+    # Streamlit: "__main__" = script dashboard; worker tidak boleh menjalankannya ulang
+    marker = tmp_path / "rerun"
+    script = tmp_path / "dashboard.py"
+    script.write_text(f"open({str(marker)!r}, 'w').close()\n")
+    main = types.ModuleType("__main__")
+    main.__file__ = str(script)
+    monkeypatch.setitem(sys.modules, "__main__", main)
+    pool = parallel.SectionPool(1)
+    pool.shutdown()
+    assert not marker.exists()
+    assert sys.modules["__main__"] is main
+
+
+def test_broken_pool_raises_and_keeps_results(shared):
+    df, path = shared
+    start, end = df["CreatedDate"].min().date(), df["CreatedDate"].max().date()
+    pool = parallel.SectionPool(1)
+    os.kill(pool._executor.submit(os.getpid).result(), signal.SIGKILL)
+    results = {}
+    with pytest.raises(parallel.BrokenProcessPool):
+        pool.compute_sections(df, ["TREND", "KPI"], results, path, ["DUKCAPIL"], start, end)
+    assert results.get("sections") == []
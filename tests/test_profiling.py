@@ -0,0 +1,27 @@
+import sys
+
+import profiling
+
+
+def test_sections_recorded():
+    prof = profiling.Profiler()
+    with prof.section("A", rows=10):
+        pass
+    prof.mark("B", rows=5)
+    prof.finish()
+    summary = prof.summary()
+    assert summary["Section"].tolist() == ["A", "B"]
+    assert summary["Rows"].tolist() == [10, 5]
+
+
+def test_without_resource_module(monkeypatch):
+    # Windows: tidak ada modul resource maupun /proc → tanpa angka memory, bukan ImportError
+    monkeypatch.setitem(sys.modules, "resource", None)
+    assert profiling.peak_rss_bytes() is None
+
+    monkeypatch.setattr(profiling, "rss_bytes", lambda: None)
+    prof = profiling.Profiler()
+    with prof.section("A"):
+        pass
+    assert prof.records[0]["mem_delta_mb"] is None
+    assert prof.summary()["Mem_Delta_MB"].isna().all()
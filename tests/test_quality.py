@@ -0,0 +1,48 @@
+"""Bitmask quality metrics against the original melt / == "Sesuai" versions of EKYC.py."""
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+
+from analytics import field_status_counts
+from ingest import STATUS_MASK_COLS, encode_log, status_cols
+
+
+def melt_status_counts(df_f):
+    # Rekap asli; status di luar mask digabung jadi "Lainnya"
+    rekap_long = (
+        df_f[status_cols]
+        .melt(var_name="Field", value_name="Status")
+        .groupby(["Field", "Status"], observed=True)
+        .size()
+        .reset_index(name="Count")
+    )
+    known = rekap_long["Status"].isin(list(STATUS_MASK_COLS))
+    rekap_long["Status"] = rekap_long["Status"].astype(str).where(known, "Lainnya")
+    return rekap_long.groupby(["Field", "Status"], as_index=False)["Count"].sum()
+
+
+@pytest.fixture(scope="module")
+def odd_log(log):
+    # Dua status di luar Sesuai / Tidak Sesuai / "-" di beberapa field
+    df = log.astype({c: object for c in status_cols})
+    df.loc[df.index[::7], "Nama"] = "Belum Dicek"
+    df.loc[df.index[::11], "Provinsi"] = "Tidak Ditemukan"
+    df.loc[df.index[::13], "Provinsi"] = "Belum Dicek"
+    return df
+
+
+@pytest.mark.parametrize("encoded", [False, True], ids=["raw", "encoded"])
+def test_field_status_counts_matches_melt(log, odd_log, encoded):
+    for df in (log, odd_log):
+        frame = encode_log(df)[0] if encoded else df
+        got = field_status_counts(frame)
+        assert_frame_equal(got, melt_status_counts(df), check_dtype=False)
+
+
+def test_other_statuses_lumped(odd_log):
+    got = field_status_counts(encode_log(odd_log)[0]).set_index(["Field", "Status"])["Count"]
+    other = odd_log[["Nama", "Provinsi"]].isin(["Belum Dicek", "Tidak Ditemukan"]).sum()
+    assert got[("Nama", "Lainnya")] == other["Nama"]
+    assert got[("Provinsi", "Lainnya")] == other["Provinsi"]
+    assert ("Kelurahan", "Lainnya") not in got.index
+    assert (got.groupby(level="Field").sum() == len(odd_log)).all()
@@ -0,0 +1,79 @@
+import pandas as pd
+
+from analytics import ANALYTICS_SECTIONS, compute_sections, merge_results
+from ingest import encode_log
+from result_cache import LRUCache, filter_key, value_bytes
+
+
+def frame(n):
+    return pd.DataFrame({"x": range(n)})
+
+
+def test_evicts_by_bytes():
+    size = value_bytes({"t": frame(1000)})
+    cache = LRUCache(maxsize=32, maxbytes=int(size * 2.5))
+    for key in "abc":
+        cache.put(key, {"t": frame(1000)})
+    assert cache.get("a") is None
+    assert cache.get("b") is not None and cache.get("c") is not None
+    assert cache.bytes == 2 * size
+
+
+def test_resize_after_filling_in_place():
+    cache = LRUCache(maxsize=32, maxbytes=value_bytes(frame(1000)) * 2)
+    cache.put("old", {"t": frame(1000)})
+    bundle = cache.get_or_compute("new", dict)
+    bundle["t"] = frame(1500)
+    cache.resize("new")
+    # Bundle baru yang membesar mendorong bundle lama keluar, bukan dirinya sendiri
+    assert cache.get("old") is None
+    assert cache.get("new") is bundle
+    assert cache.stats()["evictions"] == 1
+
+
+def test_count_bound_without_bytes():
+    cache = LRUCache(maxsize=2)
+    for key in "abc":
+        cache.put(key, key)
+    assert len(cache) == 2 and cache.get("a") is None
+
+
+def test_filter_key_normalizes():
+    a = filter_key("v1", ["DUKCAPIL", "BCA", "BCA"], 1, 9, all_sources=["BCA", "DUKCAPIL"], date_min=3, date_max=7)
+    b = filter_key("v1", ["BCA", "DUKCAPIL"], 3, 7)
+    assert a == b
+
+
+def test_profile_dropped_once_all_sections_done(log):
+    log = encode_log(log)[0]
+    bundle = compute_sections(log, ["KPI", "TREND"], {})
+    assert "profile" in bundle
+    compute_sections(log, ANALYTICS_SECTIONS, bundle)
+    assert "profile" not in bundle
+
+
+def test_copy_on_write_bundle(log):
+    log = encode_log(log)[0]
+    cache = LRUCache()
+    shared = compute_sections(log, ["KPI", "TREND"], {})
+    cache.put("view", shared)
+    before = dict(shared)
+
+    # Dua session mengisi salinan masing-masing dari bundle yang sama
+    a = compute_sections(log, ["STATUS RECAP"], {**shared, "sections": list(shared["sections"])})
+    b = compute_sections(log, [n for n in ANALYTICS_SECTIONS if n != "STATUS RECAP"], {**shared, "sections": list(shared["sections"])})
+    cache.put("view", merge_results(cache.peek("view"), a))
+    cache.put("view", merge_results(cache.peek("view"), b))
+
+    # Bundle lama tidak berubah (session lain masih bisa membacanya, termasuk profile)
+    assert shared == before and shared["sections"] == ["KPI", "TREND"] and "profile" in shared
+    merged = cache.peek("view")
+    assert set(merged["sections"]) == set(ANALYTICS_SECTIONS)
+    assert "profile" not in merged and "rekap_long" in merged
+
+
+def test_peek_does_not_count():
+    cache = LRUCache()
+    cache.put("a", 1)
+    assert cache.peek("a") == 1 and cache.peek("b", 2) == 2
+    assert cache.stats()["hits"] == cache.stats()["misses"] == 0
@@ -0,0 +1,42 @@
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from analytics import daily_trend, filter_log, hourly_traffic, quality_score, weekday_traffic
+from ingest import encode_log, sort_by_time
+from rollup import Rollup
+
+VIEWS = [
+    (["BCA", "DB_CACHE", "DUKCAPIL"], date(2025, 1, 1), date(2025, 1, 31)),
+    (["DUKCAPIL"], date(2025, 1, 3), date(2025, 1, 9)),
+    (["BCA", "DB_CACHE"], date(2025, 1, 10), date(2025, 1, 10)),
+    (["DUKCAPIL"], date(2030, 1, 1), date(2030, 1, 2)),
+]
+
+
+@pytest.fixture(scope="module")
+def encoded(log):
+    return sort_by_time(encode_log(log)[0])
+
+
+@pytest.fixture(scope="module")
+def cube(encoded):
+    return Rollup(encoded)
+
+
+@pytest.mark.parametrize("sources, start, end", VIEWS)
+def test_cube_matches_log(encoded, cube, sources, start, end):
+    df = filter_log(encoded, sources, start, end)
+    pd.testing.assert_frame_equal(cube.daily(sources, start, end), daily_trend(df).reset_index(drop=True), check_dtype=False)
+    pd.testing.assert_frame_equal(cube.hourly(sources, start, end), hourly_traffic(df), check_dtype=False)
+    pd.testing.assert_frame_equal(cube.weekday(sources, start, end), weekday_traffic(df), check_dtype=False)
+    assert cube.unique_nik(sources, start, end) == df["Nik"].nunique()
+    assert cube.quality_score(sources, start, end) == pytest.approx(quality_score(df))
+
+
+def test_approximate_unique_nik_within_bound(encoded):
+    cube = Rollup(encoded, hll_error=0.02)
+    sources, start, end = VIEWS[0]
+    exact = filter_log(encoded, sources, start, end)["Nik"].nunique()
+    assert abs(cube.unique_nik(sources, start, end) - exact) <= 0.02 * exact
@@ -0,0 +1,52 @@
+import os
+import time
+
+import pandas as pd
+import pytest
+
+import ingest
+
+
+@pytest.fixture
+def exports(raw_log, tmp_path):
+    raw_log.to_csv(tmp_path / "log.csv", index=False)
+    raw_log.head(100).to_csv(tmp_path / "log-2024.csv", index=False)
+    return tmp_path
+
+
+def rewrite(path, df):
+    # mtime beda → fingerprint baru
+    time.sleep(0.01)
+    df.to_csv(path, index=False)
+    os.utime(path, None)
+
+
+def test_shared_frame_equals_snapshot(exports, monkeypatch):
+    monkeypatch.setattr(ingest, "_cold_started", set())
+    snap = exports / ".snapshot"
+    shared = ingest.load_shared(exports / "log.csv", snap)
+    pd.testing.assert_frame_equal(shared, ingest.load_log(exports / "log.csv", snap))
+    # Kolom numerik tanpa null = view read-only ke file yang di-map
+    assert not shared["CreatedDate"].to_numpy().flags.writeable
+
+
+def test_stale_arrow_kept_until_cold_start(exports, raw_log, monkeypatch):
+    monkeypatch.setattr(ingest, "_cold_started", set())
+    snap = exports / ".snapshot"
+    log, other = exports / "log.csv", exports / "log-2024.csv"
+    ingest.load_shared(other, snap)
+    old = ingest.shared_log_path(log, snap)
+    mapped = ingest.load_shared(log, snap)
+
+    rewrite(log, raw_log.head(500))
+    ingest.load_shared(log, snap)
+    # Rebuild di proses yang sama: file Arrow lama masih di-map, tidak dihapus
+    assert old.exists() and len(mapped) == len(raw_log)
+    assert not old.with_suffix(".parquet").exists()
+
+    # Cold start (proses baru): Arrow lama dibersihkan, export lain dengan prefix sama tidak tersentuh
+    monkeypatch.setattr(ingest, "_cold_started", set())
+    assert len(ingest.load_shared(log, snap)) == 500
+    assert not old.exists()
+    assert ingest.shared_log_path(other, snap).exists()
+    assert ingest._snapshot_path(other, ingest.file_fingerprint(other), snap).exists()